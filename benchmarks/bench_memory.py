@@ -0,0 +1,78 @@
+"""Measure the memory footprint of Recipe against the previous plain dataclass.
+
+Run from the project root:
+
+    python -m benchmarks.bench_memory [--recipes 50000]
+
+Strings are built per recipe (as JSON decoding does), so interning and
+compression show up in the numbers the same way they would in a corpus.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from recipefinder.models import Recipe
+
+_WORDS = (
+    "chicken rice garlic onion tomato beef salt pepper butter flour sugar egg milk cream "
+    "cheese basil thyme lemon ginger carrot potato pasta simmer stir bake roast chop "
+    "slice season serve heat boil fry whisk fold drain until golden minutes the and"
+).split()
+
+
+@dataclass
+class LegacyRecipe:
+    title: str
+    source: str
+    ingredients: List[str] = field(default_factory=list)
+    instructions: str = ""
+    image_url: Optional[str] = None
+
+
+def _build(factory: Callable[..., object], count: int, seed: int) -> List[object]:
+    rng = random.Random(seed)
+    items = []
+    for idx in range(count):
+        items.append(
+            factory(
+                title=f"{rng.choice(_WORDS).title()} {rng.choice(_WORDS)} {idx}",
+                source="".join(["Meal", "DB"]) if idx % 2 else "".join(["Spoon", "acular"]),
+                ingredients=[f"{rng.randint(1, 500)}g {rng.choice(_WORDS)}" for _ in range(rng.randint(5, 20))],
+                instructions=" ".join(rng.choice(_WORDS) for _ in range(rng.randint(50, 600))),
+                image_url=f"https://img.example/{idx}.jpg",
+            )
+        )
+    return items
+
+
+def measure(factory: Callable[..., object], count: int, seed: int = 3) -> int:
+    gc.collect()
+    tracemalloc.start()
+    items = _build(factory, count, seed)
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recipes", type=int, default=50000)
+    args = parser.parse_args()
+
+    legacy = measure(LegacyRecipe, args.recipes)
+    compact = measure(Recipe, args.recipes)
+    print(f"{args.recipes} recipes retained")
+    print(f"legacy dataclass : {legacy / 2**20:8.1f} MiB ({legacy / args.recipes:7.0f} B/recipe)")
+    print(f"compact Recipe   : {compact / 2**20:8.1f} MiB ({compact / args.recipes:7.0f} B/recipe)")
+    print(f"reduction        : {(1 - compact / legacy) * 100:7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
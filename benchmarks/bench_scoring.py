@@ -0,0 +1,136 @@
+"""Compare the shared scoring kernel with the previous per-strategy closures.
+
+Run from the project root:
+
+    python -m benchmarks.bench_scoring [--recipes 20000] [--repeat 5]
+
+"cold" is the first rank call in a fresh process: every recipe's search view
+is built and the ingredient normalizer's caches start empty. It runs at about
+the legacy speed (1.0-1.3x on 20k synthetic recipes, noisy), since tokenizing
+the ingredient lines costs about what the legacy substring scan did. The gain
+is on every later call over the same recipes ("warm", roughly 8-12x):
+re-ranking, streamed updates and the candidate cache.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable, List, Tuple
+
+from recipefinder.ingredients import normalize_ingredient, singularize
+from recipefinder.models import Recipe
+from recipefinder.query_builder import RecipeQueryBuilder
+from recipefinder.strategies import BestMatchStrategy, FewerMissingStrategy
+
+_WORDS = (
+    "chicken rice garlic onion tomato beef pork salt pepper butter flour sugar egg milk "
+    "cream cheese basil parsley thyme lemon lime ginger soy carrot potato pasta bean "
+    "simmer stir bake roast chop slice season serve heat boil fry whisk fold drain"
+).split()
+_MEASURES = ["1 cup", "2 tbsp", "1 tsp", "200g", "1 lb", "3 cloves", "pinch of", "2 large"]
+
+
+def make_recipes(count: int, seed: int = 7) -> List[Recipe]:
+    rng = random.Random(seed)
+    recipes = []
+    for idx in range(count):
+        ingredients = [
+            f"{rng.choice(_MEASURES)} {rng.choice(_WORDS)}" for _ in range(rng.randint(5, 20))
+        ]
+        recipes.append(
+            Recipe(
+                title=f"{rng.choice(_WORDS).title()} {rng.choice(_WORDS)} {idx}",
+                source=rng.choice(["MealDB", "Spoonacular"]),
+                ingredients=ingredients,
+                instructions=" ".join(rng.choice(_WORDS) for _ in range(rng.randint(80, 300))),
+            )
+        )
+    return recipes
+
+
+def _legacy_score(recipe: Recipe, requested_ing: List[str], requested_kw: List[str]) -> Tuple[int, int, int]:
+    ing_matches = sum(
+        1 for req in requested_ing if any(req in ing.lower() for ing in recipe.ingredients)
+    )
+    missing = max(0, len(requested_ing) - ing_matches) if requested_ing else 0
+    kw_hits = 0
+    text_blob = (recipe.title + "\n" + (recipe.instructions or "")).lower()
+    for kw in requested_kw:
+        if kw in text_blob:
+            kw_hits += 1
+    return ing_matches, kw_hits, missing
+
+
+def legacy_best_match(recipes: List[Recipe], builder: RecipeQueryBuilder) -> List[Recipe]:
+    requested_ing = [item.lower() for item in builder.requested_ingredients() if item]
+    requested_kw = [kw.lower() for kw in builder.requested_keywords().split() if kw]
+    scored = []
+    for recipe in recipes:
+        ing_matches, kw_hits, missing = _legacy_score(recipe, requested_ing, requested_kw)
+        scored.append(
+            (ing_matches * 2 + kw_hits, ing_matches, kw_hits, missing, len(recipe.ingredients), recipe)
+        )
+    scored.sort(key=lambda i: (-i[0], -i[1], -i[2], i[3], i[4], i[5].title.lower()))
+    return [item[5] for item in scored[: builder.limit()]]
+
+
+def legacy_fewer_missing(recipes: List[Recipe], builder: RecipeQueryBuilder) -> List[Recipe]:
+    requested_ing = [item.lower() for item in builder.requested_ingredients() if item]
+    requested_kw = [kw.lower() for kw in builder.requested_keywords().split() if kw]
+    scored = []
+    for recipe in recipes:
+        ing_matches, kw_hits, missing = _legacy_score(recipe, requested_ing, requested_kw)
+        scored.append((missing, ing_matches, kw_hits, len(recipe.ingredients), recipe))
+    scored.sort(key=lambda i: (i[0], i[3], -i[2], -i[1], i[4].title.lower()))
+    return [item[4] for item in scored[: builder.limit()]]
+
+
+def _best_of(repeat: int, fn: Callable[[], List[Recipe]]) -> Tuple[float, List[Recipe]]:
+    best = float("inf")
+    result: List[Recipe] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recipes", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    recipes = make_recipes(args.recipes)
+    builder = (
+        RecipeQueryBuilder()
+        .with_ingredients(["chicken", "garlic", "lemon", "butter"])
+        .with_keywords("roast simmer")
+        .with_limit(25)
+    )
+
+    cases = [
+        ("BestMatch", legacy_best_match, BestMatchStrategy()),
+        ("FewerMissing", legacy_fewer_missing, FewerMissingStrategy()),
+    ]
+    print(f"{args.recipes} recipes, best of {args.repeat}")
+    for label, legacy, strategy in cases:
+        for recipe in recipes:
+            recipe._normalized = None
+        normalize_ingredient.cache_clear()
+        singularize.cache_clear()
+        legacy_time, legacy_result = _best_of(args.repeat, lambda: legacy(recipes, builder))
+        cold_time, _ = _best_of(1, lambda: strategy.rank(recipes, builder))
+        warm_time, result = _best_of(args.repeat, lambda: strategy.rank(recipes, builder))
+        assert [r.title for r in result] == [r.title for r in legacy_result], label
+        print(
+            f"{label:<13} legacy {legacy_time * 1000:8.1f} ms | "
+            f"kernel cold {cold_time * 1000:8.1f} ms ({legacy_time / cold_time:4.1f}x) | "
+            f"warm {warm_time * 1000:8.1f} ms ({legacy_time / warm_time:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Measure how long Recipe Finder takes to start.
+
+Run from the project root:
+
+    python -m benchmarks.bench_startup [--repeat 5] [--top 15]
+
+Each module is imported in a fresh interpreter with `-X importtime`, and the
+slowest imports are listed by cumulative time. Two end-to-end numbers are
+reported as well:
+
+- time to window: interpreter start until the Tk window has been drawn
+  (skipped when no display is available)
+- time to service ready: interpreter start until RecipeService() returns
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+MODULES = ("main", "ui.app", "recipefinder.service", "recipefinder.server")
+
+# import time:     self [us] |   cumulative | imported package
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+_TIME_TO_WINDOW = """
+import time
+started = time.perf_counter()
+from ui.app import RecipeApp
+app = RecipeApp()
+app.update()
+print(time.perf_counter() - started)
+app.destroy()
+"""
+
+_TIME_TO_SERVICE = """
+import time
+started = time.perf_counter()
+from recipefinder.service import RecipeService
+service = RecipeService()
+print(time.perf_counter() - started)
+service.close()
+"""
+
+
+def import_times(module: str) -> List[Tuple[str, int, int]]:
+    """(module, self_us, cumulative_us) for every import triggered by `module`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            rows.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    # Drop the interpreter's own start-up imports (everything up to `site`).
+    names = [row[0] for row in rows]
+    if "site" in names:
+        rows = rows[len(names) - names[::-1].index("site"):]
+    return rows
+
+
+def run_snippet(code: str) -> Optional[float]:
+    """Seconds printed by `code`, or None if it failed."""
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return None
+    try:
+        return float(result.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        return None
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:8.1f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--module", action="append", help="module to profile (repeatable)")
+    args = parser.parse_args()
+
+    for module in args.module or MODULES:
+        totals: List[float] = []
+        rows: List[Tuple[str, int, int]] = []
+        for _ in range(max(1, args.repeat)):
+            rows = import_times(module)
+            own = next((row for row in reversed(rows) if row[0] == module), None)
+            totals.append((own[2] if own else 0) / 1e6)
+        print(f"\nimport {module}: median {_ms(statistics.median(totals))} ({len(rows)} modules)")
+        slowest: Dict[str, Tuple[int, int]] = {name: (own, cum) for name, own, cum in rows}
+        ranked = sorted(slowest.items(), key=lambda item: -item[1][1])[: args.top]
+        for name, (own, cum) in ranked:
+            print(f"  {cum / 1000:8.1f} ms cumulative {own / 1000:8.1f} ms self  {name}")
+
+    print()
+    for label, code in (("time to window", _TIME_TO_WINDOW), ("time to service ready", _TIME_TO_SERVICE)):
+        samples = [value for value in (run_snippet(code) for _ in range(max(1, args.repeat))) if value is not None]
+        if samples:
+            print(f"{label:24s} median {_ms(statistics.median(samples))}  min {_ms(min(samples))}")
+        else:
+            print(f"{label:24s} skipped (failed to run; no display?)")
+
+
+if __name__ == "__main__":
+    main()
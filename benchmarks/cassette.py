@@ -0,0 +1,103 @@
+"""Recorded provider responses ("cassettes") for replay by the stub server.
+
+A cassette maps a request (path plus credential-free, normalized query) to
+the status, headers and body the real provider answered with. Record one by
+hooking it into a session made by `create_http_session`:
+
+    service = RecipeService(settings=settings)
+    cassette = Cassette()
+    cassette.attach(service.session)
+    ... run searches against the real APIs ...
+    cassette.save("benchmarks/fixtures/cassette.json")
+
+and replay it with `StubProviderServer(cassette=Cassette.load(path))`.
+API keys never reach the file: they are dropped from the query, and only
+the headers in KEPT_HEADERS are stored.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from recipefinder.query_builder import normalize_params
+
+# Headers the app reads from provider responses; everything else is dropped.
+KEPT_HEADERS = ("Content-Type", "Retry-After", "X-API-Quota-Request", "X-API-Quota-Used", "X-API-Quota-Left")
+
+CassetteKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class Recording:
+    __slots__ = ("status", "headers", "body")
+
+    def __init__(self, status: int, headers: Mapping[str, str], body: bytes) -> None:
+        self.status = status
+        self.headers = dict(headers)
+        self.body = body
+
+
+def request_key(path: str, query: str) -> CassetteKey:
+    """Key of a request: same as the app's coalescing key, so API keys and case don't matter."""
+    return path, normalize_params(dict(parse_qsl(query, keep_blank_values=True)))
+
+
+class Cassette:
+    """Thread-safe store of recorded responses; first recording of a request wins."""
+
+    def __init__(self) -> None:
+        self._recordings: Dict[CassetteKey, Recording] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._recordings)
+
+    def get(self, path: str, query: str) -> Optional[Recording]:
+        return self._recordings.get(request_key(path, query))
+
+    def add(self, path: str, query: str, recording: Recording) -> None:
+        with self._lock:
+            self._recordings.setdefault(request_key(path, query), recording)
+
+    def capture(self, response: requests.Response, *args, **kwargs) -> requests.Response:
+        """requests response hook: record `response` (cached replays included)."""
+        if response.request is not None and response.request.method != "GET":
+            return response  # e.g. connection pre-warming
+        parts = urlsplit(response.url)
+        headers = {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers}
+        self.add(parts.path, parts.query, Recording(response.status_code, headers, response.content))
+        return response
+
+    def attach(self, session: requests.Session) -> None:
+        """Record every response `session` receives."""
+        session.hooks.setdefault("response", []).append(self.capture)
+
+    def save(self, path: str | Path) -> None:
+        with self._lock:
+            interactions = [
+                {
+                    "path": request_path,
+                    "query": dict(query),
+                    "status": recording.status,
+                    "headers": recording.headers,
+                    "body": recording.body.decode("utf-8"),
+                }
+                for (request_path, query), recording in self._recordings.items()
+            ]
+        Path(path).write_text(json.dumps({"interactions": interactions}, indent=1), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Cassette":
+        cassette = cls()
+        document = json.loads(Path(path).read_text(encoding="utf-8"))
+        for item in document.get("interactions", []):
+            key = (item["path"], normalize_params(item.get("query", {})))
+            cassette._recordings[key] = Recording(
+                int(item.get("status", 200)), item.get("headers", {}), item["body"].encode("utf-8")
+            )
+        return cassette
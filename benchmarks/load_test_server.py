@@ -0,0 +1,122 @@
+"""Load test for the headless JSON server.
+
+By default starts the stub providers and an in-process RecipeServer:
+
+    python -m benchmarks.load_test_server [--clients 32] [--duration 10] [--queries 50]
+
+or targets a running server (python main.py --server):
+
+    python -m benchmarks.load_test_server --url http://127.0.0.1:8080
+
+Every client keeps one keep-alive connection open and issues /search requests
+back to back; the report shows sustained requests/sec and latency percentiles.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import threading
+import time
+from typing import List, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from recipefinder.server import RecipeServer
+from utils.settings import Settings
+
+from .run import percentile
+from .stub_server import StubProviderServer
+
+
+def _client(
+    base_url: str, paths: List[str], stop_at: float, offset: int, timeout: float
+) -> Tuple[List[float], int]:
+    parts = urlsplit(base_url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=timeout)
+    samples: List[float] = []
+    errors = 0
+    i = offset
+    while time.perf_counter() < stop_at:
+        path = paths[i % len(paths)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+                continue
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=timeout)
+            continue
+        samples.append(time.perf_counter() - started)
+    conn.close()
+    return samples, errors
+
+
+def run_load(base_url: str, clients: int, duration: float, queries: int, timeout: float) -> dict:
+    paths = [
+        "/search?" + urlencode({"q": f"dish {i}", "ingredients": "chicken,garlic", "limit": 10})
+        for i in range(max(1, queries))
+    ]
+    results: List[Tuple[List[float], int]] = [([], 0)] * clients
+    stop_at = time.perf_counter() + duration
+
+    def worker(index: int) -> None:
+        results[index] = _client(base_url, paths, stop_at, index, timeout)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    samples = sorted(sample for client_samples, _ in results for sample in client_samples)
+    return {
+        "clients": clients,
+        "requests": len(samples),
+        "errors": sum(errors for _, errors in results),
+        "requests_per_s": len(samples) / wall if wall else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="running server to target (default: start one in-process)")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--queries", type=int, default=50, help="distinct queries to cycle through")
+    parser.add_argument("--latency", type=float, default=0.02, help="stub provider latency (s)")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    if args.url:
+        report = run_load(args.url, args.clients, args.duration, args.queries, args.timeout)
+    else:
+        with StubProviderServer(latency=args.latency) as stub:
+            settings = Settings(
+                MEALDB_URL=stub.mealdb_url,
+                SPOONACULAR_URL=stub.spoonacular_url,
+                SPOONACULAR_API_KEY="bench",
+                SPOONACULAR_RATE_LIMIT=0,  # the stub has no rate limit
+                HTTP_CACHE_PATH="",
+                CORPUS_PATH="",
+            )
+            with RecipeServer(settings=settings, port=0) as server:
+                report = run_load(server.url, args.clients, args.duration, args.queries, args.timeout)
+                report["upstream_requests"] = stub.requests_served
+
+    for key, value in report.items():
+        print(f"{key:<18} {value:,.2f}" if isinstance(value, float) else f"{key:<18} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""Concurrent load generator for RecipeService against the local provider stand-in.
+
+Run from the project root:
+
+    python -m benchmarks.loadgen [--clients 16] [--duration 10] [--rate 0]
+        [--latency lognormal:0.03,0.6] [--error-rate 0.02]
+        [--burst-every 10 --burst-length 1] [--cassette benchmarks/fixtures/cassette.json]
+        [--set HTTP_MAX_RETRIES=2 ...] [--output loadgen.json]
+
+Every client calls `RecipeService.fetch_recipes` over a mix of `--queries`
+searches. Closed loop by default (each client starts its next search when the
+last one returns); with `--rate` searches start on a fixed schedule and
+latency is measured from the scheduled start, so a stalled service shows up in
+the tail instead of silently lowering the offered load.
+
+The report gives throughput, latency percentiles, provider errors and retry
+amplification: upstream requests the stub received per HTTP call the service
+made (1.0 means no retries or hedges were sent), plus connections opened, which
+shows whether HTTP_POOL_MAXSIZE keeps up with --clients.
+
+Record a cassette from the real APIs (needs network and, for Spoonacular, a
+key in .env) and replay it with --cassette:
+
+    python -m benchmarks.loadgen --record benchmarks/fixtures/cassette.json --queries 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from recipefinder.metrics import MetricsRegistry
+from recipefinder.query_builder import RecipeQueryBuilder
+from recipefinder.service import RecipeService
+from utils.settings import Settings
+
+from .cassette import Cassette
+from .run import percentile
+from .stub_server import LatencyModel, StubProviderServer
+
+KEYWORDS = ("chicken", "beef stew", "pasta", "curry", "soup", "salad", "fish", "cake", "rice", "tacos")
+INGREDIENTS = ("garlic", "onion", "chicken", "tomato", "rice", "egg", "butter", "potato")
+
+
+def query_mix(count: int) -> List[RecipeQueryBuilder]:
+    """`count` distinct searches: keyword searches and MealDB ingredient filters, alternating."""
+    builders = []
+    for i in range(max(1, count)):
+        builder = RecipeQueryBuilder().with_limit(10)
+        if i % 2:
+            first = INGREDIENTS[i % len(INGREDIENTS)]
+            second = INGREDIENTS[(i // len(INGREDIENTS) + i + 1) % len(INGREDIENTS)]
+            builder = builder.with_ingredients(sorted({first, second}))
+        else:
+            keyword = KEYWORDS[(i // 2) % len(KEYWORDS)]
+            round_ = i // (2 * len(KEYWORDS))
+            builder = builder.with_keywords(f"{keyword} {round_}" if round_ else keyword)
+        builders.append(builder)
+    return builders
+
+
+def _counter(metrics: MetricsRegistry, name: str, **labels: str) -> float:
+    series = metrics.snapshot()["counters"].get(name, [])
+    return sum(
+        row["value"] for row in series if all(row["labels"].get(key) == value for key, value in labels.items())
+    )
+
+
+def run_load(
+    service: RecipeService,
+    builders: Sequence[RecipeQueryBuilder],
+    clients: int,
+    duration: float,
+    rate: float = 0.0,
+    max_requests: int = 0,
+) -> Dict:
+    """Drive `service` from `clients` threads; returns latency samples and counts."""
+    clients = max(1, clients)
+    samples: List[float] = []
+    failures = 0
+    issued = 0
+    lock = threading.Lock()
+    started = time.perf_counter()
+    stop_at = started + duration
+    interval = 1.0 / rate if rate > 0 else 0.0
+
+    def next_slot() -> Optional[Tuple[int, float]]:
+        """(request number, scheduled start) or None when the run is over."""
+        nonlocal issued
+        with lock:
+            if max_requests and issued >= max_requests:
+                return None
+            number = issued
+            issued += 1
+        scheduled = started + number * interval if interval else time.perf_counter()
+        if scheduled >= stop_at and not max_requests:
+            return None
+        return number, scheduled
+
+    def client() -> None:
+        nonlocal failures
+        while True:
+            slot = next_slot()
+            if slot is None:
+                return
+            number, scheduled = slot
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                service.fetch_recipes(builders[number % len(builders)])
+            except Exception:
+                with lock:
+                    failures += 1
+                continue
+            elapsed = time.perf_counter() - scheduled
+            with lock:
+                samples.append(elapsed)
+
+    threads = [threading.Thread(target=client, name=f"loadgen-{i}") for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {"samples": samples, "failures": failures, "wall": time.perf_counter() - started}
+
+
+def summarize_load(
+    result: Dict, metrics: MetricsRegistry, upstream: int, statuses: Dict, connections: Dict | None = None
+) -> Dict:
+    samples = sorted(result["samples"])
+    opened = sum(pool["connections_opened"] for pool in (connections or {}).values())
+    wall = result["wall"]
+    http_calls = _counter(metrics, "http_cache_total", result="miss")
+    return {
+        "searches": len(samples),
+        "failed_searches": result["failures"],
+        "searches_per_s": len(samples) / wall if wall else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p90_ms": percentile(samples, 90) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "p999_ms": percentile(samples, 99.9) * 1000,
+        "max_ms": (samples[-1] if samples else 0.0) * 1000,
+        "provider_errors": int(_counter(metrics, "provider_errors_total")),
+        "http_calls": int(http_calls),
+        "http_retries": int(_counter(metrics, "http_retries_total")),
+        "hedged_requests": int(_counter(metrics, "hedged_requests_total")),
+        "upstream_requests": upstream,
+        "upstream_statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "retry_amplification": upstream / http_calls if http_calls else 0.0,
+        "connections_opened": opened,
+        "requests_per_connection": upstream / opened if opened else 0.0,
+    }
+
+
+def _overrides(pairs: Sequence[str]) -> Dict[str, str]:
+    overrides = {}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise SystemExit(f"--set expects KEY=VALUE, got {pair!r}")
+        overrides[key.strip()] = value.strip()
+    return overrides
+
+
+def record(path: str, builders: Sequence[RecipeQueryBuilder], overrides: Dict[str, str]) -> None:
+    """Run every search once against the configured (real) providers and save the responses."""
+    settings = Settings(**{"HTTP_CACHE_ENABLED": False, "CORPUS_ENABLED": False, **overrides})
+    service = RecipeService(settings=settings)
+    cassette = Cassette()
+    cassette.attach(service.session)
+    try:
+        for builder in builders:
+            service.fetch_recipes(builder)
+    finally:
+        service.close()
+    cassette.save(path)
+    print(f"Recorded {len(cassette)} responses to {path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--requests", type=int, default=0, help="stop after this many searches instead")
+    parser.add_argument("--rate", type=float, default=0.0, help="open loop: searches started per second")
+    parser.add_argument("--queries", type=int, default=50, help="distinct searches to cycle through")
+    parser.add_argument("--latency", default="0.02", help='"0.02", "uniform:LOW,HIGH" or "lognormal:MEDIAN,SIGMA"')
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of upstream 500s")
+    parser.add_argument("--burst-every", type=float, default=0.0, help="seconds between 429 bursts")
+    parser.add_argument("--burst-length", type=float, default=0.0, help="seconds each 429 burst lasts")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After (s) sent with 429s")
+    parser.add_argument("--cassette", help="replay recorded responses from this file")
+    parser.add_argument("--strict", action="store_true", help="404 for requests missing from the cassette")
+    parser.add_argument("--record", metavar="PATH", help="record a cassette from the real providers and exit")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE", help="Settings override")
+    parser.add_argument("--output", help="also write the report as JSON")
+    parser.add_argument("--verbose", action="store_true", help="show the service's per-request error lines")
+    args = parser.parse_args()
+
+    builders = query_mix(args.queries)
+    overrides = _overrides(args.set)
+    if args.record:
+        record(args.record, builders, overrides)
+        return
+
+    stub = StubProviderServer(
+        latency=LatencyModel.parse(args.latency, seed=args.seed),
+        error_rate=args.error_rate,
+        burst_every=args.burst_every,
+        burst_length=args.burst_length,
+        retry_after=args.retry_after,
+        cassette=Cassette.load(args.cassette) if args.cassette else None,
+        strict=args.strict,
+        seed=args.seed,
+    )
+    with stub:
+        settings = Settings(
+            **{
+                "MEALDB_URL": stub.mealdb_url,
+                "SPOONACULAR_URL": stub.spoonacular_url,
+                "SPOONACULAR_API_KEY": "bench",
+                "SPOONACULAR_RATE_LIMIT": 0,  # let the stub's 429 bursts do the throttling
+                "HTTP_CACHE_ENABLED": False,
+                "CORPUS_ENABLED": False,
+                **overrides,
+            }
+        )
+        service = RecipeService(settings=settings)
+        if service._prewarm is not None:
+            service._prewarm.join()  # measure steady state, not the handshakes
+        try:
+            # Provider errors are counted in the report; one printed line per failure would drown it.
+            with contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO()):
+                result = run_load(service, builders, args.clients, args.duration, args.rate, args.requests)
+            connections = service.connection_stats()
+        finally:
+            service.close()
+        report = summarize_load(result, service.metrics, stub.requests_served, dict(stub.statuses), connections)
+
+    report = {"clients": args.clients, "rate": args.rate, "latency": repr(stub.latency), **report}
+    for key, value in report.items():
+        print(f"{key:<24} {value:,.2f}" if isinstance(value, float) else f"{key:<24} {value}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2, sort_keys=True)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
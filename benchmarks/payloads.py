@@ -0,0 +1,58 @@
+"""Provider payloads for benchmarks: sample responses and synthetic scale-ups."""
+
+from __future__ import annotations
+
+import copy
+import json
+import random
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict
+
+FIXTURES = Path(__file__).with_name("fixtures")
+
+
+@lru_cache(maxsize=None)
+def load_fixture(name: str) -> Dict:
+    return json.loads((FIXTURES / name).read_text(encoding="utf-8"))
+
+
+def mealdb_payload(count: int, seed: int = 11) -> Dict:
+    """A MealDB search response with `count` meals derived from the samples.
+
+    Titles and ids are made unique and ingredient slots are shuffled, so
+    deduplication and ranking see distinct recipes of realistic shape.
+    """
+    rng = random.Random(seed)
+    samples = load_fixture("mealdb_search.json")["meals"]
+    meals = []
+    for idx in range(count):
+        meal = copy.copy(samples[idx % len(samples)])
+        meal["idMeal"] = str(60000 + idx)
+        meal["strMeal"] = f"{meal['strMeal']} #{idx}"
+        slots = [(meal[f"strIngredient{i}"], meal[f"strMeasure{i}"]) for i in range(1, 21)]
+        filled = [slot for slot in slots if slot[0]]
+        rng.shuffle(filled)
+        filled = filled[: rng.randint(max(1, len(filled) // 2), len(filled))]
+        for i in range(1, 21):
+            ingredient, measure = filled[i - 1] if i <= len(filled) else ("", " ")
+            meal[f"strIngredient{i}"] = ingredient
+            meal[f"strMeasure{i}"] = measure
+        meals.append(meal)
+    return {"meals": meals}
+
+
+def spoonacular_payload(count: int, seed: int = 13) -> Dict:
+    """A Spoonacular complexSearch response with `count` results."""
+    rng = random.Random(seed)
+    samples = load_fixture("spoonacular_complex_search.json")["results"]
+    results = []
+    for idx in range(count):
+        item = copy.copy(samples[idx % len(samples)])
+        item["id"] = 900000 + idx
+        item["title"] = f"{item['title']} #{idx}"
+        ingredients = list(item["extendedIngredients"])
+        rng.shuffle(ingredients)
+        item["extendedIngredients"] = ingredients[: rng.randint(max(1, len(ingredients) // 2), len(ingredients))]
+        results.append(item)
+    return {"results": results, "offset": 0, "number": count, "totalResults": count}
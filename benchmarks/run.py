@@ -0,0 +1,226 @@
+"""Benchmark suite for adapters, ranking strategies and end-to-end service latency.
+
+Run from the project root:
+
+    python -m benchmarks.run [--quick] [--output bench_results.json] [--compare old.json]
+
+Each benchmark reports throughput and latency percentiles. Results are written
+as JSON so two commits can be compared with --compare.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Sequence
+
+from recipefinder.adapters import MealDBAdapter, SpoonacularAdapter
+from recipefinder.query_builder import RecipeQueryBuilder
+from recipefinder.service import RecipeService
+from recipefinder.strategies import BestMatchStrategy, FewerMissingStrategy
+from utils.settings import Settings
+
+from .payloads import mealdb_payload, spoonacular_payload
+from .stub_server import StubProviderServer
+
+SIZES = (10, 100, 1_000, 10_000, 100_000)
+QUICK_SIZES = (10, 100, 1_000)
+# Ingredients and keywords, so ranking reads both ingredient lines and instructions.
+RANK_QUERY = (
+    RecipeQueryBuilder()
+    .with_ingredients(["chicken", "garlic", "onion"])
+    .with_keywords("simmer sauce")
+    .with_limit(25)
+)
+
+
+def percentile(sorted_samples: Sequence[float], pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    rank = (len(sorted_samples) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_samples) - 1)
+    return sorted_samples[low] + (sorted_samples[high] - sorted_samples[low]) * (rank - low)
+
+
+def summarize(samples: List[float], items_per_sample: int = 1, wall: float | None = None) -> Dict:
+    """Latency percentiles in ms plus throughput in items per second."""
+    ordered = sorted(samples)
+    elapsed = wall if wall is not None else sum(samples)
+    return {
+        "samples": len(samples),
+        "mean_ms": statistics.fmean(samples) * 1000 if samples else 0.0,
+        "p50_ms": percentile(ordered, 50) * 1000,
+        "p95_ms": percentile(ordered, 95) * 1000,
+        "p99_ms": percentile(ordered, 99) * 1000,
+        "throughput_per_s": (len(samples) * items_per_sample / elapsed) if elapsed else 0.0,
+    }
+
+
+def _repeat_for(size: int) -> int:
+    return max(3, min(200, 20_000 // size))
+
+
+def _time(fn: Callable[[], object], repeat: int, setup: Callable[[], None] | None = None) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def bench_adapters(sizes: Sequence[int]) -> Dict[str, Dict]:
+    results = {}
+    for size in sizes:
+        mealdb, spoon = mealdb_payload(size), spoonacular_payload(size)
+        repeat = _repeat_for(size)
+        results[f"adapt.mealdb.{size}"] = summarize(
+            _time(lambda: MealDBAdapter().adapt(mealdb), repeat), size
+        )
+        results[f"adapt.spoonacular.{size}"] = summarize(
+            _time(lambda: SpoonacularAdapter().adapt(spoon), repeat), size
+        )
+    return results
+
+
+def bench_strategies(sizes: Sequence[int]) -> Dict[str, Dict]:
+    builder = RANK_QUERY
+    results = {}
+    for size in sizes:
+        recipes = MealDBAdapter().adapt(mealdb_payload(size)) + SpoonacularAdapter().adapt(
+            spoonacular_payload(size)
+        )
+        repeat = _repeat_for(size)
+
+        def reset() -> None:
+            for recipe in recipes:
+                recipe._normalized = None
+
+        for strategy in (BestMatchStrategy(), FewerMissingStrategy()):
+            label = type(strategy).__name__
+            rank = lambda: strategy.rank(recipes, builder)  # noqa: E731
+            results[f"rank.{label}.cold.{size}"] = summarize(_time(rank, repeat, reset), len(recipes))
+            results[f"rank.{label}.warm.{size}"] = summarize(_time(rank, repeat), len(recipes))
+    return results
+
+
+def bench_service(requests: int, concurrency: int, latency: float) -> Dict[str, Dict]:
+    results = {}
+    with StubProviderServer(latency=latency) as stub:
+        settings = Settings(
+            MEALDB_URL=stub.mealdb_url,
+            SPOONACULAR_URL=stub.spoonacular_url,
+            SPOONACULAR_API_KEY="bench",
+            SPOONACULAR_RATE_LIMIT=0,  # the stub has no rate limit
+            HTTP_CACHE_ENABLED=False,
+            CORPUS_ENABLED=False,
+        )
+        service = RecipeService(settings=settings)
+        builder = RecipeQueryBuilder(settings).with_keywords("chicken").with_limit(10)
+        try:
+            service.fetch_recipes(builder)  # warm up connections
+            results["service.fetch_recipes.serial"] = summarize(
+                _time(lambda: service.fetch_recipes(builder), requests)
+            )
+
+            def one() -> float:
+                started = time.perf_counter()
+                service.fetch_recipes(builder)
+                return time.perf_counter() - started
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                samples = list(pool.map(lambda _: one(), range(requests)))
+            results[f"service.fetch_recipes.concurrent{concurrency}"] = summarize(
+                samples, wall=time.perf_counter() - started
+            )
+
+            # Nightly-style batch: many queries, some repeated.
+            batch = [
+                RecipeQueryBuilder(settings).with_keywords(f"dish {i % 50}").with_limit(10)
+                for i in range(requests)
+            ]
+            results["service.batch.loop"] = summarize(
+                _time(lambda: [service.fetch_recipes(b) for b in batch], 1), requests
+            )
+            results["service.batch.fetch_recipes_many"] = summarize(
+                _time(lambda: list(service.fetch_recipes_many(batch)), 1), requests
+            )
+        finally:
+            service.close()
+    return results
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_report(results: Dict[str, Dict], baseline: Dict[str, Dict] | None = None) -> None:
+    header = f"{'benchmark':<44} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'items/s':>14}"
+    if baseline:
+        header += f" {'Δ p50':>8}"
+    print(header)
+    for name, row in results.items():
+        line = (
+            f"{name:<44} {row['p50_ms']:>10.3f} {row['p95_ms']:>10.3f} "
+            f"{row['p99_ms']:>10.3f} {row['throughput_per_s']:>14.0f}"
+        )
+        old = (baseline or {}).get(name)
+        if old and old["p50_ms"]:
+            line += f" {(row['p50_ms'] / old['p50_ms'] - 1) * 100:>+7.1f}%"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="small sizes only")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="previous results file to diff against")
+    parser.add_argument("--requests", type=int, default=200, help="service requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.02, help="stub provider latency (s)")
+    args = parser.parse_args()
+
+    sizes = QUICK_SIZES if args.quick else SIZES
+    results: Dict[str, Dict] = {}
+    results.update(bench_adapters(sizes))
+    results.update(bench_strategies(sizes))
+    results.update(bench_service(args.requests, args.concurrency, args.latency))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            baseline = json.load(handle)["results"]
+    print_report(results, baseline)
+
+    document = {
+        "meta": {
+            "revision": _git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as handle:
+        json.dump(document, handle, indent=2, sort_keys=True)
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""Local HTTP stand-in for TheMealDB and Spoonacular used by the benchmarks."""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .cassette import Cassette
+from .payloads import mealdb_payload, spoonacular_payload
+
+MEALDB_PATH = "/api/json/v1/1/search.php"
+MEALDB_FILTER_PATH = "/api/json/v1/1/filter.php"
+MEALDB_LOOKUP_PATH = "/api/json/v1/1/lookup.php"
+SPOONACULAR_PATH = "/recipes/complexSearch"
+
+
+class LatencyModel:
+    """Artificial response latency: fixed, uniform or lognormal (long tail).
+
+    `parse` accepts the CLI forms "0.02", "uniform:0.01,0.05" and
+    "lognormal:0.02,0.6" (median seconds, sigma).
+    """
+
+    KINDS = ("fixed", "uniform", "lognormal")
+
+    def __init__(self, kind: str = "fixed", a: float = 0.0, b: float = 0.0, seed: Optional[int] = None) -> None:
+        if kind not in self.KINDS:
+            raise ValueError(f"unknown latency model {kind!r}; expected one of {', '.join(self.KINDS)}")
+        self.kind = kind
+        self.a = a
+        self.b = b
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def parse(cls, spec: str, seed: Optional[int] = None) -> "LatencyModel":
+        kind, _, args = spec.partition(":") if ":" in spec else ("fixed", "", spec)
+        values = [float(value) for value in args.split(",") if value.strip()]
+        if len(values) != (1 if kind == "fixed" else 2):
+            raise ValueError(f"bad latency spec {spec!r}")
+        return cls(kind, *values, seed=seed)
+
+    def __bool__(self) -> bool:
+        return bool(self.a or self.b)
+
+    def sample(self) -> float:
+        if self.kind == "fixed":
+            return self.a
+        with self._lock:
+            if self.kind == "uniform":
+                return self._rng.uniform(self.a, self.b)
+            return self._rng.lognormvariate(math.log(self.a), self.b)
+
+    def __repr__(self) -> str:
+        return f"{self.kind}:{self.a:g}" + (f",{self.b:g}" if self.kind != "fixed" else "")
+
+
+class StubProviderServer:
+    """Serves canned or recorded provider payloads with injectable faults.
+
+    Use as a context manager; point Settings.MEALDB_URL / SPOONACULAR_URL at
+    `mealdb_url` / `spoonacular_url`. `requests_served` counts upstream hits
+    and `statuses` the status codes sent. MealDB's filter.php (by ingredient)
+    and lookup.php (by id) answer from the same meals as search.php. HEAD
+    requests (connection pre-warming) get an empty 200 and aren't counted.
+
+    - latency: seconds or a LatencyModel, sampled per request
+    - error_rate: fraction of requests answered with 500
+    - burst_every / burst_length: the last `burst_length` seconds of every
+      `burst_every` seconds are answered with 429 and Retry-After:
+      `retry_after` (whole seconds, as urllib3 requires)
+    - cassette: recorded responses are replayed first; requests it doesn't
+      know fall back to the synthetic payloads, or 404 with `strict=True`
+    """
+
+    def __init__(
+        self,
+        latency: float | LatencyModel = 0.0,
+        meals: int = 25,
+        results: int = 25,
+        error_rate: float = 0.0,
+        burst_every: float = 0.0,
+        burst_length: float = 0.0,
+        retry_after: int = 1,
+        cassette: Optional[Cassette] = None,
+        strict: bool = False,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.latency = latency if isinstance(latency, LatencyModel) else LatencyModel("fixed", latency)
+        self.error_rate = error_rate
+        self.burst_every = burst_every
+        self.burst_length = burst_length
+        self.retry_after = retry_after
+        self.cassette = cassette
+        self.strict = strict
+        self._rng = random.Random(seed)
+        self._started = time.monotonic()
+        self.statuses: Counter = Counter()
+        self._meals: List[Dict] = mealdb_payload(meals)["meals"]
+        self._bodies: Dict[str, bytes] = {
+            MEALDB_PATH: json.dumps({"meals": self._meals}).encode("utf-8"),
+            SPOONACULAR_PATH: json.dumps(spoonacular_payload(results)).encode("utf-8"),
+        }
+        self.requests_served = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        assert self._server is not None, "server not started"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def mealdb_url(self) -> str:
+        return self.base_url + MEALDB_PATH
+
+    @property
+    def spoonacular_url(self) -> str:
+        return self.base_url + SPOONACULAR_PATH
+
+    def _mealdb_query(self, path: str, query: str) -> Optional[bytes]:
+        wanted = (parse_qs(query).get("i") or [""])[0].strip().lower()
+        if path == MEALDB_FILTER_PATH:
+            meals = [
+                {key: meal[key] for key in ("strMeal", "strMealThumb", "idMeal")}
+                for meal in self._meals
+                if any(
+                    "_".join((meal.get(f"strIngredient{i}") or "").lower().split()) == wanted
+                    for i in range(1, 21)
+                )
+            ]
+        elif path == MEALDB_LOOKUP_PATH:
+            meals = [meal for meal in self._meals if meal["idMeal"] == wanted]
+        else:
+            return None
+        return json.dumps({"meals": meals or None}).encode("utf-8")
+
+    def _in_burst(self) -> bool:
+        if self.burst_every <= 0 or self.burst_length <= 0:
+            return False
+        elapsed = time.monotonic() - self._started
+        return elapsed % self.burst_every >= self.burst_every - self.burst_length
+
+    def _respond(self, path: str, query: str) -> Tuple[int, Dict[str, str], Optional[bytes]]:
+        """(status, headers, body) for one request, faults included."""
+        if self._in_burst():
+            return 429, {"Retry-After": str(self.retry_after)}, b""
+        if self.error_rate:
+            with self._lock:
+                failed = self._rng.random() < self.error_rate
+            if failed:
+                return 500, {}, b""
+        recording = self.cassette.get(path, query) if self.cassette is not None else None
+        if recording is not None:
+            return recording.status, recording.headers, recording.body
+        if self.strict and self.cassette is not None:
+            return 404, {}, None
+        body = self._bodies.get(path) or self._mealdb_query(path, query)
+        return (200 if body is not None else 404), {"Content-Type": "application/json"}, body
+
+    def start(self) -> "StubProviderServer":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:  # noqa: N802
+                parts = urlsplit(self.path)
+                status, headers, body = stub._respond(parts.path, parts.query)
+                with stub._lock:
+                    stub.requests_served += 1
+                    stub.statuses[status] += 1
+                if stub.latency:
+                    time.sleep(stub.latency.sample())
+                if body is None:
+                    self.send_error(status)
+                    return
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_HEAD(self) -> None:  # noqa: N802
+                if stub.latency:
+                    time.sleep(stub.latency.sample())
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format: str, *args) -> None:  # noqa: A002
+                return
+
+        self._started = time.monotonic()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StubProviderServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
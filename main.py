@@ -1,12 +1,24 @@
-from recipefinder.env_loader import load_dotenv_if_present
-from recipefinder.service import RecipeService
-from ui.app import RecipeApp
+import argparse
 
 
 def main() -> None:
-    load_dotenv_if_present()
-    service = RecipeService()
-    app = RecipeApp(service)
+    parser = argparse.ArgumentParser(description="Recipe Finder")
+    parser.add_argument("--server", action="store_true", help="run the headless JSON API instead of the UI")
+    parser.add_argument("--host", help="server bind address (default: SERVER_HOST)")
+    parser.add_argument("--port", type=int, help="server port (default: SERVER_PORT)")
+    args = parser.parse_args()
+
+    if args.server:
+        from recipefinder.server import RecipeServer
+
+        RecipeServer(host=args.host, port=args.port).serve_forever()
+        return
+
+    # Only Tk is imported before the window shows; the app loads the search
+    # engine (requests, pydantic, PIL, ...) on a background thread.
+    from ui.app import RecipeApp
+
+    app = RecipeApp()
     app.mainloop()
 
 
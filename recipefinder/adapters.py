@@ -1,9 +1,18 @@
 import html
 import re
-from typing import Dict, List
+from operator import itemgetter
+from typing import Dict, List, Optional, Sequence
 
 from .models import Recipe
 
+_MEALDB_SLOTS = 20
+# strIngredient1, strMeasure1, strIngredient2, ... built once instead of per meal.
+_MEALDB_INGREDIENT_KEYS = tuple(
+    key for idx in range(1, _MEALDB_SLOTS + 1) for key in (f"strIngredient{idx}", f"strMeasure{idx}")
+)
+_mealdb_ingredient_fields = itemgetter(*_MEALDB_INGREDIENT_KEYS)
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+
 
 class RecipeAdapter:
     """Base adapter interface for unified recipefinder mapping."""
@@ -24,18 +33,11 @@ class MealDBAdapter(RecipeAdapter):
         meals = data.get("meals") or []
         recipes: List[Recipe] = []
         for meal in meals:
-            ingredients = []
-            for idx in range(1, 21):
-                ingredient = meal.get(f"strIngredient{idx}") or ""
-                measure = meal.get(f"strMeasure{idx}") or ""
-                combined = f"{measure.strip()} {ingredient.strip()}".strip()
-                if combined:
-                    ingredients.append(combined)
             recipes.append(
                 Recipe(
                     title=meal.get("strMeal", "Unknown Meal"),
                     source="MealDB",
-                    ingredients=ingredients,
+                    ingredients=_mealdb_ingredients(_ingredient_fields(meal)),
                     instructions=meal.get("strInstructions", ""),
                     image_url=meal.get("strMealThumb"),
                 )
@@ -72,10 +74,29 @@ class SpoonacularAdapter(RecipeAdapter):
         return recipes
 
 
+def _ingredient_fields(meal: Dict) -> Sequence[Optional[str]]:
+    """Raw ingredient/measure values in slot order (one C call for complete meals)."""
+    try:
+        return _mealdb_ingredient_fields(meal)
+    except KeyError:
+        return tuple(meal.get(key) for key in _MEALDB_INGREDIENT_KEYS)
+
+
+def _mealdb_ingredients(fields: Sequence[Optional[str]]) -> tuple:
+    ingredients = []
+    for idx in range(0, len(fields), 2):
+        ingredient = fields[idx] or ""
+        measure = fields[idx + 1] or ""
+        combined = f"{measure.strip()} {ingredient.strip()}".strip()
+        if combined:
+            ingredients.append(combined)
+    return tuple(ingredients)
+
+
 def _strip_html(text: str) -> str:
     if not text:
         return ""
-    cleaned = re.sub(r"<[^>]+>", "", text)
+    cleaned = _HTML_TAG_RE.sub("", text)
     return html.unescape(cleaned).strip()
 
 
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Hashable, Iterator, List, Optional, Tuple, TypeVar
+
+from .singleflight import SingleFlight
+
+T = TypeVar("T")
+
+
+class SearchCancelled(Exception):
+    """Raised inside a search whose CancellationToken was cancelled."""
+
+
+class CancellationToken:
+    """Cooperative cancellation flag shared by one search and everything it started.
+
+    Why: An abandoned UI search kept its provider calls, retries and
+    Spoonacular quota going, and could still finish after a newer search.
+    Where: RecipeApp creates one per search and passes it to
+    RecipeService.fetch_recipes(_iter); the service installs it with
+    `cancel_scope` on every worker thread of that search.
+    Problem solved: Once cancelled, the search stops waiting at once and no
+    new HTTP request, retry, page or lookup starts (see `check_cancelled`).
+    Reads already on the wire finish within their timeout and are dropped.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def on_cancel(self, callback: Callable[[], None]) -> None:
+        """Run `callback` once on cancel (immediately if already cancelled)."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+
+_scope = threading.local()
+
+
+@contextmanager
+def cancel_scope(token: Optional[CancellationToken]) -> Iterator[None]:
+    """Make `token` the current thread's token (None: not cancellable)."""
+    previous = getattr(_scope, "token", None)
+    _scope.token = token
+    try:
+        yield
+    finally:
+        _scope.token = previous
+
+
+def current_token() -> Optional[CancellationToken]:
+    return getattr(_scope, "token", None)
+
+
+def check_cancelled() -> None:
+    """Raise SearchCancelled if the current thread's search was cancelled."""
+    token = getattr(_scope, "token", None)
+    if token is not None and token.cancelled:
+        raise SearchCancelled()
+
+
+def cancellable_sleep(seconds: float) -> None:
+    """`time.sleep` that ends early, raising SearchCancelled, if the current search is cancelled."""
+    token = current_token()
+    if token is None:
+        time.sleep(seconds)
+        return
+    woken = threading.Event()
+    token.on_cancel(woken.set)
+    woken.wait(seconds)
+    check_cancelled()
+
+
+def propagate(fn: Callable[..., T]) -> Callable[..., T]:
+    """Wrap `fn` to run under the calling thread's token, e.g. before pool.submit."""
+    token = current_token()
+
+    def run(*args, **kwargs) -> T:
+        with cancel_scope(token):
+            return fn(*args, **kwargs)
+
+    return run
+
+
+def shared_call(flight: SingleFlight[T], key: Hashable, fn: Callable[[], T]) -> Tuple[T, bool]:
+    """`flight.do(key, fn)`, except that another search's cancellation isn't ours.
+
+    A follower whose leader was cancelled retries (and usually leads) the call
+    unless its own search was cancelled too.
+    """
+    while True:
+        try:
+            return flight.do(key, fn)
+        except SearchCancelled:
+            check_cancelled()
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .models import Recipe
+from .query_builder import RecipeQueryBuilder
+
+CandidateKey = Tuple[str, Tuple[str, ...]]
+
+
+def candidate_key(builder: RecipeQueryBuilder) -> CandidateKey:
+    """What the providers were asked for: keywords and ingredients, case and order ignored."""
+    keywords = " ".join(builder.requested_keywords().lower().split())
+    ingredients = tuple(sorted({" ".join(item.lower().split()) for item in builder.requested_ingredients()}))
+    return keywords, ingredients
+
+
+class CandidateCache:
+    """Recently gathered candidate sets, for re-ranking without refetching.
+
+    Why: Switching strategy or lowering "Max results" re-sent every provider
+    request just to rank the same recipes differently.
+    Where: RecipeService stores the merged, deduplicated results of every
+    complete search here (one where no provider failed, degraded or missed
+    the deadline); RecipeService.rerank reads them.
+    Problem solved: Entries are keyed by `candidate_key` and remember the limit
+    they were fetched with, since Spoonacular and MealDB's ingredient search
+    return at most that many recipes. A later query with the same key and a
+    limit no higher is answered from memory. At most `max_entries` sets are
+    kept (least recently used go first), each for `ttl` seconds.
+    """
+
+    def __init__(
+        self, max_entries: int = 16, ttl: float = 600.0, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CandidateKey, Tuple[float, int, List[Recipe]]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, builder: RecipeQueryBuilder) -> Optional[List[Recipe]]:
+        """Candidates gathered for this query (at its limit or higher), or None."""
+        key = candidate_key(builder)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                del self._entries[key]
+                entry = None
+            if entry is None or entry[1] < builder.limit():
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return list(entry[2])
+
+    def put(self, builder: RecipeQueryBuilder, recipes: List[Recipe]) -> None:
+        if self.max_entries <= 0:
+            return
+        key = candidate_key(builder)
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, builder.limit(), list(recipes))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from .ingredients import normalize_ingredient
+from .models import Recipe
+from .query_builder import RecipeQueryBuilder
+from .scoring import normalized, normalized_text
+
+_TOKEN_RE = re.compile(r"[a-z]+")
+_EMPTY = array("I")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class RecipeCorpus:
+    """Local store of every recipe the adapters produced, with inverted indexes.
+
+    Why: Live providers are rate limited; recipes we have already seen can be
+    searched locally.
+    Where: RecipeService feeds it after each provider call and queries it as the
+    "Local" provider.
+    Problem solved: Candidate sets for the ranking strategies come from postings
+    lookups instead of a scan over every stored recipe.
+
+    Postings are append-only `array("I")` lists of recipe ids. Ids only grow, so
+    each list stays sorted and newest recipes sit at the end.
+
+    Size is bounded by `max_recipes`: once a quarter more than that has been
+    added, only the newest `max_recipes` are kept, the indexes are rebuilt and
+    the file is rewritten (compaction), so memory and disk stay bounded while
+    appends stay cheap. The file is read by `load()`, which RecipeService runs
+    in the background at startup; until then `ready` is False.
+    """
+
+    def __init__(self, path: str | None = None, scan_limit: int = 1000, max_recipes: int = 20000) -> None:
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()
+        self._recipes: List[Recipe] = []
+        self._ids: Dict[Tuple[str, str], int] = {}
+        self._ingredient_index: Dict[str, array] = {}
+        self._text_index: Dict[str, array] = {}
+        self._path = Path(path) if path else None
+        self._scan_limit = max(1, scan_limit)
+        self._max_recipes = max(1, max_recipes)
+        self._loaded = self._path is None
+
+    def __len__(self) -> int:
+        self.load()
+        with self._lock:
+            return len(self._recipes)
+
+    @property
+    def ready(self) -> bool:
+        """Whether the file has been loaded (searching before that would block on it)."""
+        return self._loaded
+
+    def add(self, recipe: Recipe) -> bool:
+        return self.add_many([recipe]) == 1
+
+    def add_many(self, recipes: Iterable[Recipe]) -> int:
+        """Index recipes not seen before; returns how many were new."""
+        self.load()
+        with self._lock:
+            added = [recipe for recipe in recipes if self._index(recipe)]
+            if added and not self._compact_if_needed() and self._path is not None:
+                self._append_to_disk(added)
+            return len(added)
+
+    def search(self, builder: RecipeQueryBuilder, max_candidates: int = 200) -> List[Recipe]:
+        """Return up to `max_candidates` recipes matching the query, best hits first.
+
+        A requested ingredient matches when every one of its normalized tokens
+        (see ingredients.py) appears in the recipe's ingredient lines; a keyword
+        matches title/instruction terms.
+        Recipes hitting every term come first (newest first), then partial hits.
+        Work is bounded by `scan_limit`: only the newest postings of each term
+        are visited, so cost does not grow with the size of the corpus.
+        """
+        terms: List[Tuple[Dict[str, array], List[str]]] = [
+            (self._ingredient_index, list(normalize_ingredient(item)))
+            for item in builder.requested_ingredients()
+        ]
+        terms += [(self._text_index, [kw]) for kw in tokenize(builder.requested_keywords())]
+        terms = [term for term in terms if term[1]]
+        if not terms:
+            return []
+
+        self.load()
+        with self._lock:
+            postings = [self._term_postings(index, tokens) for index, tokens in terms]
+            exact = self._intersect(postings)
+            if len(exact) >= max_candidates:
+                best = exact[-max_candidates:][::-1]
+            else:
+                # Partial matches ranked by how many terms they hit; the
+                # strategies do the fine-grained ranking afterwards.
+                scores: Counter = Counter()
+                for ids in postings:
+                    scores.update(ids[-self._scan_limit :])
+                for recipe_id in exact:
+                    scores[recipe_id] = len(postings)
+                best = [recipe_id for recipe_id, _ in scores.most_common(max_candidates)]
+            return [self._recipes[recipe_id] for recipe_id in best]
+
+    def _term_postings(self, index: Dict[str, array], tokens: List[str]) -> Sequence[int]:
+        lists = [index.get(token, _EMPTY) for token in tokens]
+        if len(lists) == 1:
+            return lists[0]
+        return self._intersect(lists)
+
+    def _intersect(self, postings: List[Sequence[int]]) -> List[int]:
+        """Ids present in every posting, drawn from the newest part of the shortest one."""
+        ordered = sorted(postings, key=len)
+        base = ordered[0][-self._scan_limit :]
+        if len(ordered) == 1 or not base:
+            return list(base)
+        # Postings are sorted, so only the slice at or above the oldest candidate matters.
+        common = set(base)
+        for other in ordered[1:]:
+            common.intersection_update(other[bisect_left(other, base[0]) :])
+        return sorted(common)
+
+    def _index(self, recipe: Recipe) -> bool:
+        key = (recipe.source, recipe.title.strip().lower())
+        if key in self._ids:
+            return False
+        recipe_id = len(self._recipes)
+        self._ids[key] = recipe_id
+        self._recipes.append(recipe)
+        # Reuses (and fills) the search view the ranking strategies cache.
+        text_tokens = set(_TOKEN_RE.findall(normalized_text(recipe)))
+        for token in normalized(recipe).tokens:
+            self._ingredient_index.setdefault(token, array("I")).append(recipe_id)
+        for token in text_tokens:
+            self._text_index.setdefault(token, array("I")).append(recipe_id)
+        return True
+
+    def load(self) -> None:
+        """Read the corpus file once; later calls return at once (or wait for the first)."""
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            recipes: List[Recipe] = []
+            if self._path is not None and self._path.exists():
+                # Parsed without holding the index lock; only indexing takes it.
+                try:
+                    with self._path.open(encoding="utf-8") as handle:
+                        for line in handle:
+                            if line.strip():
+                                recipes.append(_recipe_from_json(json.loads(line)))
+                except (OSError, ValueError) as exc:
+                    print(f"Failed to load recipe corpus from {self._path}: {exc}")
+            with self._lock:
+                for recipe in recipes[-self._max_recipes :]:
+                    self._index(recipe)
+                if len(recipes) > self._max_recipes:
+                    self._rewrite_disk()
+                self._loaded = True
+
+    def _compact_if_needed(self) -> bool:
+        """Keep the newest `max_recipes` once the store is 25% over; True if compacted."""
+        if len(self._recipes) <= self._max_recipes + self._max_recipes // 4:
+            return False
+        keep = self._recipes[-self._max_recipes :]
+        self._recipes = []
+        self._ids = {}
+        self._ingredient_index = {}
+        self._text_index = {}
+        for recipe in keep:
+            self._index(recipe)
+        if self._path is not None:
+            self._rewrite_disk()
+        return True
+
+    def _rewrite_disk(self) -> None:
+        temp = self._path.with_name(self._path.name + ".tmp")
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with temp.open("w", encoding="utf-8") as handle:
+                for recipe in self._recipes:
+                    handle.write(json.dumps(_recipe_to_json(recipe)) + "\n")
+            os.replace(temp, self._path)
+        except OSError as exc:
+            print(f"Failed to compact recipe corpus: {exc}")
+
+    def _append_to_disk(self, recipes: List[Recipe]) -> None:
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with self._path.open("a", encoding="utf-8") as handle:
+                for recipe in recipes:
+                    handle.write(json.dumps(_recipe_to_json(recipe)) + "\n")
+        except OSError as exc:
+            print(f"Failed to persist recipe corpus: {exc}")
+
+
+def _recipe_to_json(recipe: Recipe) -> Dict:
+    return {
+        "title": recipe.title,
+        "source": recipe.source,
+        "ingredients": list(recipe.ingredients),
+        "instructions": recipe.instructions,
+        "image_url": recipe.image_url,
+    }
+
+
+def _recipe_from_json(data: Dict) -> Recipe:
+    return Recipe(
+        title=data.get("title", ""),
+        source=data.get("source", ""),
+        ingredients=list(data.get("ingredients") or []),
+        instructions=data.get("instructions") or "",
+        image_url=data.get("image_url"),
+    )
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from itertools import repeat
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+from .ingredients import canonical_tokens
+from .models import Recipe
+from .scoring import normalized
+
+# LSH layout: BANDS bands of ROWS MinHash values over the combined title and
+# ingredient features. Pairs at Jaccard 0.6 share a band with probability
+# 1 - (1 - 0.6**2)**8 = 97%; pairs below 0.2 rarely do.
+BANDS = 8
+ROWS = 2
+_SEEDS = tuple(range(1, BANDS * ROWS + 1))
+
+# Verified pairs per new recipe are capped, so a title or bucket shared by
+# many unrelated recipes can't make the stage quadratic.
+MAX_CANDIDATES = 64
+
+
+def _minhash(features: FrozenSet[str]) -> Tuple[int, ...]:
+    # hash((seed, feature)) is a different hash function per seed, evaluated in C.
+    return tuple(min(map(hash, zip(repeat(seed), features))) for seed in _SEEDS)
+
+
+def _bands(features: FrozenSet[str]) -> List[Tuple]:
+    if not features:
+        return []
+    values = _minhash(features)
+    return [(band, values[band * ROWS : (band + 1) * ROWS]) for band in range(BANDS)]
+
+
+def _jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    common = len(a & b)
+    return common / (len(a) + len(b) - common)
+
+
+class DuplicateFinder:
+    """Near-duplicate detection over merged provider results (MinHash + LSH).
+
+    Why: MealDB, Spoonacular and the local corpus often return the same dish,
+    and each copy took a slot in the limited result list.
+    Where: RecipeService merges every search's provider batches through it.
+    Problem solved: Each recipe is reduced to its normalized title tokens and
+    ingredient tokens. Recipes with the same title tokens are compared
+    directly; otherwise MinHash bands of the combined tokens go into hash
+    buckets and only recipes sharing a bucket are compared exactly:
+    near-linear time instead of all pairs. Recipes from different providers
+    are duplicates when the mean of their title and ingredient Jaccard
+    similarities reaches `threshold`; the title alone decides when either side
+    has no ingredients.
+    Within one provider only exact (source, title) repeats are dropped, since
+    a provider's own near-identical entries are distinct recipes. The first
+    copy is kept and collects the other copies' providers in
+    `Recipe.also_from`.
+
+    With `threshold=None` only exact (source, title) repeats are dropped.
+    """
+
+    def __init__(self, threshold: float | None = 0.7) -> None:
+        self.threshold = threshold
+        self.merged = 0
+        self._kept: List[Recipe] = []
+        self._titles: List[FrozenSet[str]] = []
+        self._exact: Dict[Tuple[str, str], int] = {}
+        self._same_title: Dict[FrozenSet[str], List[int]] = {}
+        self._buckets: Dict[Tuple, List[int]] = {}
+        self._slots: Dict[int, int] = {}  # id(recipe) -> position in _kept
+        self._replaced: List[Recipe] = []  # keeps ids in _slots from being reused
+
+    def add(self, recipe: Recipe) -> bool:
+        """Keep `recipe`, or fold it into the kept copy it duplicates; True if kept."""
+        exact = self._exact.get((recipe.source, recipe.title.strip().lower()))
+        if exact is not None:
+            self.merged += 1
+            return False
+        title: FrozenSet[str] = frozenset()
+        bands: List[Tuple] = []
+        if self.threshold is not None:
+            title = frozenset(canonical_tokens(recipe.title))
+            ingredients = normalized(recipe).tokens
+            same_title = self._same_title.get(title, [])[:MAX_CANDIDATES]
+            for slot in same_title:
+                if self._is_duplicate(slot, recipe.source, title, ingredients):
+                    return self._fold(slot, recipe)
+            bands = _bands(ingredients.union(["t:" + token for token in title]))
+            checked = set(same_title)
+            for band in bands:
+                for slot in self._buckets.get(band, ()):
+                    if slot in checked:
+                        continue
+                    if len(checked) >= MAX_CANDIDATES:
+                        break
+                    checked.add(slot)
+                    if self._is_duplicate(slot, recipe.source, title, ingredients):
+                        return self._fold(slot, recipe)
+
+        slot = len(self._kept)
+        self._kept.append(recipe)
+        self._titles.append(title)
+        self._slots[id(recipe)] = slot
+        self._exact[(recipe.source, recipe.title.strip().lower())] = slot
+        if title:
+            self._same_title.setdefault(title, []).append(slot)
+        for band in bands:
+            self._buckets.setdefault(band, []).append(slot)
+        return True
+
+    def add_many(self, recipes: Iterable[Recipe]) -> List[Recipe]:
+        """Add recipes in order; returns the ones that were kept."""
+        return [recipe for recipe in recipes if self.add(recipe)]
+
+    def kept(self) -> List[Recipe]:
+        """Every kept recipe in first-seen order, with providers merged in."""
+        return list(self._kept)
+
+    def current(self, recipe: Recipe) -> Recipe:
+        """The up-to-date copy of a recipe returned earlier (providers may have grown)."""
+        slot = self._slots.get(id(recipe))
+        return recipe if slot is None else self._kept[slot]
+
+    def _is_duplicate(
+        self, slot: int, source: str, title: FrozenSet[str], ingredients: FrozenSet[str]
+    ) -> bool:
+        kept = self._kept[slot]
+        if kept.source == source:
+            return False
+        title_similarity = _jaccard(title, self._titles[slot])
+        other = normalized(kept).tokens
+        if not ingredients or not other:
+            return title_similarity >= self.threshold
+        return (title_similarity + _jaccard(ingredients, other)) / 2 >= self.threshold
+
+    def _fold(self, slot: int, duplicate: Recipe) -> bool:
+        self.merged += 1
+        kept = self._kept[slot]
+        providers = kept.providers
+        extra = tuple(p for p in duplicate.providers if p not in providers)
+        if not extra:
+            return False
+        # Kept recipes may be shared with caches and other searches; copy
+        # instead of mutating, and keep the already built search view.
+        merged = replace(kept, also_from=kept.also_from + extra)
+        merged._normalized = kept._normalized
+        self._kept[slot] = merged
+        self._replaced.append(kept)
+        self._slots[id(merged)] = slot
+        return False
+
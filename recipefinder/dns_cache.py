@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import socket
+import threading
+import time
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from .singleflight import SingleFlight
+
+AddrInfo = List[Tuple]
+
+
+class DnsCache:
+    """TTL cache in front of `socket.getaddrinfo`.
+
+    Why: Every new connection to a provider resolved its host again, which
+    costs a resolver round trip on cold or parallel connects (pool growth,
+    pre-warming, hedged requests).
+    Where: Installed process-wide by create_http_session when
+    HTTP_DNS_CACHE_TTL > 0; urllib3 resolves through `socket.getaddrinfo`.
+    Problem solved: Answers are reused for `ttl` seconds and concurrent misses
+    for the same name share one lookup. Failures are not cached, and the
+    system resolver's own TTLs are not visible here, so keep `ttl` short.
+    """
+
+    def __init__(
+        self, ttl: float, max_entries: int = 256, resolve: Optional[Callable[..., AddrInfo]] = None
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._resolve = resolve or socket.getaddrinfo
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[float, AddrInfo]] = {}
+        self._flight: SingleFlight[AddrInfo] = SingleFlight()
+        self._hits = 0
+        self._misses = 0
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0) -> AddrInfo:  # noqa: A002
+        key = (host, port, family, type, proto, flags)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._hits += 1
+                return list(entry[1])
+            self._misses += 1
+        result, _ = self._flight.do(key, lambda: self._resolve(host, port, family, type, proto, flags))
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (now + self.ttl, result)
+        return list(result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
+
+
+_installed: Optional[DnsCache] = None
+_install_lock = threading.Lock()
+
+
+def install_dns_cache(ttl: float) -> DnsCache:
+    """Route `socket.getaddrinfo` through a shared DnsCache (idempotent; updates the TTL)."""
+    global _installed
+    with _install_lock:
+        if _installed is None:
+            _installed = DnsCache(ttl)
+            socket.getaddrinfo = _installed.getaddrinfo
+        _installed.ttl = ttl
+        return _installed
+
+
+def uninstall_dns_cache() -> None:
+    global _installed
+    with _install_lock:
+        if _installed is not None:
+            socket.getaddrinfo = _installed._resolve
+            _installed = None
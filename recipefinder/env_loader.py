@@ -5,6 +5,9 @@ from dotenv import load_dotenv
 
 def load_dotenv_if_present() -> None:
     """Load environment variables from a local .env file if present.
+
+    The app doesn't need this: Settings reads the same .env files itself. Use
+    it only from scripts that want the values in os.environ.
     """
 
     env_path = Path(__file__).with_name(".env")
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .query_builder import SECRET_PARAMS, normalize_params
+
+# Disk hits refresh `accessed_at` (the LRU order) in batches of this many.
+TOUCH_BATCH = 64
+
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    headers: Dict[str, str]
+    body: bytes
+    url: str
+    expires_at: float
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+
+def cache_key(url: str) -> str:
+    """Key a GET request by endpoint plus normalized, credential-free params."""
+    parts = urlsplit(url)
+    params = dict(parse_qsl(parts.query, keep_blank_values=True))
+    base = f"{parts.scheme}://{parts.netloc.lower()}{parts.path}"
+    return f"{base}?{urlencode(normalize_params(params))}"
+
+
+def redact_url(url: str) -> str:
+    """`url` without credential params (API keys), other params kept as sent."""
+    parts = urlsplit(url)
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    kept = [(key, value) for key, value in params if key not in SECRET_PARAMS]
+    if len(kept) == len(params):
+        return url
+    return parts._replace(query=urlencode(kept)).geturl()
+
+
+class ResponseCache:
+    """Two-level response cache: an in-memory LRU in front of a SQLite file.
+
+    Why: Provider searches repeat a lot and Spoonacular calls cost quota.
+    Where: Mounted on the session by create_http_session via CachingHTTPAdapter.
+    Problem solved: Repeated searches are served locally, including after a restart.
+    The disk row count is tracked in memory and hit times are written in
+    batches, so neither a store nor a hit scans or rewrites the table.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        max_memory_entries: int = 256,
+        max_disk_entries: int = 5000,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._max_memory = max(1, max_memory_entries)
+        self._max_disk = max(1, max_disk_entries)
+        self._stats = CacheStats()
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_rows = 0
+        self._touched: Dict[str, float] = {}
+        if path:
+            self._db = self._open_db(Path(path))
+            if self._db is not None:
+                count = self._disk_execute("SELECT COUNT(*) FROM responses")
+                self._disk_rows = count[0][0] if count else 0
+                self._disk_trim()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry.expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._stats.memory_hits += 1
+                    return entry
+                del self._memory[key]
+
+            entry = self._disk_get(key, now)
+            if entry is not None:
+                self._stats.disk_hits += 1
+                self._remember(key, entry)
+                return entry
+
+            self._stats.misses += 1
+            return None
+
+    def contains(self, key: str) -> bool:
+        """Whether `get(key)` would hit, without touching stats or LRU order."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry.expires_at > now:
+                return True
+            row = self._disk_execute("SELECT expires_at FROM responses WHERE key = ?", (key,))
+            return bool(row) and row[0][0] > now
+
+    def put(self, key: str, response: CachedResponse) -> None:
+        with self._lock:
+            self._stats.stores += 1
+            self._remember(key, response)
+            self._disk_put(key, response)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            self._disk_execute("DELETE FROM responses")
+            self._disk_rows = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return self._stats.as_dict()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_touched()
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key: str, response: CachedResponse) -> None:
+        self._memory[key] = response
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_memory:
+            self._memory.popitem(last=False)
+            if self._db is None:
+                self._stats.evictions += 1
+
+    def _open_db(self, path: Path) -> Optional[sqlite3.Connection]:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, status INTEGER, headers TEXT, body BLOB,"
+                " url TEXT, expires_at REAL, accessed_at REAL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at)")
+            return db
+        except sqlite3.Error as exc:
+            print(f"Response cache disabled on disk ({path}): {exc}")
+            return None
+
+    def _disk_get(self, key: str, now: float) -> Optional[CachedResponse]:
+        row = self._disk_execute(
+            "SELECT status, headers, body, url, expires_at FROM responses WHERE key = ?", (key,)
+        )
+        if not row:
+            return None
+        status, headers, body, url, expires_at = row[0]
+        if expires_at <= now:
+            self._disk_execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._touched.pop(key, None)
+            self._disk_rows -= 1
+            return None
+        self._touched[key] = now
+        if len(self._touched) >= TOUCH_BATCH:
+            self._flush_touched()
+        return CachedResponse(status, json.loads(headers), bytes(body), url, expires_at)
+
+    def _disk_put(self, key: str, response: CachedResponse) -> None:
+        if self._db is None:
+            return
+        replaced = self._disk_execute("SELECT 1 FROM responses WHERE key = ?", (key,))
+        self._touched.pop(key, None)
+        self._disk_execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                response.status_code,
+                json.dumps(response.headers),
+                response.body,
+                response.url,
+                response.expires_at,
+                time.time(),
+            ),
+        )
+        if not replaced:
+            self._disk_rows += 1
+            self._disk_trim()
+
+    def _disk_trim(self) -> None:
+        """Evict the least recently used rows beyond max_disk_entries."""
+        excess = self._disk_rows - self._max_disk
+        if excess <= 0:
+            return
+        self._flush_touched()  # the LRU order must include recent hits
+        self._disk_execute(
+            "DELETE FROM responses WHERE key IN"
+            " (SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+            (excess,),
+        )
+        self._disk_rows -= excess
+        self._stats.evictions += excess
+
+    def _flush_touched(self) -> None:
+        if not self._touched:
+            return
+        touched = [(accessed_at, key) for key, accessed_at in self._touched.items()]
+        self._touched.clear()
+        self._disk_execute("UPDATE responses SET accessed_at = ? WHERE key = ?", touched, many=True)
+
+    def _disk_execute(self, sql: str, args=(), many: bool = False) -> list:
+        if self._db is None:
+            return []
+        try:
+            if many:
+                self._db.executemany(sql, args)
+                return []
+            return self._db.execute(sql, args).fetchall()
+        except sqlite3.Error as exc:
+            print(f"Response cache disk error, falling back to memory only: {exc}")
+            self._db = None
+            return []
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """Transport adapter that answers provider GETs from a ResponseCache.
+
+    `ttl_for(url)` returns the TTL in seconds for a URL, or None when the URL
+    must not be cached (images, unknown hosts, ...).
+    """
+
+    def __init__(
+        self, cache: ResponseCache, ttl_for: Callable[[str], Optional[float]], **kwargs
+    ) -> None:
+        super().__init__(**kwargs)
+        self.cache = cache
+        self._ttl_for = ttl_for
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        ttl = self._ttl_for(request.url or "") if request.method == "GET" else None
+        if not ttl:
+            return super().send(request, **kwargs)
+
+        key = cache_key(request.url or "")
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self._build_response(request, cached)
+
+        response = super().send(request, **kwargs)
+        if response.status_code == 200:
+            self.cache.put(
+                key,
+                CachedResponse(
+                    status_code=response.status_code,
+                    headers=dict(response.headers),
+                    body=response.content,
+                    url=redact_url(response.url),  # persisted: never store API keys
+                    expires_at=time.time() + ttl,
+                ),
+            )
+        return response
+
+    def _build_response(
+        self, request: requests.PreparedRequest, cached: CachedResponse
+    ) -> requests.Response:
+        response = requests.Response()
+        response.status_code = cached.status_code
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(cached.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = cached.body
+        response.url = cached.url
+        response.request = request
+        response.connection = self
+        response.from_cache = True  # type: ignore[attr-defined]
+        return response
+
+
+def get_response_cache(session: requests.Session) -> Optional[ResponseCache]:
+    for adapter in session.adapters.values():
+        if isinstance(adapter, CachingHTTPAdapter):
+            return adapter.cache
+    return None
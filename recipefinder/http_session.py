@@ -1,26 +1,197 @@
 from __future__ import annotations
 
+import threading
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
 import requests
 from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-
+from .dns_cache import install_dns_cache
+from .http_cache import CachingHTTPAdapter, ResponseCache
+from .resilience import BudgetRetry, latency_budget
 from utils.settings import Settings
 
 
+class _ClientPacedRetry(BudgetRetry):
+    """BudgetRetry that hands every 429 back to the caller, Retry-After or not."""
+
+    RETRY_AFTER_STATUS_CODES = frozenset({413, 503})
+
+
 def create_http_session(settings: Settings) -> requests.Session:
-    retry = Retry(
+    # Count limits are a ceiling; inside latency_budget() retries also stop at the deadline.
+    retry_args = dict(
         total=settings.HTTP_MAX_RETRIES,
         connect=settings.HTTP_MAX_RETRIES,
         read=settings.HTTP_MAX_RETRIES,
         status=settings.HTTP_MAX_RETRIES,
         backoff_factor=settings.HTTP_BACKOFF,
-        status_forcelist=(429, 500, 502, 503, 504),
         allowed_methods=frozenset({"GET"}),
         raise_on_status=False,
     )
-    adapter = HTTPAdapter(max_retries=retry)
+    retry = BudgetRetry(status_forcelist=(429, 500, 502, 503, 504), **retry_args)
+    # One pool per host, each keeping up to HTTP_POOL_MAXSIZE keep-alive connections.
+    # Past that, urllib3 opens throwaway connections ("connection pool is full")
+    # or, with HTTP_POOL_BLOCK, waits for one to be returned.
+    pool = {
+        "pool_connections": settings.HTTP_POOL_CONNECTIONS,
+        "pool_maxsize": settings.HTTP_POOL_MAXSIZE,
+        "pool_block": settings.HTTP_POOL_BLOCK,
+    }
+    if settings.HTTP_DNS_CACHE_TTL > 0:
+        install_dns_cache(settings.HTTP_DNS_CACHE_TTL)
+    cache = None
+    if settings.HTTP_CACHE_ENABLED:
+        cache = ResponseCache(
+            path=settings.HTTP_CACHE_PATH or None,
+            max_memory_entries=settings.HTTP_CACHE_MEMORY_ENTRIES,
+            max_disk_entries=settings.HTTP_CACHE_DISK_ENTRIES,
+        )
+
+    def make_adapter(max_retries: BudgetRetry) -> HTTPAdapter:
+        if cache is not None:
+            return CachingHTTPAdapter(cache, _provider_ttls(settings), max_retries=max_retries, **pool)
+        return HTTPAdapter(max_retries=max_retries, **pool)
 
+    adapter = make_adapter(retry)
     session = requests.Session()
     session.mount("https://", adapter)
     session.mount("http://", adapter)
+    if settings.SPOONACULAR_URL:
+        # SpoonacularClient answers a 429 itself: it pauses the shared rate limiter
+        # for Retry-After and degrades. Retrying it here first only spends more quota.
+        spoonacular_retry = _ClientPacedRetry(status_forcelist=(500, 502, 503, 504), **retry_args)
+        session.mount(settings.SPOONACULAR_URL.rsplit("/", 1)[0] + "/", make_adapter(spoonacular_retry))
     return session
+
+
+def prewarm(
+    session: requests.Session, urls: Iterable[str], connections: int = 2, timeout: float = 5.0
+) -> int:
+    """Open up to `connections` keep-alive connections for each URL; returns how many were added.
+
+    Sends `connections` concurrent HEAD requests to each URL through `session`,
+    so they go through the adapter and pool (TLS settings and proxies
+    included) that later requests to the URL use. The connections stay
+    parked in the pool and the first searches skip DNS, TCP and TLS. HEAD is
+    neither cached nor retried on status, and without query or API key it
+    isn't a provider search, so it counts against no quota. Each request gets
+    at most `timeout` seconds, connect retries included; failures are ignored.
+    """
+    targets = {}
+    for url in urls:
+        parts = urlsplit(url)
+        if parts.scheme in ("http", "https") and parts.hostname:
+            # One target per pool: URLs on the same host may be mounted on different adapters.
+            targets.setdefault((id(session.get_adapter(url)), parts.scheme, parts.netloc), url)
+    if connections <= 0 or not targets:
+        return 0
+    # All requests leave together, so each one checks out its own connection.
+    barrier = threading.Barrier(len(targets) * connections)
+
+    def head(url: str) -> None:
+        try:
+            barrier.wait(timeout)
+            with latency_budget(timeout):
+                session.head(url, timeout=timeout, allow_redirects=False).close()
+        except Exception:
+            pass  # best effort; the first search connects as usual
+
+    before = _parked_connections(session)
+    threads = [
+        threading.Thread(target=head, args=(url,), name="http-prewarm-request", daemon=True)
+        for url in targets.values()
+        for _ in range(connections)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return max(0, _parked_connections(session) - before)
+
+
+def start_prewarm(
+    session: requests.Session, urls: Iterable[str], connections: int
+) -> Optional[threading.Thread]:
+    """Run `prewarm` on a daemon thread so startup doesn't wait for it."""
+    urls = [url for url in urls if url]
+    if connections <= 0 or not urls:
+        return None
+    thread = threading.Thread(
+        target=prewarm, args=(session, urls, connections), name="http-prewarm", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def _parked_connections(session: requests.Session) -> int:
+    """Idle keep-alive connections across `session`'s pools (failed connects aren't parked)."""
+    return int(sum(row["idle"] for row in pool_stats(session).values()))
+
+
+def pool_stats(session: requests.Session) -> Dict[str, Dict[str, float]]:
+    """Per-host connection pool usage of `session`, keyed by "scheme://host:port".
+
+    - maxsize / in_use / idle: pool capacity, checked-out and parked connections
+    - requests / connections_opened: requests sent and connections created
+      (pre-warmed ones included); `requests_per_connection` is how often a
+      connection was reused. connections_opened well above maxsize under
+      steady load means connections are being discarded: raise
+      HTTP_POOL_MAXSIZE.
+
+    The counters come from urllib3 pool attributes outside its documented API;
+    any that a urllib3 release lacks read as 0 instead of failing.
+    """
+    stats: Dict[str, Dict[str, float]] = {}
+    # Providers sharing a host (as with the benchmark stub) have a pool in each adapter.
+    adapters: List[HTTPAdapter] = []
+    for adapter in session.adapters.values():
+        if isinstance(adapter, HTTPAdapter) and adapter not in adapters:
+            adapters.append(adapter)
+    for adapter in adapters:
+        for manager in (adapter.poolmanager, *adapter.proxy_manager.values()):
+            pools = getattr(manager, "pools", None)
+            for key in list(pools.keys()) if pools is not None else ():
+                try:
+                    pool = pools[key]
+                except KeyError:
+                    continue  # evicted meanwhile
+                queue = getattr(pool, "pool", None)
+                if queue is None:
+                    continue  # closed
+                row = stats.setdefault(
+                    f"{pool.scheme}://{pool.host}:{pool.port}",
+                    {"maxsize": 0, "in_use": 0, "idle": 0, "requests": 0, "connections_opened": 0},
+                )
+                parked = getattr(queue, "queue", None)
+                maxsize = getattr(queue, "maxsize", 0)
+                if parked is not None and maxsize:
+                    parked = list(parked)
+                    row["maxsize"] += maxsize
+                    row["in_use"] += maxsize - len(parked)
+                    row["idle"] += sum(1 for conn in parked if getattr(conn, "sock", None) is not None)
+                row["requests"] += getattr(pool, "num_requests", 0)
+                row["connections_opened"] += getattr(pool, "num_connections", 0)
+    for row in stats.values():
+        opened = row["connections_opened"]
+        row["requests_per_connection"] = row["requests"] / opened if opened else 0.0
+    return stats
+
+
+def _provider_ttls(settings: Settings):
+    """Map each provider's API directory to its cache TTL; everything else is uncached."""
+    prefixes: Dict[str, float] = {}
+    for url, ttl in (
+        (settings.MEALDB_URL, settings.HTTP_CACHE_TTL_MEALDB),
+        (settings.SPOONACULAR_URL, settings.HTTP_CACHE_TTL_SPOONACULAR),
+    ):
+        if url and ttl > 0:
+            prefixes[url.rsplit("/", 1)[0] + "/"] = ttl
+
+    def ttl_for(url: str) -> Optional[float]:
+        for prefix, ttl in prefixes.items():
+            if url.startswith(prefix):
+                return ttl
+        return None
+
+    return ttl_for
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# Letters only: quantities ("2", "1/2", "200g" -> "g") never become tokens.
+_WORD_RE = re.compile(r"[a-zà-öø-ÿ]+")
+
+UNITS = frozenset(
+    """
+    cup tbsp tbs tbl tablespoon tsp teaspoon g gr gram kg kilogram mg ml l litre liter dl cl
+    oz ounce lb pound pint quart qt gallon pinch dash handful bunch can tin jar packet package
+    pkg stick sprig slice piece cm mm inch x lbs kgs ozs
+    """.split()
+)
+
+# Quantity words and preparation notes that say nothing about *what* the ingredient is.
+STOP_WORDS = frozenset(
+    """
+    a an the of and or to for with plus about optional taste serve serving garnish
+    one two three four five six half quarter dozen few some several
+    chopped diced minced sliced grated shredded crushed peeled halved quartered cubed
+    softened melted beaten fresh freshly large small medium finely roughly thinly
+    """.split()
+)
+
+# Applied after singularization; values are the canonical tokens.
+SYNONYMS: Dict[str, Tuple[str, ...]] = {
+    "aubergine": ("eggplant",),
+    "courgette": ("zucchini",),
+    "coriander": ("cilantro",),
+    "garbanzo": ("chickpea",),
+    "prawn": ("shrimp",),
+    "rocket": ("arugula",),
+    "beetroot": ("beet",),
+    "yoghurt": ("yogurt",),
+    "cornflour": ("cornstarch",),
+    "chile": ("chili",),
+    "chilli": ("chili",),
+    "capsicum": ("bell", "pepper"),
+    "scallion": ("spring", "onion"),
+}
+
+# Two-word names folded before single-word synonyms.
+PHRASE_SYNONYMS: Dict[Tuple[str, str], Tuple[str, ...]] = {
+    ("green", "onion"): ("spring", "onion"),
+    ("garbanzo", "bean"): ("chickpea",),
+    ("corn", "starch"): ("cornstarch",),
+    ("double", "cream"): ("heavy", "cream"),
+    ("icing", "sugar"): ("powdered", "sugar"),
+    ("confectioner", "sugar"): ("powdered", "sugar"),
+}
+
+_IRREGULAR_PLURALS = {
+    "leaves": "leaf",
+    "loaves": "loaf",
+    "halves": "half",
+    "knives": "knife",
+    "cookies": "cookie",
+    "brownies": "brownie",
+    "pies": "pie",
+    "quiches": "quiche",
+}
+# Words ending in "s" that are not plurals (or are only ever used in the plural).
+_INVARIANT = frozenset(
+    {
+        "ananas", "asparagus", "brussels", "chinois", "couscous", "gras", "grits", "hummus",
+        "madras", "molasses", "sassafras", "schnapps", "series", "swiss", "tapas",
+    }
+)
+
+
+@lru_cache(maxsize=8192)
+def singularize(word: str) -> str:
+    """English plural -> singular, tuned for ingredient names ("tomatoes" -> "tomato")."""
+    if len(word) <= 3 or word in _INVARIANT:
+        return word
+    irregular = _IRREGULAR_PLURALS.get(word)
+    if irregular is not None:
+        return irregular
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith(("oes", "ches", "shes", "sses", "xes", "zes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def canonical_tokens(text: str) -> Tuple[str, ...]:
+    """Canonical tokens of free text, in order and without repeats.
+
+    Quantities, units and preparation words are dropped, words are
+    singularized and synonyms are folded into one spelling. Uncached; use
+    `normalize_ingredient` for ingredient lines.
+    """
+    words = [singularize(word) for word in _WORD_RE.findall(text.lower())]
+    words = [word for word in words if word not in UNITS and word not in STOP_WORDS]
+    tokens: List[str] = []
+    idx = 0
+    while idx < len(words):
+        phrase = PHRASE_SYNONYMS.get((words[idx], words[idx + 1])) if idx + 1 < len(words) else None
+        if phrase is not None:
+            tokens.extend(phrase)
+            idx += 2
+            continue
+        tokens.extend(SYNONYMS.get(words[idx], (words[idx],)))
+        idx += 1
+    return tuple(dict.fromkeys(tokens))
+
+
+@lru_cache(maxsize=16384)
+def normalize_ingredient(text: str) -> Tuple[str, ...]:
+    """Canonical tokens of one ingredient line.
+
+    "2 cups chopped Tomatoes" -> ("tomato",); "3 Green Onions" -> ("spring", "onion").
+    Cached: the same lines ("1 tsp salt") repeat across thousands of recipes,
+    and callers share the returned tuple.
+    """
+    return canonical_tokens(text)
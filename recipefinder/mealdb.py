@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from .adapters import MealDBAdapter, RecipeAdapter
+from .cancellation import SearchCancelled, check_cancelled, propagate, shared_call
+from .models import Recipe
+from .resilience import ProviderDegraded
+from .singleflight import SingleFlight
+
+# (url, params) -> decoded JSON; raises on transport/HTTP errors.
+JsonFetcher = Callable[[str, Dict[str, str]], Dict]
+
+
+def mealdb_endpoint(search_url: str, name: str) -> str:
+    """Sibling endpoint of the configured search URL, e.g. .../1/filter.php."""
+    return search_url.rsplit("/", 1)[0] + "/" + name if search_url else ""
+
+
+class MealCache:
+    """Thread-safe LRU of adapted MealDB recipes keyed by `idMeal`."""
+
+    def __init__(self, max_entries: int = 2000) -> None:
+        self._lock = threading.Lock()
+        self._meals: "OrderedDict[str, Recipe]" = OrderedDict()
+        self._max_entries = max(1, max_entries)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._meals)
+
+    def get(self, meal_id: str) -> Optional[Recipe]:
+        with self._lock:
+            recipe = self._meals.get(meal_id)
+            if recipe is not None:
+                self._meals.move_to_end(meal_id)
+            return recipe
+
+    def put(self, meal_id: str, recipe: Recipe) -> None:
+        with self._lock:
+            self._meals[meal_id] = recipe
+            self._meals.move_to_end(meal_id)
+            while len(self._meals) > self._max_entries:
+                self._meals.popitem(last=False)
+
+
+class CachingMealDBAdapter(RecipeAdapter):
+    """MealDBAdapter that also files every full meal it sees under its id.
+
+    Keyword searches return complete meal records, so meals found that way
+    never need a lookup.php call when an ingredient search hits them later.
+    """
+
+    def __init__(self, inner: MealDBAdapter, cache: MealCache) -> None:
+        self._inner = inner
+        self._cache = cache
+
+    def adapt(self, data: Dict) -> List[Recipe]:
+        recipes = self._inner.adapt(data)
+        for meal, recipe in zip(data.get("meals") or [], recipes):
+            meal_id = meal.get("idMeal")
+            if meal_id:
+                self._cache.put(str(meal_id), recipe)
+        return recipes
+
+
+class MealDBIngredientSearch:
+    """Multi-ingredient search built on MealDB's filter and lookup endpoints.
+
+    Why: search.php only matches meal names; an ingredient list sent to it
+    returns nothing useful.
+    Where: RecipeService._fetch_mealdb for ingredient-only queries.
+    Problem solved: One filter.php request per ingredient runs in parallel. The
+    meal ids are ranked locally by how many requested ingredients they contain,
+    and only the top ids missing from the meal cache are fetched, in parallel,
+    from lookup.php. Each phase costs about one upstream round-trip. When some
+    lookups fail, the meals that did load are raised in ProviderDegraded.
+    """
+
+    def __init__(
+        self,
+        fetch_json: JsonFetcher,
+        filter_url: str,
+        lookup_url: str,
+        adapter: MealDBAdapter,
+        cache: MealCache,
+        concurrency: int = 10,
+    ) -> None:
+        self._fetch_json = fetch_json
+        self._filter_url = filter_url
+        self._lookup_url = lookup_url
+        self._adapter = adapter
+        self._cache = cache
+        self._pool = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="mealdb")
+        self._lookups: SingleFlight[Optional[Recipe]] = SingleFlight()
+
+    def search(self, filters: Sequence[Dict[str, str]], limit: int) -> List[Recipe]:
+        """Recipes for the given filter.php params, best ingredient coverage first.
+
+        Raises the first lookup error if no meal could be loaded, and
+        ProviderDegraded (with the loaded meals) if only some failed.
+        """
+        if not filters:
+            return []
+        # Pool threads inherit the caller's cancellation token.
+        id_lists = list(self._pool.map(propagate(self._filter), filters))
+        meal_ids = rank_meal_ids(id_lists)[:limit]
+
+        recipes: Dict[str, Recipe] = {}
+        missing = []
+        for meal_id in meal_ids:
+            cached = self._cache.get(meal_id)
+            if cached is not None:
+                recipes[meal_id] = cached
+            else:
+                missing.append(meal_id)
+
+        errors: List[Exception] = []
+        check_cancelled()
+        for meal_id, result in zip(missing, self._pool.map(propagate(self._lookup_safely), missing)):
+            if isinstance(result, Exception):
+                errors.append(result)
+            elif result is not None:
+                recipes[meal_id] = result
+        check_cancelled()
+        if errors and not recipes:
+            raise errors[0]
+        found = [recipes[meal_id] for meal_id in meal_ids if meal_id in recipes]
+        if errors:
+            raise ProviderDegraded(
+                f"MealDB lookups failed for {len(errors)} of {len(meal_ids)} meals ({errors[0]})", found
+            )
+        return found
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _filter(self, params: Dict[str, str]) -> List[str]:
+        data = self._fetch_json(self._filter_url, params)
+        return [str(meal["idMeal"]) for meal in data.get("meals") or [] if meal.get("idMeal")]
+
+    def _lookup_safely(self, meal_id: str) -> Optional[Recipe] | Exception:
+        """The meal, or the error that stopped it (CircuitOpenError included).
+
+        A cancelled search is not a failed lookup: SearchCancelled propagates.
+        """
+        try:
+            return shared_call(self._lookups, meal_id, lambda: self._lookup(meal_id))[0]
+        except SearchCancelled:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            return exc
+
+    def _lookup(self, meal_id: str) -> Optional[Recipe]:
+        cached = self._cache.get(meal_id)
+        if cached is not None:
+            return cached
+        data = self._fetch_json(self._lookup_url, {"i": meal_id})
+        meals = data.get("meals") or []
+        if not meals:
+            return None
+        (recipe,) = self._adapter.adapt({"meals": meals[:1]})
+        self._cache.put(meal_id, recipe)
+        return recipe
+
+
+def rank_meal_ids(id_lists: Iterable[Sequence[str]]) -> List[str]:
+    """Meal ids ordered by how many filters matched them (all-ingredient hits first).
+
+    Ties keep the order in which ids first appeared, so results are stable.
+    """
+    counts: Counter = Counter()
+    for ids in id_lists:
+        counts.update(dict.fromkeys(ids, 1))
+    # Counter keeps first-seen order and sorted() is stable.
+    return sorted(counts, key=lambda meal_id: -counts[meal_id])
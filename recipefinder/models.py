@@ -1,13 +1,62 @@
+import sys
+import zlib
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Any, Optional, Sequence, Tuple
 
+# Instructions longer than this (in characters) are stored zlib-compressed and
+# inflated on access. Set to 0 to disable compression.
+COMPRESS_INSTRUCTIONS_OVER = 1024
 
-@dataclass
+
+@dataclass(slots=True)
 class Recipe:
-    """Unified recipefinder model produced by adapters."""
+    """Unified recipefinder model produced by adapters.
+
+    Kept compact so caches and the local corpus can hold many recipes: no
+    instance dict, ingredients stored as a tuple, interned `source` values and
+    long `instructions` compressed in place. Any sequence is accepted for
+    `ingredients`.
+
+    `also_from` lists other providers that returned the same dish (filled in
+    by recipefinder.dedup); `providers` is `source` followed by those.
+    """
 
     title: str
     source: str
-    ingredients: List[str] = field(default_factory=list)
+    ingredients: Sequence[str] = ()
     instructions: str = ""
     image_url: Optional[str] = None
+    also_from: Tuple[str, ...] = field(default=(), compare=False)
+    # Lowercased search view built once by recipefinder.scoring; recipes are
+    # treated as immutable after adaptation, so it never needs invalidating.
+    _normalized: Optional[Any] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.source = sys.intern(self.source)
+        if type(self.ingredients) is not tuple:
+            self.ingredients = tuple(self.ingredients)
+
+    @property
+    def providers(self) -> Tuple[str, ...]:
+        return (self.source,) + self.also_from
+
+
+def _compressed_text_property(cls: type, name: str) -> None:
+    """Route a slot through a property that compresses long strings."""
+    slot = cls.__dict__[name]
+
+    def fget(self) -> str:
+        value = slot.__get__(self, cls)
+        if type(value) is bytes:
+            return zlib.decompress(value).decode("utf-8")
+        return value
+
+    def fset(self, value: str) -> None:
+        if COMPRESS_INSTRUCTIONS_OVER and value and len(value) > COMPRESS_INSTRUCTIONS_OVER:
+            value = zlib.compress(value.encode("utf-8"))
+        slot.__set__(self, value)
+
+    setattr(cls, name, property(fget, fset))
+
+
+_compressed_text_property(Recipe, "instructions")
@@ -1,7 +1,10 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional, Tuple
 
 from utils.settings import Settings, get_settings
 
+# Credentials never take part in request identity (cache keys, coalescing, logs).
+SECRET_PARAMS = frozenset({"apiKey"})
+
 
 class RecipeQueryBuilder:
     """Builder pattern for consistent query construction across providers.
@@ -42,17 +45,42 @@ class RecipeQueryBuilder:
             return {"i": ",".join(self._ingredients)}
         return {"s": ""}
 
-    def build_for_spoonacular(self, api_key: str) -> Dict[str, str | int]:
-        return {
+    def build_for_mealdb_filters(self) -> List[Dict[str, str]]:
+        """One filter.php query per distinct ingredient (MealDB uses `_` for spaces)."""
+        names = dict.fromkeys("_".join(item.lower().split()) for item in self._ingredients)
+        return [{"i": name} for name in names]
+
+    def build_for_spoonacular(
+        self, api_key: str, offset: int = 0, number: int | None = None
+    ) -> Dict[str, str | int]:
+        params: Dict[str, str | int] = {
             "apiKey": api_key,
             "query": self._keywords or "",
             "includeIngredients": ",".join(self._ingredients),
-            "number": self._limit,
+            "number": self._limit if number is None else number,
             "addRecipeInformation": "true",
         }
+        if offset:
+            params["offset"] = offset
+        return params
 
     def requested_ingredients(self) -> List[str]:
         return list(self._ingredients)
 
     def requested_keywords(self) -> str:
         return self._keywords or ""
+
+
+def normalize_params(params: Mapping[str, object]) -> Tuple[Tuple[str, str], ...]:
+    """Canonical, credential-free form of provider params.
+
+    Two searches that only differ in whitespace/case or in the API key map to
+    the same tuple, which makes it usable as a cache or coalescing key.
+    """
+    return tuple(
+        sorted(
+            (key, str(value).strip().lower())
+            for key, value in params.items()
+            if key not in SECRET_PARAMS
+        )
+    )
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from contextlib import contextmanager
+from typing import Callable, Deque, Iterator, Optional, Sequence, Tuple, TypeVar
+
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
+
+from .cancellation import check_cancelled
+from .models import Recipe
+
+T = TypeVar("T")
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+class ProviderDegraded(Exception):
+    """A provider answered only in part (rate limit, quota, failed lookups).
+
+    `recipes` holds whatever it did return. Searches still show them, but
+    report the provider as failed and never keep the answer as complete.
+    """
+
+    def __init__(self, message: str, recipes: Sequence[Recipe] = ()) -> None:
+        super().__init__(message)
+        self.recipes = list(recipes)
+
+
+class CircuitBreaker:
+    """Per-provider breaker that opens on consecutive failures or slow calls.
+
+    Why: A sick upstream used to cost every search its full timeout plus retries.
+    Where: RecipeService._get_response guards every MealDB/Spoonacular call.
+    Problem solved: After `failure_threshold` bad calls in a row the provider
+    is skipped immediately. After `reset_timeout` seconds a single probe call
+    is let through (half-open): success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        slow_call: float | None = None,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        on_change: Callable[[str], None] | None = None,
+    ) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.slow_call = slow_call
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._on_change = on_change
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self._set_state(HALF_OPEN)
+            if self._state == HALF_OPEN:
+                if self._probing:
+                    return False
+                self._probing = True
+            return True
+
+    def record_success(self, elapsed: float = 0.0) -> None:
+        if self.slow_call is not None and elapsed > self.slow_call:
+            self.record_failure()
+            return
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            if self._state != CLOSED:
+                self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+                if self._state != OPEN:
+                    self._set_state(OPEN)
+
+    def release(self) -> None:
+        """Give back a half-open probe slot without judging the upstream (e.g. cache hit)."""
+        with self._lock:
+            self._probing = False
+
+    def _set_state(self, state: str) -> None:
+        self._state = state
+        if self._on_change is not None:
+            self._on_change(state)
+
+
+class LatencyWindow:
+    """Recent latencies of one provider, for percentile-based hedge delays."""
+
+    def __init__(self, size: int = 200, min_samples: int = 20) -> None:
+        self._samples: Deque[float] = deque(maxlen=max(1, size))
+        self._min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """The pct-th percentile, or None until enough samples were seen."""
+        with self._lock:
+            if len(self._samples) < self._min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def hedged(fn: Callable[[], T], delay: float, executor: Executor) -> Tuple[T, bool]:
+    """Run `fn`; if it hasn't finished after `delay` seconds, start a second copy.
+
+    Returns `(result, hedge_won)` from whichever copy succeeds first. The slower
+    copy is left to finish on its own; its result is dropped. Only use this for
+    idempotent, free calls.
+    """
+    primary = executor.submit(fn)
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        return primary.result(), False
+    backup = executor.submit(fn)
+    pending = {primary, backup}
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result(), future is backup
+            error = error or future.exception()
+    raise error  # type: ignore[misc]
+
+
+_budget = threading.local()
+
+
+@contextmanager
+def latency_budget(seconds: float) -> Iterator[None]:
+    """Bound the time BudgetRetry may spend on this thread's request, retries included."""
+    previous = getattr(_budget, "deadline", None)
+    deadline = time.monotonic() + seconds
+    _budget.deadline = deadline if previous is None else min(previous, deadline)
+    try:
+        yield
+    finally:
+        _budget.deadline = previous
+
+
+def remaining_budget() -> Optional[float]:
+    deadline = getattr(_budget, "deadline", None)
+    return None if deadline is None else deadline - time.monotonic()
+
+
+class BudgetRetry(Retry):
+    """urllib3 Retry that also stops once the next attempt can't start within budget.
+
+    The count limits still apply. Inside `latency_budget(...)` a retry is only
+    scheduled if its backoff (or Retry-After) ends before the deadline, so a
+    failing upstream costs at most the budget instead of N timeouts plus backoff.
+    A cancelled search (see cancellation.py) gets no retries at all.
+    """
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        check_cancelled()
+        new = super().increment(method, url, response, error, _pool, _stacktrace)
+        remaining = remaining_budget()
+        if remaining is not None:
+            wait_for = new.get_backoff_time()
+            if response is not None and new.respect_retry_after_header:
+                wait_for = max(wait_for, new.get_retry_after(response) or 0)
+            if wait_for >= remaining:
+                reason = error or ResponseError(f"latency budget exhausted after {len(new.history)} attempts")
+                raise MaxRetryError(_pool, url, reason) from reason
+        return new
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from typing import FrozenSet, List, NamedTuple, Optional, Tuple
+
+from .ingredients import normalize_ingredient
+from .models import Recipe
+from .query_builder import RecipeQueryBuilder
+
+
+class NormalizedRecipe:
+    """Search view of a recipe.
+
+    `tokens` is the set of canonical ingredient tokens (see ingredients.py);
+    `lines` keeps them per ingredient line so multi-word terms cannot match
+    across two lines. The per-line tuples are shared through the normalizer's
+    cache. `text` (title + instructions) stays None until a keyword query
+    needs it, so ingredient-only searches never build, inflate or clean
+    instructions.
+    """
+
+    __slots__ = ("title", "tokens", "lines", "ingredient_count", "text")
+
+    def __init__(
+        self, title: str, lines: Tuple[Tuple[str, ...], ...], ingredient_count: int
+    ) -> None:
+        self.title = title
+        self.lines = lines
+        self.tokens: FrozenSet[str] = frozenset().union(*lines)
+        self.ingredient_count = ingredient_count
+        self.text: Optional[str] = None
+
+
+class MatchScore(NamedTuple):
+    ing_matches: int
+    kw_hits: int
+    missing: int
+    ingredient_count: int
+    title: str  # lowercased, for tie-breaks
+
+
+def normalized(recipe: Recipe) -> NormalizedRecipe:
+    """Return the recipe's search view, building it on first use."""
+    view = recipe._normalized
+    if view is None:
+        ingredients = recipe.ingredients
+        view = NormalizedRecipe(
+            title=recipe.title.lower(),
+            lines=tuple(map(normalize_ingredient, ingredients)),
+            ingredient_count=len(ingredients),
+        )
+        recipe._normalized = view
+    return view
+
+
+def normalized_text(recipe: Recipe) -> str:
+    """Lowercased title + instructions, built on first use."""
+    view = normalized(recipe)
+    text = view.text
+    if text is None:
+        text = view.text = view.title + "\n" + (recipe.instructions or "").lower()
+    return text
+
+
+class ScoringKernel:
+    """Query-side half of ranking, shared by every strategy.
+
+    Requested ingredients are normalized once per rank call and each recipe
+    once for its lifetime, so "Tomatoes" matches "2 cups chopped tomato".
+    Single-word terms (the common case) are matched with one set intersection
+    against the recipe's token set; multi-word terms must fit inside a single
+    ingredient line.
+    """
+
+    def __init__(self, builder: RecipeQueryBuilder) -> None:
+        terms = (normalize_ingredient(item) for item in builder.requested_ingredients() if item)
+        # Deduped: "tomato" and "tomatoes" are one requested ingredient.
+        self.ingredients: List[Tuple[str, ...]] = list(dict.fromkeys(term for term in terms if term))
+        self._single: FrozenSet[str] = frozenset(term[0] for term in self.ingredients if len(term) == 1)
+        self._multi: List[Tuple[str, ...]] = [term for term in self.ingredients if len(term) > 1]
+        self.keywords: List[str] = [
+            kw.lower() for kw in builder.requested_keywords().split() if kw
+        ]
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.ingredients and not self.keywords
+
+    def score(self, recipe: Recipe) -> MatchScore:
+        view = normalized(recipe)
+        tokens = view.tokens
+        ing_matches = len(self._single & tokens) if self._single else 0
+        for term in self._multi:
+            if tokens.issuperset(term) and any(
+                all(token in line for token in term) for line in view.lines
+            ):
+                ing_matches += 1
+        kw_hits = 0
+        if self.keywords:
+            text = view.text
+            if text is None:
+                text = normalized_text(recipe)
+            for term in self.keywords:
+                if term in text:
+                    kw_hits += 1
+        missing = len(self.ingredients) - ing_matches
+        return MatchScore(ing_matches, kw_hits, missing, view.ingredient_count, view.title)
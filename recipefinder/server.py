@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import json
+import re
+import select
+import socket
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Dict, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .metrics import MetricsRegistry
+from .models import Recipe
+from .query_builder import RecipeQueryBuilder
+from .service import RecipeService
+from .strategies import RecipeStrategy
+
+from utils.settings import Settings, get_settings
+
+
+def strategy_id(strategy: RecipeStrategy) -> str:
+    """URL-friendly identifier, e.g. "best-match-most-hits"."""
+    return re.sub(r"[^a-z0-9]+", "-", strategy.name.lower()).strip("-")
+
+
+def recipe_to_json(recipe: Recipe) -> Dict:
+    return {
+        "title": recipe.title,
+        "source": recipe.source,
+        "providers": list(recipe.providers),
+        "ingredients": list(recipe.ingredients),
+        "instructions": recipe.instructions,
+        "image_url": recipe.image_url,
+    }
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTP server that handles connections on a fixed-size worker pool.
+
+    Why: ThreadingHTTPServer starts a thread per connection, so a burst of
+    clients can create an unbounded number of threads.
+    Where: `python main.py --server` and RecipeServer.
+    Problem solved: Concurrency is capped at `workers`; extra connections wait
+    in the accept queue or the pool queue instead of exhausting the process.
+    `backlogged` tells idle keep-alive connections to give their worker up.
+    """
+
+    allow_reuse_address = True
+    request_queue_size = 128
+
+    def __init__(self, address: Tuple[str, int], handler, workers: int) -> None:
+        super().__init__(address, handler)
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="http")
+        self._queued = 0
+        self._queued_lock = threading.Lock()
+
+    @property
+    def backlogged(self) -> bool:
+        """Whether accepted connections are waiting for a worker."""
+        return self._queued > 0
+
+    def process_request(self, request: socket.socket, client_address) -> None:
+        with self._queued_lock:
+            self._queued += 1
+        future = self._pool.submit(self._process, request, client_address)
+        future.add_done_callback(lambda done: self._close_if_cancelled(done, request))
+
+    def _close_if_cancelled(self, future: Future, request: socket.socket) -> None:
+        # server_close cancels connections still queued; their sockets must not leak.
+        if future.cancelled():
+            self.shutdown_request(request)
+
+    def _process(self, request: socket.socket, client_address) -> None:
+        with self._queued_lock:
+            self._queued -= 1
+        try:
+            self.finish_request(request, client_address)
+        except Exception:  # noqa: BLE001
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class RecipeRequestHandler(BaseHTTPRequestHandler):
+    """JSON API over one shared RecipeService.
+
+    GET /search?q=<keywords>&ingredients=a,b&limit=10&strategy=<id or name>
+    GET /strategies
+    GET /metrics          (Prometheus text; ?format=json for JSON)
+    GET /health
+
+    A kept-alive connection waits at most `idle_timeout` seconds for its next
+    request, and not at all once other connections are queued for a worker;
+    `timeout` only bounds a request that has started.
+    """
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+    server_version = "RecipeFinder"
+    idle_timeout = 5.0
+    idle_poll = 0.1
+    service: RecipeService
+    settings: Settings
+
+    def handle(self) -> None:
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection and self._await_next_request():
+            self.handle_one_request()
+
+    def _await_next_request(self) -> bool:
+        """True once the next request starts arriving; False to close the connection."""
+        if self._request_buffered():
+            return True
+        deadline = time.monotonic() + self.idle_timeout
+        while not self.server.backlogged:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            readable, _, _ = select.select([self.connection], [], [], min(remaining, self.idle_poll))
+            if readable:
+                return True
+        return False
+
+    def _request_buffered(self) -> bool:
+        # A pipelined request may already sit in rfile's buffer, where select() cannot see it.
+        self.connection.settimeout(0)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def do_GET(self) -> None:  # noqa: N802
+        parts = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        routes = {
+            "/search": self._search,
+            "/strategies": self._strategies,
+            "/metrics": self._metrics,
+            "/health": self._health,
+        }
+        route = routes.get(parts.path.rstrip("/") or "/")
+        if route is None:
+            self._send_json(404, {"error": f"unknown path {parts.path}"})
+            return
+        self.service.metrics.inc("server_requests_total", path=parts.path)
+        try:
+            with self.service.metrics.timer("server_seconds", path=parts.path):
+                route(query)
+        except ConnectionError:
+            self.close_connection = True  # the client went away; nothing can be sent
+        except ValueError as exc:
+            self._send_json(400, {"error": str(exc)})
+        except Exception as exc:  # noqa: BLE001
+            print(f"Server error on {self.path}: {exc}")
+            self._send_json(500, {"error": "internal error"})
+
+    def _search(self, query: Dict[str, str]) -> None:
+        keywords = query.get("q", "")
+        ingredients = [item for item in query.get("ingredients", "").split(",") if item.strip()]
+        if not keywords.strip() and not ingredients:
+            raise ValueError("provide q and/or ingredients")
+        try:
+            limit = int(query.get("limit", self.settings.QUERY_DEFAULT_LIMIT))
+        except ValueError:
+            raise ValueError("limit must be an integer") from None
+        strategy = self._find_strategy(query.get("strategy"))
+
+        builder = (
+            RecipeQueryBuilder(self.settings)
+            .with_keywords(keywords)
+            .with_ingredients(ingredients)
+            .with_limit(limit)
+        )
+        recipes = self.service.fetch_recipes(builder, strategy)
+        self._send_json(
+            200,
+            {
+                "query": {"q": keywords, "ingredients": ingredients, "limit": builder.limit()},
+                "strategy": strategy_id(strategy),
+                "count": len(recipes),
+                "recipes": [recipe_to_json(recipe) for recipe in recipes],
+            },
+        )
+
+    def _find_strategy(self, wanted: str | None) -> RecipeStrategy:
+        strategies = self.service.available_strategies()
+        if not wanted:
+            return strategies[0]
+        for strategy in strategies:
+            if wanted in (strategy_id(strategy), strategy.name):
+                return strategy
+        raise ValueError(f"unknown strategy {wanted!r}")
+
+    def _strategies(self, _query: Dict[str, str]) -> None:
+        self._send_json(
+            200,
+            [
+                {"id": strategy_id(strategy), "name": strategy.name}
+                for strategy in self.service.available_strategies()
+            ],
+        )
+
+    def _metrics(self, query: Dict[str, str]) -> None:
+        metrics: MetricsRegistry = self.service.metrics
+        if query.get("format") == "json":
+            self._send(200, metrics.to_json().encode("utf-8"), "application/json")
+        else:
+            self._send(200, metrics.to_prometheus().encode("utf-8"), "text/plain; version=0.0.4")
+
+    def _health(self, _query: Dict[str, str]) -> None:
+        self._send_json(
+            200,
+            {
+                "status": "ok",
+                "providers": self.service.provider_names(),
+                "connections": self.service.connection_stats(),
+            },
+        )
+
+    def _send_json(self, status: int, payload: object) -> None:
+        self._send(status, json.dumps(payload).encode("utf-8"), "application/json")
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        pass  # request counts and latencies go to /metrics instead
+
+
+class RecipeServer:
+    """Headless entry point: one RecipeService shared by every request.
+
+    The service owns a single pooled, cached HTTP session, so connections to
+    the providers and cached responses are reused across clients.
+    """
+
+    def __init__(
+        self,
+        service: RecipeService | None = None,
+        settings: Settings | None = None,
+        host: str | None = None,
+        port: int | None = None,
+    ) -> None:
+        self.settings = settings or get_settings()
+        self.service = service or RecipeService(settings=self.settings)
+        handler = type(
+            "BoundRecipeRequestHandler",
+            (RecipeRequestHandler,),
+            {
+                "service": self.service,
+                "settings": self.settings,
+                "timeout": self.settings.SERVER_REQUEST_TIMEOUT,
+                "idle_timeout": self.settings.SERVER_IDLE_TIMEOUT,
+            },
+        )
+        self.httpd = PooledHTTPServer(
+            (host if host is not None else self.settings.SERVER_HOST,
+             port if port is not None else self.settings.SERVER_PORT),
+            handler,
+            workers=self.settings.SERVER_WORKERS,
+        )
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self) -> None:
+        print(f"Recipe Finder API listening on {self.url}")
+        try:
+            self.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def start(self) -> "RecipeServer":
+        """Serve on a background thread (tests, benchmarks)."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread = None
+        self.httpd.server_close()
+        self.service.close()
+
+    def __enter__(self) -> "RecipeServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
@@ -1,13 +1,75 @@
-from typing import List
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Set, Tuple
 
-from .adapters import MealDBAdapter, SpoonacularAdapter
-from .http_session import create_http_session
+import requests
+
+from .adapters import MealDBAdapter, RecipeAdapter, SpoonacularAdapter
+from .cancellation import (
+    CancellationToken,
+    SearchCancelled,
+    cancel_scope,
+    check_cancelled,
+    propagate,
+    shared_call,
+)
+from .candidates import CandidateCache
+from .corpus import RecipeCorpus
+from .dedup import DuplicateFinder
+from .http_cache import cache_key, get_response_cache
+from .http_session import create_http_session, pool_stats, start_prewarm
+from .mealdb import CachingMealDBAdapter, MealCache, MealDBIngredientSearch, mealdb_endpoint
+from .metrics import MetricsRegistry
 from .models import Recipe
-from .query_builder import RecipeQueryBuilder
+from .query_builder import RecipeQueryBuilder, normalize_params
+from .resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyWindow,
+    ProviderDegraded,
+    hedged,
+    latency_budget,
+)
+from .singleflight import SingleFlight
+from .spoonacular import QuotaTracker, SpoonacularClient, TokenBucket
 from .strategies import BestMatchStrategy, FewerMissingStrategy, RecipeStrategy
 
 from utils.settings import Settings, get_settings
 
+ProviderFetcher = Callable[[RecipeQueryBuilder], List[Recipe]]
+
+
+@dataclass
+class SearchProgress:
+    """One streaming update from RecipeService.fetch_recipes_iter."""
+
+    provider: str  # provider that just answered ("" for the final update after a timeout)
+    batch: List[Recipe]  # recipes that provider added
+    recipes: List[Recipe]  # ranked results so far
+    pending: int  # providers still outstanding
+
+    @property
+    def done(self) -> bool:
+        return self.pending == 0
+
+
+@dataclass
+class BatchResult:
+    """One finished query from RecipeService.fetch_recipes_many."""
+
+    index: int  # position of the builder in the input
+    builder: RecipeQueryBuilder
+    recipes: List[Recipe]  # ranked results from every provider that answered
+    errors: Dict[str, str] = field(default_factory=dict)  # provider -> error message
+    completed: int = 0  # queries finished so far, this one included
+    total: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
 
 class RecipeService:
     """Coordinates API calls using the Builder and Adapters."""
@@ -16,10 +78,12 @@ class RecipeService:
         self,
         spoonacular_key: str | None = None,
         settings: Settings | None = None,
+        metrics: MetricsRegistry | None = None,
     ) -> None:
         self._settings = settings or get_settings()
         self._session = create_http_session(self._settings)
-        self._mealdb_adapter = MealDBAdapter()
+        self._meal_cache = MealCache(self._settings.MEALDB_MEAL_CACHE_ENTRIES)
+        self._mealdb_adapter = CachingMealDBAdapter(MealDBAdapter(), self._meal_cache)
         self._spoonacular_adapter = SpoonacularAdapter()
         self._spoonacular_key = spoonacular_key or self._settings.SPOONACULAR_API_KEY
         self._strategies: List[RecipeStrategy] = [
@@ -27,49 +91,658 @@ class RecipeService:
             FewerMissingStrategy(),
         ]
         self._default_strategy: RecipeStrategy = self._strategies[0]
+        self._providers: List[Tuple[str, ProviderFetcher]] = [
+            ("MealDB", self._fetch_mealdb),
+            ("Spoonacular", self._fetch_spoonacular),
+        ]
+        self._corpus: RecipeCorpus | None = None
+        self._indexer: ThreadPoolExecutor | None = None
+        if self._settings.CORPUS_ENABLED:
+            self._corpus = RecipeCorpus(
+                self._settings.CORPUS_PATH or None, max_recipes=self._settings.CORPUS_MAX_RECIPES
+            )
+            self._providers.append(("Local", self._fetch_corpus))
+            # Loading and indexing read every field; keep them off the search path.
+            # The load is queued first, so recipes remembered meanwhile wait for it.
+            self._indexer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="corpus-index")
+            self._indexer.submit(self._corpus.load)
+        self._mealdb_ingredients: MealDBIngredientSearch | None = None
+        if self._settings.MEALDB_INGREDIENT_SEARCH and self._settings.MEALDB_URL:
+            self._mealdb_ingredients = MealDBIngredientSearch(
+                fetch_json=self._get_mealdb_json,
+                filter_url=self._settings.MEALDB_FILTER_URL
+                or mealdb_endpoint(self._settings.MEALDB_URL, "filter.php"),
+                lookup_url=self._settings.MEALDB_LOOKUP_URL
+                or mealdb_endpoint(self._settings.MEALDB_URL, "lookup.php"),
+                adapter=MealDBAdapter(),
+                cache=self._meal_cache,
+                concurrency=self._settings.MEALDB_LOOKUP_CONCURRENCY,
+            )
+        self._executor: ThreadPoolExecutor | None = None
+        self.metrics = metrics or MetricsRegistry()
+        self._breakers: Dict[str, CircuitBreaker] = {
+            name: CircuitBreaker(
+                failure_threshold=self._settings.CIRCUIT_FAILURE_THRESHOLD,
+                slow_call=self._settings.CIRCUIT_SLOW_CALL or None,
+                reset_timeout=self._settings.CIRCUIT_RESET_TIMEOUT,
+                on_change=lambda state, name=name: self._on_circuit_change(name, state),
+            )
+            for name in ("MealDB", "Spoonacular")
+        }
+        self._latency: Dict[str, LatencyWindow] = {}
+        self._hedged_providers: Set[str] = set()
+        self._hedge_pool: ThreadPoolExecutor | None = None
+        if self._settings.HEDGE_ENABLED:
+            self._hedged_providers = {
+                name.strip() for name in self._settings.HEDGE_PROVIDERS.split(",") if name.strip()
+            }
+            self._hedge_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="hedge")
+        self._spoonacular = SpoonacularClient(
+            get=self._get_spoonacular,
+            adapter=self._spoonacular_adapter,
+            limiter=TokenBucket(
+                self._settings.SPOONACULAR_RATE_LIMIT, self._settings.SPOONACULAR_BURST
+            ),
+            quota=QuotaTracker(reserve=self._settings.SPOONACULAR_QUOTA_RESERVE),
+            is_cached=lambda params: self._is_cached(self._settings.SPOONACULAR_URL, params),
+            page_size=self._settings.SPOONACULAR_PAGE_SIZE,
+            rate_wait=self._settings.SPOONACULAR_RATE_WAIT,
+            metrics=self.metrics,
+        )
+        self._inflight: SingleFlight[List[Recipe]] = SingleFlight()
+        self._candidates = CandidateCache(
+            self._settings.CANDIDATE_CACHE_ENTRIES, self._settings.CANDIDATE_CACHE_TTL
+        )
+        self._prewarm: threading.Thread | None = None
+        if self._settings.HTTP_PREWARM:
+            self._prewarm = start_prewarm(
+                self._session, self._provider_urls(), self._settings.HTTP_PREWARM_CONNECTIONS
+            )
+
+    @property
+    def settings(self) -> Settings:
+        return self._settings
+
+    @property
+    def session(self) -> requests.Session:
+        """The pooled, cached HTTP session; share it instead of creating another."""
+        return self._session
 
     def available_strategies(self) -> List[RecipeStrategy]:
         return list(self._strategies)
 
+    def provider_names(self) -> List[str]:
+        return [name for name, _ in self._providers]
+
     def fetch_recipes(
-        self, query_builder: RecipeQueryBuilder, strategy: RecipeStrategy | None = None
+        self,
+        query_builder: RecipeQueryBuilder,
+        strategy: RecipeStrategy | None = None,
+        cancel: CancellationToken | None = None,
     ) -> List[Recipe]:
+        """Search every provider and rank the merged results.
+
+        The merged candidates are kept for `rerank` when every provider answered
+        in full (none failed, degraded or missed the deadline).
+        Raises SearchCancelled if `cancel` is cancelled before the search ends.
+        """
         chosen_strategy = strategy or self._default_strategy
-        recipes = self._gather_all_providers(query_builder)
-        return chosen_strategy.rank(recipes, query_builder)
+        with self.metrics.timer("search_seconds", mode="batch"):
+            recipes, complete = self._gather_all_providers(query_builder, cancel)
+            if complete:
+                self._candidates.put(query_builder, recipes)
+            with self.metrics.timer("stage_seconds", stage="rank", provider="all"):
+                return chosen_strategy.rank(recipes, query_builder)
 
-    def _gather_all_providers(self, query_builder: RecipeQueryBuilder) -> List[Recipe]:
-        recipes: List[Recipe] = []
-        recipes.extend(self._fetch_mealdb(query_builder))
-        recipes.extend(self._fetch_spoonacular(query_builder))
-        return recipes
+    def rerank(
+        self, query_builder: RecipeQueryBuilder, strategy: RecipeStrategy | None = None
+    ) -> List[Recipe] | None:
+        """Rank the candidates of a recent search again, without any request.
 
-    def _fetch_mealdb(self, query_builder: RecipeQueryBuilder) -> List[Recipe]:
-        params = query_builder.build_for_mealdb()
-        try:
-            response = self._session.get(
-                self._settings.MEALDB_URL,
-                params=params,
-                timeout=self._settings.HTTP_TIMEOUT,
+        Returns None unless a complete search for the same keywords and
+        ingredients, with at least this limit, ran within CANDIDATE_CACHE_TTL;
+        call fetch_recipes(_iter) then.
+        """
+        candidates = self._candidates.get(query_builder)
+        self.metrics.inc("rerank_total", result="miss" if candidates is None else "hit")
+        if candidates is None:
+            return None
+        with self.metrics.timer("stage_seconds", stage="rank", provider="all"):
+            return (strategy or self._default_strategy).rank(candidates, query_builder)
+
+    def fetch_recipes_iter(
+        self,
+        query_builder: RecipeQueryBuilder,
+        strategy: RecipeStrategy | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> Iterator[SearchProgress]:
+        """Stream ranked results, one update per provider as soon as it answers.
+
+        Each update re-ranks the previous top results together with the new
+        batch only. Scores don't depend on other recipes, so this gives the same
+        top-k as ranking everything seen so far, and time-to-first-result is the
+        fastest provider's latency. Cancelling `cancel` ends the stream with
+        SearchCancelled as soon as possible, even while providers are in flight.
+        As with fetch_recipes, a complete search is kept for `rerank`.
+        """
+        chosen_strategy = strategy or self._default_strategy
+        started = time.perf_counter()
+        finder = self._duplicate_finder()
+        ranked: List[Recipe] = []
+        remaining = len(self._providers)
+        failed: Set[int] = set()
+        for index, batch in self._iter_provider_batches(query_builder, cancel, failed):
+            remaining -= 1
+            merged_before = finder.merged
+            with self.metrics.timer("stage_seconds", stage="dedup", provider="all"):
+                fresh = finder.add_many(batch)
+                # Duplicates in this batch may have added providers to shown recipes.
+                ranked = [finder.current(recipe) for recipe in ranked]
+            self.metrics.inc("duplicates_merged_total", finder.merged - merged_before)
+            with self.metrics.timer("stage_seconds", stage="rank", provider="all"):
+                ranked = chosen_strategy.rank(ranked + fresh, query_builder)
+            yield SearchProgress(
+                provider=self._providers[index][0],
+                batch=fresh,
+                recipes=ranked,
+                pending=remaining,
             )
-            response.raise_for_status()
-            return self._mealdb_adapter.adapt(response.json())
+        self.metrics.observe("search_seconds", time.perf_counter() - started, mode="stream")
+        if not remaining and not failed:
+            self._candidates.put(query_builder, finder.kept())
+        if remaining:
+            # Some providers missed the deadline or failed; still signal completion.
+            yield SearchProgress(provider="", batch=[], recipes=ranked, pending=0)
+
+    def fetch_recipes_many(
+        self,
+        query_builders: Iterable[RecipeQueryBuilder],
+        strategy: RecipeStrategy | None = None,
+        max_concurrency_per_provider: int | None = None,
+    ) -> Iterator[BatchResult]:
+        """Run many searches at once, yielding each one as soon as it is complete.
+
+        Identical provider requests across the batch are sent once and shared.
+        Each provider gets its own pool of `max_concurrency_per_provider`
+        workers, so a slow or rate-limited upstream doesn't hold back the
+        others. Spoonacular's pool is further capped at the calls its rate
+        limiter admits within SPOONACULAR_RATE_WAIT (2 by default), so a batch
+        reaches it at SPOONACULAR_RATE_LIMIT instead of having most calls
+        skipped as rate limited. A failing provider is reported in `BatchResult.errors` and the
+        query is still ranked with whatever the other providers returned.
+        Results arrive in completion order; use `BatchResult.index` to match
+        them to the input. There is no search deadline here: each request is
+        bounded by its HTTP timeout instead.
+        """
+        builders = list(query_builders)
+        chosen_strategy = strategy or self._default_strategy
+        workers = max_concurrency_per_provider or self._settings.BATCH_CONCURRENCY_PER_PROVIDER
+        total = len(builders)
+        batches: List[Dict[int, List[Recipe]]] = [{} for _ in builders]
+        errors: List[Dict[str, str]] = [{} for _ in builders]
+        outstanding = [len(self._providers)] * total
+        completed = 0
+        if not self._providers:
+            for index, builder in enumerate(builders):
+                yield BatchResult(index, builder, [], {}, index + 1, total)
+            return
+
+        executors = [
+            ThreadPoolExecutor(
+                max_workers=self._batch_workers(name, workers), thread_name_prefix=f"batch-{name.lower()}"
+            )
+            for name, _ in self._providers
+        ]
+        tasks: Dict[Future, Tuple[int, List[int]]] = {}
+        try:
+            for provider_index, (name, _) in enumerate(self._providers):
+                groups: Dict[Hashable, List[int]] = {}
+                for index, builder in enumerate(builders):
+                    groups.setdefault(self._request_key(name, builder, index), []).append(index)
+                for members in groups.values():
+                    future = executors[provider_index].submit(
+                        self._call_fetch, provider_index, builders[members[0]]
+                    )
+                    tasks[future] = (provider_index, members)
+            self.metrics.inc("batch_requests_total", len(tasks))
+            self.metrics.inc("batch_requests_deduplicated_total", total * len(self._providers) - len(tasks))
+
+            for future in as_completed(tasks):
+                provider_index, members = tasks.pop(future)
+                name = self._providers[provider_index][0]
+                try:
+                    recipes, error = future.result(), ""
+                except ProviderDegraded as exc:
+                    recipes, error = exc.recipes, f"{type(exc).__name__}: {exc}"
+                except Exception as exc:  # noqa: BLE001
+                    recipes, error = [], f"{type(exc).__name__}: {exc}"
+                for index in members:
+                    if error:
+                        errors[index][name] = error
+                    batches[index][provider_index] = recipes
+                    outstanding[index] -= 1
+                    if outstanding[index]:
+                        continue
+                    completed += 1
+                    merged = self._merge([batches[index][key] for key in sorted(batches[index])])
+                    batches[index] = {}
+                    with self.metrics.timer("stage_seconds", stage="rank", provider="all"):
+                        ranked = chosen_strategy.rank(merged, builders[index])
+                    yield BatchResult(
+                        index=index,
+                        builder=builders[index],
+                        recipes=ranked,
+                        errors=errors[index],
+                        completed=completed,
+                        total=total,
+                    )
+        finally:
+            for executor in executors:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_spoonacular_pages(
+        self, query_builder: RecipeQueryBuilder, max_results: int
+    ) -> Iterator[List[Recipe]]:
+        """Stream up to `max_results` Spoonacular recipes page by page, within the quota.
+
+        Unlike a search, this is not capped at QUERY_MAX_LIMIT; paging stops early
+        when the results run out or the rate/point budget is exhausted.
+        """
+        if not self._spoonacular_key:
+            return
+        for page in self._spoonacular.iter_pages(query_builder, self._spoonacular_key, max_results):
+            yield self._remember(page)
+
+    def _batch_workers(self, provider: str, workers: int) -> int:
+        if provider == "Spoonacular":
+            cap = self._spoonacular.max_concurrency
+            if cap is not None:
+                return max(1, min(workers, cap))
+        return max(1, workers)
+
+    def circuit_states(self) -> Dict[str, str]:
+        return {name: breaker.state for name, breaker in self._breakers.items()}
+
+    def spoonacular_quota(self) -> Dict[str, object]:
+        return vars(self._spoonacular.quota.state())
+
+    def cache_stats(self) -> Dict[str, int]:
+        cache = get_response_cache(self._session)
+        return cache.stats() if cache is not None else {}
+
+    def coalescing_stats(self) -> Dict[str, float]:
+        return self._inflight.stats()
+
+    def candidate_stats(self) -> Dict[str, float]:
+        return self._candidates.stats()
+
+    def connection_stats(self) -> Dict[str, Dict[str, float]]:
+        """Connection pool usage per provider host (see http_session.pool_stats)."""
+        return pool_stats(self._session)
+
+    def _provider_urls(self) -> List[str]:
+        # filter.php / lookup.php default to MEALDB_URL's host; custom ones may not.
+        urls = [self._settings.MEALDB_URL, self._settings.MEALDB_FILTER_URL, self._settings.MEALDB_LOOKUP_URL]
+        if self._spoonacular_key:
+            urls.append(self._settings.SPOONACULAR_URL)
+        return [url for url in urls if url]
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._mealdb_ingredients is not None:
+            self._mealdb_ingredients.close()
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False, cancel_futures=True)
+        if self._indexer is not None:
+            self._indexer.shutdown(wait=True)  # flush pending corpus writes
+            self._indexer = None
+        cache = get_response_cache(self._session)
+        if cache is not None:
+            cache.close()
+        self._session.close()
+
+    def _gather_all_providers(
+        self, query_builder: RecipeQueryBuilder, cancel: CancellationToken | None = None
+    ) -> Tuple[List[Recipe], bool]:
+        """Collect every provider that answered before the deadline.
+
+        Results are merged in provider order (not completion order) so ranking
+        ties stay deterministic regardless of which upstream was faster. The
+        flag is True when every provider answered without an error.
+        """
+        failed: Set[int] = set()
+        batches = dict(self._iter_provider_batches(query_builder, cancel, failed))
+        complete = len(batches) == len(self._providers) and not failed
+        return self._merge([batches[index] for index in sorted(batches)]), complete
+
+    def _iter_provider_batches(
+        self,
+        query_builder: RecipeQueryBuilder,
+        cancel: CancellationToken | None = None,
+        failed: Set[int] | None = None,
+    ) -> Iterator[Tuple[int, List[Recipe]]]:
+        """Yield `(provider index, recipes)` as providers answer, until the deadline.
+
+        Providers that raised are yielded with no recipes and added to `failed`;
+        degraded ones (ProviderDegraded) too, but with the recipes they returned.
+        Raises SearchCancelled once `cancel` is cancelled, without waiting for
+        providers still in flight.
+        """
+        if not self._settings.SEARCH_CONCURRENT:
+            for index in range(len(self._providers)):
+                self._check_cancelled(cancel)
+                yield index, self._run_provider(index, query_builder, cancel, failed)
+            self._check_cancelled(cancel)
+            return
+
+        self._check_cancelled(cancel)
+        deadline = time.monotonic() + self._settings.SEARCH_DEADLINE
+        executor = self._get_executor()
+        futures: Dict[Future, int] = {
+            executor.submit(self._run_provider, index, query_builder, cancel, failed): index
+            for index in range(len(self._providers))
+        }
+        pending = set(futures)
+        # Completed on cancel, so the wait below wakes up at once.
+        cancelled: Future = Future()
+        if cancel is not None:
+            cancel.on_cancel(lambda: cancelled.done() or cancelled.set_result(None))
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = wait(
+                    pending | {cancelled}, timeout=remaining, return_when=FIRST_COMPLETED
+                )
+                pending.discard(cancelled)
+                self._check_cancelled(cancel)
+                for future in sorted(done, key=futures.__getitem__):
+                    yield futures[future], future.result()
+        finally:
+            timed_out = time.monotonic() >= deadline and not (cancel is not None and cancel.cancelled)
+            for future in pending:
+                future.cancel()
+                if timed_out:
+                    provider = self._providers[futures[future]][0]
+                    self.metrics.inc("provider_deadline_missed_total", provider=provider)
+                    print(f"{provider} missed the search deadline")
+
+    def _merge(self, batches: List[List[Recipe]]) -> List[Recipe]:
+        """Concatenate provider batches, keeping the first copy of each (near-)duplicate.
+
+        The local corpus re-serves recipes a live provider may also return; live
+        copies come first in provider order, so they win and list the other
+        providers in `also_from`.
+        """
+        finder = self._duplicate_finder()
+        with self.metrics.timer("stage_seconds", stage="dedup", provider="all"):
+            for batch in batches:
+                finder.add_many(batch)
+        self.metrics.inc("duplicates_merged_total", finder.merged)
+        return finder.kept()
+
+    def _duplicate_finder(self) -> DuplicateFinder:
+        return DuplicateFinder(self._settings.DEDUP_THRESHOLD if self._settings.DEDUP_ENABLED else None)
+
+    def _run_provider(
+        self,
+        index: int,
+        query_builder: RecipeQueryBuilder,
+        cancel: CancellationToken | None = None,
+        failed: Set[int] | None = None,
+    ) -> List[Recipe]:
+        """Interactive searches: a failing (or cancelled) provider contributes no recipes."""
+        try:
+            with cancel_scope(cancel):
+                return self._call_fetch(index, query_builder)
+        except SearchCancelled:
+            return []
+        except ProviderDegraded as exc:
+            print(f"{exc}; showing {len(exc.recipes)} recipes it returned")
+            if failed is not None:
+                failed.add(index)
+            return exc.recipes
         except Exception as exc:  # noqa: BLE001
-            print(f"MealDB request failed: {exc}")
+            print(f"{self._providers[index][0]} request failed: {exc}")
+            if failed is not None:
+                failed.add(index)
             return []
 
+    def _check_cancelled(self, cancel: CancellationToken | None) -> None:
+        if cancel is not None and cancel.cancelled:
+            self.metrics.inc("searches_cancelled_total")
+            raise SearchCancelled()
+
+    def _call_fetch(self, index: int, query_builder: RecipeQueryBuilder) -> List[Recipe]:
+        name, fetch = self._providers[index]
+        try:
+            with self.metrics.timer("provider_seconds", provider=name):
+                return fetch(query_builder)
+        except SearchCancelled:
+            raise
+        except Exception as exc:
+            self.metrics.inc("provider_errors_total", provider=name, error=type(exc).__name__)
+            raise
+
+    def _request_key(self, provider: str, query_builder: RecipeQueryBuilder, fallback: int) -> Hashable:
+        """Identity of the upstream request a provider would make for this query.
+
+        Queries with equal keys are fetched once by fetch_recipes_many. Providers
+        without a known key use `fallback`, which keeps them unshared.
+        """
+        if provider == "MealDB":
+            if self._uses_mealdb_filters(query_builder):
+                filters = query_builder.build_for_mealdb_filters()
+                return ("filter", tuple(sorted(f["i"] for f in filters)), query_builder.limit())
+            return normalize_params(query_builder.build_for_mealdb())
+        if provider == "Spoonacular":
+            return normalize_params(query_builder.build_for_spoonacular(""))
+        if provider == "Local":
+            return (
+                query_builder.requested_keywords().lower(),
+                tuple(sorted(item.lower() for item in query_builder.requested_ingredients())),
+            )
+        return fallback
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            # Extra headroom so stragglers from a timed-out search don't block the next one.
+            self._executor = ThreadPoolExecutor(
+                max_workers=len(self._providers) * 4,
+                thread_name_prefix="recipe-provider",
+            )
+        return self._executor
+
+    def _provider_timeout(self, override: float | None) -> float:
+        return override if override is not None else self._settings.HTTP_TIMEOUT
+
+    def _uses_mealdb_filters(self, query_builder: RecipeQueryBuilder) -> bool:
+        return (
+            self._mealdb_ingredients is not None
+            and not query_builder.requested_keywords()
+            and bool(query_builder.requested_ingredients())
+        )
+
+    def _fetch_mealdb(self, query_builder: RecipeQueryBuilder) -> List[Recipe]:
+        if self._uses_mealdb_filters(query_builder):
+            with self.metrics.timer("stage_seconds", stage="query_build", provider="MealDB"):
+                filters = query_builder.build_for_mealdb_filters()
+            recipes = self._mealdb_ingredients.search(filters, query_builder.limit())
+            self.metrics.inc("provider_requests_total", provider="MealDB")
+            return self._remember(recipes)
+        with self.metrics.timer("stage_seconds", stage="query_build", provider="MealDB"):
+            params = query_builder.build_for_mealdb()
+        return self._request_provider(
+            "MealDB",
+            self._settings.MEALDB_URL,
+            params,
+            self._provider_timeout(self._settings.MEALDB_TIMEOUT),
+            self._mealdb_adapter,
+        )
+
     def _fetch_spoonacular(self, query_builder: RecipeQueryBuilder) -> List[Recipe]:
         if not self._spoonacular_key:
             return []
-        params = query_builder.build_for_spoonacular(self._spoonacular_key)
+        with self.metrics.timer("stage_seconds", stage="query_build", provider="Spoonacular"):
+            params = query_builder.build_for_spoonacular(self._spoonacular_key)
+        key = ("Spoonacular", self._settings.SPOONACULAR_URL, normalize_params(params))
+        return self._coalesced(
+            "Spoonacular", key, lambda: self._spoonacular.search(query_builder, self._spoonacular_key)
+        )
+
+    def _request_provider(
+        self,
+        provider: str,
+        url: str,
+        params: Dict,
+        timeout: float,
+        adapter: RecipeAdapter,
+    ) -> List[Recipe]:
+        """Fetch and adapt one provider response, coalescing identical in-flight calls."""
+        key = (provider, url, normalize_params(params))
+        return self._coalesced(
+            provider, key, lambda: self._call_provider(provider, url, params, timeout, adapter)
+        )
+
+    def _coalesced(
+        self, provider: str, key: Hashable, fetch: Callable[[], List[Recipe]]
+    ) -> List[Recipe]:
+        recipes, shared = shared_call(self._inflight, key, fetch)
+        self.metrics.inc("singleflight_total", provider=provider, role="follower" if shared else "leader")
+        if shared:
+            return list(recipes)
+        self.metrics.inc("provider_requests_total", provider=provider)
+        return self._remember(recipes)
+
+    def _call_provider(
+        self,
+        provider: str,
+        url: str,
+        params: Dict,
+        timeout: float,
+        adapter: RecipeAdapter,
+    ) -> List[Recipe]:
+        data = self._get_json(provider, url, params, timeout)
+        with self.metrics.timer("stage_seconds", stage="adapt", provider=provider):
+            return adapter.adapt(data)
+
+    def _get_json(self, provider: str, url: str, params: Dict, timeout: float) -> Dict:
+        response = self._get_response(provider, url, params, timeout)
+        response.raise_for_status()
+        with self.metrics.timer("stage_seconds", stage="decode", provider=provider):
+            return response.json()
+
+    def _get_response(
+        self, provider: str, url: str, params: Dict, timeout: float
+    ) -> requests.Response:
+        """GET through the provider's circuit breaker, retry budget and optional hedge."""
+        check_cancelled()
+        breaker = self._breakers.get(provider)
+        if breaker is not None and not breaker.allow():
+            if not self._is_cached(url, params):
+                raise CircuitOpenError(f"{provider} circuit is open")
+            breaker = None  # answered from cache; says nothing about the upstream
+
+        started = time.perf_counter()
         try:
-            response = self._session.get(
-                self._settings.SPOONACULAR_URL,
-                params=params,
-                timeout=self._settings.HTTP_TIMEOUT,
-            )
-            response.raise_for_status()
-            return self._spoonacular_adapter.adapt(response.json())
-        except Exception as exc:  
-            print(f"Spoonacular request failed: {exc}")
+            with self.metrics.timer("stage_seconds", stage="http", provider=provider):
+                response = self._send(provider, url, params, timeout)
+        except SearchCancelled:
+            if breaker is not None:
+                breaker.release()
+            raise
+        except Exception:
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+        elapsed = time.perf_counter() - started
+
+        from_cache = getattr(response, "from_cache", False)
+        if breaker is not None:
+            if from_cache:
+                breaker.release()
+            elif response.status_code >= 500 or response.status_code == 429:
+                breaker.record_failure()
+            else:
+                breaker.record_success(elapsed)
+        if not from_cache:
+            self._latency.setdefault(provider, LatencyWindow()).record(elapsed)
+        self._record_transport(provider, response)
+        return response
+
+    def _send(self, provider: str, url: str, params: Dict, timeout: float) -> requests.Response:
+        budget = self._settings.HTTP_RETRY_BUDGET
+        if budget is None:
+            # Retries beyond what the search waits for are wasted; one full attempt always fits.
+            budget = max(timeout, self._settings.SEARCH_DEADLINE)
+        # An explicit budget bounds the whole call, so no single attempt may outlast it.
+        attempt_timeout = min(timeout, budget)
+
+        def get() -> requests.Response:
+            with latency_budget(budget):
+                return self._session.get(url, params=params, timeout=attempt_timeout)
+
+        delay = self._hedge_delay(provider)
+        if delay is None:
+            return get()
+        response, hedge_won = hedged(propagate(get), delay, self._hedge_pool)
+        self.metrics.inc("hedged_requests_total", provider=provider, winner="hedge" if hedge_won else "primary")
+        return response
+
+    def _hedge_delay(self, provider: str) -> float | None:
+        if self._hedge_pool is None or provider not in self._hedged_providers:
+            return None
+        window = self._latency.get(provider)
+        delay = window.percentile(self._settings.HEDGE_PERCENTILE) if window is not None else None
+        return None if delay is None else max(delay, self._settings.HEDGE_MIN_DELAY)
+
+    def _on_circuit_change(self, provider: str, state: str) -> None:
+        self.metrics.inc("circuit_transitions_total", provider=provider, state=state)
+        print(f"{provider} circuit {state.replace('_', '-')}")
+
+    def _get_spoonacular(self, params: Dict) -> requests.Response:
+        return self._get_response(
+            "Spoonacular",
+            self._settings.SPOONACULAR_URL,
+            params,
+            self._provider_timeout(self._settings.SPOONACULAR_TIMEOUT),
+        )
+
+    def _is_cached(self, url: str, params: Dict) -> bool:
+        cache = get_response_cache(self._session)
+        if cache is None:
+            return False
+        prepared = requests.Request("GET", url, params=params).prepare()
+        return cache.contains(cache_key(prepared.url or ""))
+
+    def _get_mealdb_json(self, url: str, params: Dict) -> Dict:
+        return self._get_json(
+            "MealDB", url, params, self._provider_timeout(self._settings.MEALDB_TIMEOUT)
+        )
+
+    def _record_transport(self, provider: str, response: requests.Response) -> None:
+        if getattr(response, "from_cache", False):
+            self.metrics.inc("http_cache_total", provider=provider, result="hit")
+            return
+        self.metrics.inc("http_cache_total", provider=provider, result="miss")
+        retries = getattr(response.raw, "retries", None)
+        history = getattr(retries, "history", None) or ()
+        if history:
+            self.metrics.inc("http_retries_total", len(history), provider=provider)
+
+    def _fetch_corpus(self, query_builder: RecipeQueryBuilder) -> List[Recipe]:
+        if self._corpus is None:
             return []
+        if not self._corpus.ready:
+            # Loading in the background; live providers answer meanwhile.
+            raise ProviderDegraded("Local corpus is still loading")
+        with self.metrics.timer("stage_seconds", stage="corpus_search", provider="Local"):
+            return self._corpus.search(query_builder, self._settings.CORPUS_MAX_CANDIDATES)
+
+    def _remember(self, recipes: List[Recipe]) -> List[Recipe]:
+        if self._indexer is not None and recipes:
+            self._indexer.submit(self._corpus.add_many, recipes)
+        return recipes
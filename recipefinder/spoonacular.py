@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Mapping, Optional
+
+import requests
+
+from .adapters import RecipeAdapter
+from .cancellation import SearchCancelled, cancellable_sleep, check_cancelled
+from .metrics import MetricsRegistry
+from .models import Recipe
+from .query_builder import RecipeQueryBuilder
+from .resilience import ProviderDegraded
+
+# Spoonacular's documented maximum for `number`.
+MAX_PAGE_SIZE = 100
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`.
+
+    `acquire` reserves its tokens first and then sleeps off the debt. Callers
+    are served in arrival order and throughput stays at exactly `rate`. A
+    cancelled search stops waiting at once (SearchCancelled) and hands its
+    tokens back.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = cancellable_sleep,
+    ) -> None:
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        return self.acquire(tokens, timeout=0)
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Take `tokens`, waiting at most `timeout` seconds (None: as long as needed)."""
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            self._refill()
+            wait = max(0.0, (tokens - self._tokens) / self.rate)
+            if timeout is not None and wait > timeout:
+                return False
+            self._tokens -= tokens
+        if wait:
+            try:
+                self._sleep(wait)
+            except SearchCancelled:
+                with self._lock:
+                    self._tokens = min(self.capacity, self._tokens + tokens)
+                raise
+        return True
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back for `seconds` (e.g. after a 429 with Retry-After)."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+@dataclass
+class QuotaState:
+    used: Optional[float] = None  # points used today (X-API-Quota-Used)
+    left: Optional[float] = None  # points left today (X-API-Quota-Left)
+    last_request: Optional[float] = None  # cost of the last call (X-API-Quota-Request)
+    day: str = ""  # UTC date the numbers belong to; quotas reset at midnight UTC
+
+
+def estimate_points(number: int, with_information: bool = True) -> float:
+    """complexSearch cost: 1 point, 0.01 per result and 0.025 more per result with recipe info."""
+    return 1 + number * (0.01 + (0.025 if with_information else 0))
+
+
+class QuotaTracker:
+    """Daily point budget learned from Spoonacular's quota response headers."""
+
+    def __init__(self, reserve: float = 0.0, today: Callable[[], str] | None = None) -> None:
+        self.reserve = reserve
+        self._today = today or (lambda: datetime.now(timezone.utc).date().isoformat())
+        self._lock = threading.Lock()
+        self._state = QuotaState()
+
+    def state(self) -> QuotaState:
+        with self._lock:
+            self._roll_day()
+            return QuotaState(**vars(self._state))
+
+    def update(self, headers: Mapping[str, str]) -> Optional[float]:
+        """Record quota headers; returns the points the request cost, if reported."""
+        used = _header_float(headers, "X-API-Quota-Used")
+        left = _header_float(headers, "X-API-Quota-Left")
+        cost = _header_float(headers, "X-API-Quota-Request")
+        with self._lock:
+            self._roll_day()
+            if used is not None:
+                self._state.used = used
+            if left is not None:
+                self._state.left = left
+            if cost is not None:
+                self._state.last_request = cost
+        return cost
+
+    def mark_exhausted(self) -> None:
+        with self._lock:
+            self._roll_day()
+            self._state.left = 0.0
+
+    def allows(self, points: float) -> bool:
+        with self._lock:
+            self._roll_day()
+            left = self._state.left
+            return left is None or left - points >= self.reserve
+
+    def _roll_day(self) -> None:
+        today = self._today()
+        if self._state.day != today:
+            self._state = QuotaState(day=today)
+
+
+class SpoonacularClient:
+    """Quota-aware complexSearch calls with rate limiting and offset paging.
+
+    Why: One unpaced call per search hits Spoonacular's per-second limit under
+    load (429s, wasted retries) and knows nothing of the daily point budget.
+    Where: RecipeService._fetch_spoonacular and RecipeService.iter_spoonacular_pages.
+    Problem solved: Every network call takes a token from a shared bucket and
+    is checked against the remaining daily points first; responses already in
+    the HTTP cache skip both checks. When the budget is gone, or Spoonacular
+    answers 402/429, `search` raises ProviderDegraded carrying the pages it
+    already has, and the search carries on with the other providers.
+    """
+
+    def __init__(
+        self,
+        get: Callable[[Dict], requests.Response],
+        adapter: RecipeAdapter,
+        limiter: TokenBucket,
+        quota: QuotaTracker,
+        is_cached: Callable[[Dict], bool] = lambda params: False,
+        page_size: int = MAX_PAGE_SIZE,
+        rate_wait: float = 2.0,
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        self._get = get
+        self._adapter = adapter
+        self.limiter = limiter
+        self.quota = quota
+        self._is_cached = is_cached
+        self._page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        self._rate_wait = rate_wait
+        self._metrics = metrics or MetricsRegistry()
+
+    @property
+    def max_concurrency(self) -> Optional[int]:
+        """Callers that can wait for a token at once within `rate_wait` (None: no rate limit)."""
+        if self.limiter.rate <= 0:
+            return None
+        return max(1, int(self.limiter.rate * self._rate_wait))
+
+    def search(self, builder: RecipeQueryBuilder, api_key: str) -> List[Recipe]:
+        """All pages up to the query's limit; raises ProviderDegraded when cut short."""
+        recipes: List[Recipe] = []
+        try:
+            for page in self.iter_pages(builder, api_key, builder.limit(), strict=True):
+                recipes.extend(page)
+        except ProviderDegraded as exc:
+            raise ProviderDegraded(str(exc), recipes) from None
+        return recipes
+
+    def iter_pages(
+        self, builder: RecipeQueryBuilder, api_key: str, max_results: int, strict: bool = False
+    ) -> Iterator[List[Recipe]]:
+        """Yield adapted pages until `max_results`, the end of the results, or the budget.
+
+        Running out of budget ends the iteration quietly unless `strict`, in
+        which case ProviderDegraded is raised.
+        """
+        offset = 0
+        while offset < max_results:
+            number = min(self._page_size, max_results - offset)
+            params = builder.build_for_spoonacular(api_key, offset=offset, number=number)
+            try:
+                data = self._request(params, number)
+            except ProviderDegraded:
+                if strict:
+                    raise
+                return
+            results = data.get("results") or []
+            with self._metrics.timer("stage_seconds", stage="adapt", provider="Spoonacular"):
+                page = self._adapter.adapt(data)
+            yield page
+            offset += len(results)
+            total = data.get("totalResults")
+            if len(results) < number or (total is not None and offset >= int(total)):
+                return
+
+    def _request(self, params: Dict, number: int) -> Dict:
+        check_cancelled()  # before spending a token or quota points
+        if not self._is_cached(params):
+            reason = self._admit(number)
+            if reason:
+                raise self._degraded(reason)
+
+        response = self._get(params)
+        if not getattr(response, "from_cache", False):
+            cost = self.quota.update(response.headers)
+            if cost is not None:
+                self._metrics.inc("spoonacular_points_total", cost)
+        if response.status_code == 402:
+            self.quota.mark_exhausted()
+            raise self._degraded("daily quota exhausted")
+        if response.status_code == 429:
+            self.limiter.pause(_retry_after(response.headers, 1.0 / max(self.limiter.rate, 1e-3)))
+            raise self._degraded("rate limited")
+        response.raise_for_status()
+        with self._metrics.timer("stage_seconds", stage="decode", provider="Spoonacular"):
+            return response.json()
+
+    def _admit(self, number: int) -> str:
+        if not self.quota.allows(estimate_points(number)):
+            return "daily quota exhausted"
+        if not self.limiter.acquire(timeout=self._rate_wait):
+            return "rate limit"
+        return ""
+
+    def _degraded(self, reason: str) -> ProviderDegraded:
+        self._metrics.inc("spoonacular_degraded_total", reason=reason)
+        return ProviderDegraded(f"Spoonacular skipped ({reason})")
+
+
+def _header_float(headers: Mapping[str, str], name: str) -> Optional[float]:
+    value = headers.get(name)
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _retry_after(headers: Mapping[str, str], default: float) -> float:
+    value = _header_float(headers, "Retry-After")
+    return value if value is not None and value >= 0 else default
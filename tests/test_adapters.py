@@ -26,7 +26,7 @@ def test_mealdb_adapter_builds_measure_and_ingredient_lines() -> None:
     assert recipe.source == "MealDB"
     assert recipe.instructions == "Cook it."
     assert recipe.image_url == "https://example/img.jpg"
-    assert recipe.ingredients == ["1 lb Chicken", "2 cups Rice"]
+    assert recipe.ingredients == ("1 lb Chicken", "2 cups Rice")
 
 
 def test_spoonacular_adapter_strips_html_and_decodes_entities() -> None:
@@ -52,5 +52,6 @@ def test_spoonacular_adapter_strips_html_and_decodes_entities() -> None:
     assert recipe.title == "Spicy Tacos"
     assert recipe.source == "Spoonacular"
     assert recipe.image_url == "https://example/taco.jpg"
-    assert recipe.ingredients == ["2 tortillas", "beef"]
+    assert recipe.ingredients == ("2 tortillas", "beef")
     assert recipe.instructions == "Spicy & tastyDone."
+
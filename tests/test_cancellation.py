@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from recipefinder.cancellation import (
+    CancellationToken,
+    SearchCancelled,
+    cancel_scope,
+    check_cancelled,
+    propagate,
+    shared_call,
+)
+from recipefinder.models import Recipe
+from recipefinder.query_builder import RecipeQueryBuilder
+from recipefinder.service import RecipeService
+from recipefinder.singleflight import SingleFlight
+from utils.settings import Settings
+
+
+def test_token_runs_callbacks_once_and_scopes_per_thread() -> None:
+    token = CancellationToken()
+    calls = []
+    token.on_cancel(lambda: calls.append("before"))
+    with cancel_scope(token):
+        check_cancelled()
+        token.cancel()
+        token.cancel()
+        with pytest.raises(SearchCancelled):
+            check_cancelled()
+        # Other threads only see the token when it is propagated.
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            assert pool.submit(check_cancelled).result() is None
+            with pytest.raises(SearchCancelled):
+                pool.submit(propagate(check_cancelled)).result()
+    check_cancelled()
+    token.on_cancel(lambda: calls.append("after"))
+    assert calls == ["before", "after"]
+
+
+def test_shared_call_retries_when_only_the_leader_was_cancelled() -> None:
+    flight: SingleFlight[str] = SingleFlight()
+    leader_token = CancellationToken()
+    started = threading.Event()
+    cancelled = threading.Event()
+    leader_token.on_cancel(cancelled.set)
+
+    def leader_fetch() -> str:
+        started.set()
+        cancelled.wait(1.0)
+        check_cancelled()
+        return "leader"
+
+    def lead() -> str:
+        with cancel_scope(leader_token):
+            return shared_call(flight, "k", leader_fetch)[0]
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(lead)
+        started.wait(1.0)
+        follower = pool.submit(shared_call, flight, "k", lambda: "follower")
+        time.sleep(0.05)
+        leader_token.cancel()
+        with pytest.raises(SearchCancelled):
+            leader.result()
+        assert follower.result()[0] == "follower"
+
+
+def test_cancel_ends_a_search_without_waiting_for_slow_providers() -> None:
+    service = RecipeService(settings=Settings(HTTP_CACHE_PATH="", CORPUS_PATH="", SEARCH_DEADLINE=5.0))
+    release = threading.Event()
+
+    def hung(_builder: RecipeQueryBuilder):
+        release.wait(2.0)
+        return [Recipe(title="Late", source="A")]
+
+    service._providers = [("A", hung)]
+    token = CancellationToken()
+    threading.Timer(0.05, token.cancel).start()
+    started = time.perf_counter()
+    try:
+        with pytest.raises(SearchCancelled):
+            service.fetch_recipes(RecipeQueryBuilder(), cancel=token)
+        assert time.perf_counter() - started < 1.0
+        assert service.metrics.snapshot()["counters"].get("searches_cancelled_total")
+    finally:
+        release.set()
+        service.close()
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from recipefinder.candidates import CandidateCache, candidate_key
+from recipefinder.models import Recipe
+from recipefinder.query_builder import RecipeQueryBuilder
+
+
+def _builder(keywords: str = "", ingredients=(), limit: int = 10) -> RecipeQueryBuilder:
+    return RecipeQueryBuilder().with_keywords(keywords).with_ingredients(list(ingredients)).with_limit(limit)
+
+
+def test_key_ignores_case_spacing_and_ingredient_order() -> None:
+    assert candidate_key(_builder(" Chicken  Curry", ["Garlic", "onion"])) == candidate_key(
+        _builder("chicken curry", ["onion", "garlic ", "garlic"], limit=3)
+    )
+    assert candidate_key(_builder("chicken")) != candidate_key(_builder("", ["chicken"]))
+
+
+def test_cache_honours_limit_ttl_and_size() -> None:
+    now = [0.0]
+    cache = CandidateCache(max_entries=2, ttl=60, clock=lambda: now[0])
+    recipes = [Recipe(title="Stew", source="A")]
+    cache.put(_builder("stew", limit=20), recipes)
+
+    assert cache.get(_builder("STEW", limit=5)) == recipes
+    assert cache.get(_builder("stew", limit=21)) is None  # would need more candidates
+
+    cache.put(_builder("soup"), [])
+    cache.get(_builder("stew"))  # most recently used survives
+    cache.put(_builder("pie"), [])
+    assert cache.get(_builder("soup")) is None and cache.get(_builder("stew")) is not None
+
+    now[0] = 61
+    assert cache.get(_builder("stew")) is None and len(cache) == 1
+    assert cache.stats()["hits"] == 3
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from recipefinder.corpus import RecipeCorpus
+from recipefinder.models import Recipe
+from recipefinder.query_builder import RecipeQueryBuilder
+from recipefinder.resilience import ProviderDegraded
+from recipefinder.service import RecipeService
+from utils.settings import Settings
+
+
+def _corpus(path: str | None = None) -> RecipeCorpus:
+    corpus = RecipeCorpus(path)
+    corpus.add_many(
+        [
+            Recipe(title="Chicken Curry", source="MealDB", ingredients=["1 lb chicken breast", "2 tbsp curry paste"], instructions="Simmer gently."),
+            Recipe(title="Rice Pudding", source="MealDB", ingredients=["1 cup rice", "2 cups milk"], instructions="Bake slowly."),
+            Recipe(title="Chicken Fried Rice", source="Spoonacular", ingredients=["chicken thighs", "rice", "egg"], instructions="Fry quickly."),
+        ]
+    )
+    return corpus
+
+
+def test_search_ranks_recipes_matching_every_term_first() -> None:
+    builder = RecipeQueryBuilder().with_ingredients(["chicken", "rice"])
+    titles = [recipe.title for recipe in _corpus().search(builder)]
+    assert titles[0] == "Chicken Fried Rice"
+    assert set(titles) == {"Chicken Fried Rice", "Chicken Curry", "Rice Pudding"}
+
+
+def test_multi_word_ingredient_requires_all_tokens() -> None:
+    builder = RecipeQueryBuilder().with_ingredients(["chicken breast"])
+    assert [recipe.title for recipe in _corpus().search(builder)] == ["Chicken Curry"]
+
+
+def test_ingredient_terms_are_normalized_like_the_index() -> None:
+    builder = RecipeQueryBuilder().with_ingredients(["Eggs", "chicken thigh"])
+    assert [recipe.title for recipe in _corpus().search(builder)][0] == "Chicken Fried Rice"
+
+
+def test_keywords_match_title_and_instruction_terms() -> None:
+    builder = RecipeQueryBuilder().with_keywords("bake")
+    assert [recipe.title for recipe in _corpus().search(builder)] == ["Rice Pudding"]
+    assert _corpus().search(RecipeQueryBuilder()) == []
+
+
+def test_duplicates_are_ignored_and_corpus_persists(tmp_path) -> None:
+    path = str(tmp_path / "corpus.jsonl")
+    corpus = _corpus(path)
+    assert corpus.add(Recipe(title="chicken curry", source="MealDB")) is False
+    assert len(corpus) == 3
+
+    reloaded = RecipeCorpus(path)
+    assert len(reloaded) == 3
+    builder = RecipeQueryBuilder().with_ingredients(["egg"])
+    assert [recipe.title for recipe in reloaded.search(builder)] == ["Chicken Fried Rice"]
+
+
+def test_corpus_keeps_newest_recipes_and_compacts_the_file(tmp_path) -> None:
+    path = tmp_path / "corpus.jsonl"
+    corpus = RecipeCorpus(str(path), max_recipes=4)
+    for i in range(5):
+        corpus.add(Recipe(title=f"Soup {i}", source="MealDB", ingredients=["leek"]))
+    assert len(corpus) == 5  # within the 25% slack: appended, not compacted yet
+
+    corpus.add(Recipe(title="Soup 5", source="MealDB", ingredients=["leek"]))
+    assert len(corpus) == 4
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 4
+    builder = RecipeQueryBuilder().with_ingredients(["leek"])
+    assert {recipe.title for recipe in corpus.search(builder)} == {"Soup 2", "Soup 3", "Soup 4", "Soup 5"}
+    assert corpus.add(Recipe(title="Soup 0", source="MealDB")) is True  # evicted, so new again
+
+    reloaded = RecipeCorpus(str(path), max_recipes=2)
+    assert len(reloaded) == 2
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_corpus_loads_in_the_background_and_service_skips_it_until_ready(tmp_path) -> None:
+    path = tmp_path / "corpus.jsonl"
+    _corpus(str(path))
+    service = RecipeService(
+        settings=Settings(HTTP_CACHE_PATH="", CORPUS_PATH=str(path), MEALDB_URL="", SPOONACULAR_API_KEY="")
+    )
+    try:
+        service._corpus = RecipeCorpus(str(path))
+        with pytest.raises(ProviderDegraded):  # never cached as a complete answer
+            service._fetch_corpus(RecipeQueryBuilder().with_ingredients(["egg"]))
+        service._indexer.submit(service._corpus.load).result()
+        assert service._corpus.ready
+        builder = RecipeQueryBuilder().with_ingredients(["egg"])
+        assert [recipe.title for recipe in service._fetch_corpus(builder)] == ["Chicken Fried Rice"]
+    finally:
+        service.close()
+
+
+def test_relative_corpus_path_is_resolved_against_the_project_root() -> None:
+    path = Path(Settings(CORPUS_PATH=".cache/corpus.jsonl").CORPUS_PATH)
+    assert path.is_absolute()
+    assert path == Path(__file__).resolve().parent.parent / ".cache" / "corpus.jsonl"
+    assert Settings(CORPUS_PATH="").CORPUS_PATH == ""
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import List
+
+from recipefinder.dedup import DuplicateFinder
+from recipefinder.models import Recipe
+
+
+def _recipe(title: str, source: str, *ingredients: str) -> Recipe:
+    return Recipe(title=title, source=source, ingredients=list(ingredients))
+
+
+def merge_duplicates(batches: List[List[Recipe]]) -> List[Recipe]:
+    finder = DuplicateFinder()
+    for batch in batches:
+        finder.add_many(batch)
+    return finder.kept()
+
+
+def test_same_provider_near_duplicates_are_distinct_recipes() -> None:
+    merged = merge_duplicates(
+        [[_recipe("Garlic Soup #1", "MealDB", "garlic"), _recipe("Garlic Soup #2", "MealDB", "garlic")]]
+    )
+    assert len(merged) == 2
+
+
+def test_title_alone_decides_without_ingredients() -> None:
+    merged = merge_duplicates(
+        [[_recipe("Beef Stroganoff", "MealDB")], [_recipe("beef stroganoff!", "Spoonacular", "beef")]]
+    )
+    assert [recipe.providers for recipe in merged] == [("MealDB", "Spoonacular")]
+
+
+def test_dissimilar_recipes_are_kept() -> None:
+    merged = merge_duplicates(
+        [
+            [_recipe("Lemon Tart", "MealDB", "lemon", "butter", "flour", "sugar")],
+            [_recipe("Lemon Chicken", "Spoonacular", "lemon", "chicken", "garlic")],
+        ]
+    )
+    assert len(merged) == 2
+
+
+def test_current_returns_copy_with_grown_providers() -> None:
+    finder = DuplicateFinder()
+    first = _recipe("Pad Thai", "MealDB", "rice noodles", "peanuts", "egg")
+    assert finder.add(first) is True
+    assert finder.add(_recipe("Pad Thai", "Local", "rice noodles", "peanuts", "eggs")) is False
+    assert finder.add(_recipe("Pad thai", "Spoonacular", "rice noodle", "peanut", "egg")) is False
+    assert finder.current(first).providers == ("MealDB", "Local", "Spoonacular")
+    assert finder.kept() == [finder.current(first)]
+    assert finder.merged == 2
+
+
+def test_exact_only_mode_skips_near_duplicates() -> None:
+    finder = DuplicateFinder(threshold=None)
+    finder.add_many([_recipe("Pad Thai", "MealDB"), _recipe("Pad Thai", "Spoonacular"), _recipe("pad thai ", "MealDB")])
+    assert [recipe.source for recipe in finder.kept()] == ["MealDB", "Spoonacular"]
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from recipefinder.http_cache import CachedResponse, CachingHTTPAdapter, ResponseCache, cache_key
+
+
+def _entry(body: bytes = b"{}", ttl: float = 60.0) -> CachedResponse:
+    return CachedResponse(200, {"Content-Type": "application/json"}, body, "u", time.time() + ttl)
+
+
+def test_cache_key_ignores_api_key_case_and_param_order() -> None:
+    first = cache_key("https://api.example/recipes?apiKey=one&query=Tacos&number=5")
+    second = cache_key("https://API.example/recipes?number=5&query=tacos%20&apiKey=two")
+    assert first == second
+    assert "apiKey" not in first
+
+
+def test_memory_layer_evicts_least_recently_used() -> None:
+    cache = ResponseCache(path=None, max_memory_entries=2)
+    cache.put("a", _entry())
+    cache.put("b", _entry())
+    assert cache.get("a") is not None  # "b" is now least recently used
+    cache.put("c", _entry())
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_disk_layer_survives_restart_and_honours_ttl(tmp_path) -> None:
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResponseCache(path=path)
+    cache.put("fresh", _entry(b"fresh"))
+    cache.put("stale", _entry(b"stale", ttl=-1))
+    cache.close()
+
+    reopened = ResponseCache(path=path)
+    hit = reopened.get("fresh")
+    assert hit is not None and hit.body == b"fresh"
+    assert reopened.get("stale") is None
+    assert reopened.stats()["disk_hits"] == 1
+
+
+def test_disk_layer_caps_size(tmp_path) -> None:
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite3"), max_memory_entries=1, max_disk_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, _entry())
+    assert cache.get("a") is None
+    assert cache.get("c") is not None
+
+
+def test_disk_layer_keeps_recently_hit_rows_across_restarts(tmp_path) -> None:
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResponseCache(path=path, max_memory_entries=1, max_disk_entries=3)
+    for key in ("a", "b", "c"):
+        cache.put(key, _entry())
+    cache.put("b", _entry(b"again"))  # replacing a row doesn't count against the cap
+    assert cache.stats()["evictions"] == 0
+    assert cache.get("a") is not None  # from disk; its hit time is written on close
+    cache.close()
+
+    reopened = ResponseCache(path=path, max_memory_entries=1, max_disk_entries=3)
+    reopened.put("d", _entry())
+    assert [reopened.get(key) is not None for key in ("a", "b", "c", "d")] == [True, True, False, True]
+    assert reopened.stats()["evictions"] == 1
+
+
+def test_disk_layer_trims_to_a_lowered_cap_on_open(tmp_path) -> None:
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResponseCache(path=path, max_memory_entries=1)
+    for key in ("a", "b", "c"):
+        cache.put(key, _entry())
+    cache.close()
+
+    reopened = ResponseCache(path=path, max_memory_entries=1, max_disk_entries=1)
+    assert [reopened.get(key) is not None for key in ("a", "b", "c")] == [False, False, True]
+
+
+def test_caching_adapter_serves_repeat_requests_locally(monkeypatch) -> None:
+    calls = []
+
+    def fake_send(self, request, **kwargs):
+        calls.append(request.url)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"meals": []}'
+        response.url = request.url
+        return response
+
+    monkeypatch.setattr(HTTPAdapter, "send", fake_send)
+    session = requests.Session()
+    session.mount(
+        "https://",
+        CachingHTTPAdapter(ResponseCache(), lambda url: 60.0 if "/api/" in url else None),
+    )
+
+    for _ in range(3):
+        assert session.get("https://x.test/api/search.php", params={"s": "Soup"}).json() == {"meals": []}
+    session.get("https://x.test/images/a.jpg")
+    session.get("https://x.test/images/a.jpg")
+
+    assert len(calls) == 3  # one search + two uncached image fetches
+
+
+def test_stored_responses_never_contain_the_api_key(monkeypatch, tmp_path) -> None:
+    def fake_send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"results": []}'
+        response.url = request.url
+        return response
+
+    monkeypatch.setattr(HTTPAdapter, "send", fake_send)
+    path = tmp_path / "cache.sqlite3"
+    cache = ResponseCache(path=str(path))
+    session = requests.Session()
+    session.mount("https://", CachingHTTPAdapter(cache, lambda url: 60.0))
+    session.get("https://x.test/recipes", params={"query": "soup", "apiKey": "s3cret"})
+    cache.close()
+
+    with sqlite3.connect(str(path)) as db:
+        rows = db.execute("SELECT key, url, headers, body FROM responses").fetchall()
+    assert len(rows) == 1
+    assert "s3cret" not in repr(rows)
+    assert rows[0][1] == "https://x.test/recipes?query=soup"
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from benchmarks.stub_server import StubProviderServer
+from recipefinder.dns_cache import DnsCache
+from recipefinder.http_session import create_http_session, pool_stats, prewarm
+from utils.settings import Settings
+
+
+def test_pool_sizes_come_from_settings() -> None:
+    for cache_enabled in (True, False):
+        session = create_http_session(
+            Settings(
+                HTTP_CACHE_ENABLED=cache_enabled,
+                HTTP_CACHE_PATH="",
+                HTTP_POOL_CONNECTIONS=3,
+                HTTP_POOL_MAXSIZE=7,
+                HTTP_POOL_BLOCK=True,
+            )
+        )
+        adapter = session.get_adapter("https://example.com/")
+        assert adapter._pool_connections == 3
+        assert adapter._pool_maxsize == 7 and adapter._pool_block is True
+        session.close()
+
+
+def test_prewarmed_connections_are_reused() -> None:
+    with StubProviderServer(latency=0.02, meals=2, results=2) as stub:
+        session = create_http_session(Settings(HTTP_CACHE_ENABLED=False))
+        assert prewarm(session, [stub.mealdb_url, stub.spoonacular_url], connections=2) == 2
+        assert prewarm(session, [stub.mealdb_url], connections=2) == 0  # already warm
+
+        for _ in range(3):
+            assert session.get(stub.mealdb_url, params={"s": "x"}, timeout=5).status_code == 200
+        stats = pool_stats(session)[stub.base_url]
+        session.close()
+
+    assert stats["connections_opened"] == 2 and stub.requests_served == 3  # HEADs aren't searches
+    assert stats["idle"] == 2 and stats["in_use"] == 0 and stats["maxsize"] == 32
+
+
+def test_prewarm_warms_each_adapter_on_a_shared_host() -> None:
+    with StubProviderServer(latency=0.02) as stub:
+        session = create_http_session(
+            Settings(HTTP_CACHE_ENABLED=False, MEALDB_URL=stub.mealdb_url, SPOONACULAR_URL=stub.spoonacular_url)
+        )
+        assert prewarm(session, [stub.mealdb_url, stub.spoonacular_url], connections=1) == 2
+        assert session.get(stub.spoonacular_url, timeout=5).status_code == 200
+        assert pool_stats(session)[stub.base_url]["connections_opened"] == 2
+        session.close()
+
+
+def test_pool_stats_reads_missing_urllib3_counters_as_zero() -> None:
+    adapter = HTTPAdapter()
+    # A pool from a urllib3 without the counters or the queue internals pool_stats reads.
+    adapter.poolmanager.pools[("http", "x.test", 80)] = SimpleNamespace(
+        scheme="http", host="x.test", port=80, pool=SimpleNamespace()
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    assert pool_stats(session) == {
+        "http://x.test:80": {
+            "maxsize": 0,
+            "in_use": 0,
+            "idle": 0,
+            "requests": 0,
+            "connections_opened": 0,
+            "requests_per_connection": 0.0,
+        }
+    }
+
+
+def test_prewarm_ignores_unreachable_hosts() -> None:
+    session = create_http_session(Settings(HTTP_CACHE_ENABLED=False))
+    assert prewarm(session, ["http://127.0.0.1:9/", "not a url"], connections=1, timeout=0.5) == 0
+    session.close()
+
+
+def test_dns_cache_reuses_answers_until_they_expire() -> None:
+    calls = []
+    release = threading.Event()
+
+    def resolve(host, port, *args):
+        calls.append(host)
+        release.wait(1.0)
+        return [(2, 1, 6, "", ("10.0.0.1", port))]
+
+    cache = DnsCache(ttl=0.2, resolve=resolve)
+    threads = [threading.Thread(target=cache.getaddrinfo, args=("api.example", 443)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert calls == ["api.example"]  # concurrent misses share one lookup
+
+    assert cache.getaddrinfo("api.example", 443)[0][4] == ("10.0.0.1", 443)
+    assert len(calls) == 1 and cache.stats()["hits"] == 1
+    time.sleep(0.25)
+    cache.getaddrinfo("api.example", 443)
+    assert len(calls) == 2
+
+
+def test_spoonacular_429s_are_left_to_the_client_while_other_hosts_retry_them() -> None:
+    with StubProviderServer(burst_every=10, burst_length=10, retry_after=0) as stub:
+        settings = Settings(
+            HTTP_CACHE_ENABLED=False,
+            HTTP_MAX_RETRIES=2,
+            HTTP_BACKOFF=0,
+            SPOONACULAR_URL=stub.spoonacular_url,
+        )
+        session = create_http_session(settings)
+        assert session.get(stub.spoonacular_url, params={"query": "x"}, timeout=5).status_code == 429
+        assert stub.statuses[429] == 1
+        assert session.get(stub.mealdb_url, params={"s": "x"}, timeout=5).status_code == 429
+        assert stub.statuses[429] == 1 + 3
+        assert pool_stats(session)[stub.base_url]["requests"] == 4
+        session.close()
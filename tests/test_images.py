@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import io
+import os
+import threading
+
+import pytest
+
+from ui.images import PIL_AVAILABLE, ImagePipeline
+
+pytestmark = pytest.mark.skipif(not PIL_AVAILABLE, reason="pillow not installed")
+
+
+class _FakeResponse:
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+class _FakeSession:
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+        self.calls = 0
+
+    def get(self, url: str, timeout: float) -> _FakeResponse:
+        self.calls += 1
+        return _FakeResponse(self.content)
+
+
+def _png(size=(800, 600)) -> bytes:
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGBA", size, (200, 10, 10, 255)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_thumbnails_are_resized_and_served_from_disk_cache(tmp_path) -> None:
+    session = _FakeSession(_png())
+    pipeline = ImagePipeline(root=None, session=session, timeout=1.0, cache_dir=str(tmp_path))
+    try:
+        first = pipeline._load("https://img.test/a.png")
+        assert max(first.size) == 240
+        assert first.mode == "RGB"
+
+        second = pipeline._load("https://img.test/a.png")
+        assert second.size == first.size
+        assert session.calls == 1
+        assert len(list(tmp_path.glob("*.jpg"))) == 1
+    finally:
+        pipeline.shutdown()
+
+
+def test_disk_cache_evicts_the_least_recently_used_thumbnails(tmp_path) -> None:
+    session = _FakeSession(_png())
+    pipeline = ImagePipeline(root=None, session=session, timeout=1.0, cache_dir=str(tmp_path), disk_entries=2)
+    try:
+        pipeline._load("https://img.test/a.png")
+        pipeline._load("https://img.test/b.png")
+        os.utime(pipeline._cache_path("https://img.test/a.png"), (1, 1))
+        os.utime(pipeline._cache_path("https://img.test/b.png"), (2, 2))
+        pipeline._load("https://img.test/a.png")  # disk hit: a is now the most recent
+        pipeline._load("https://img.test/c.png")
+
+        assert session.calls == 3
+        assert sorted(tmp_path.glob("*.jpg")) == sorted(
+            pipeline._cache_path(f"https://img.test/{name}.png") for name in ("a", "c")
+        )
+    finally:
+        pipeline.shutdown()
+
+
+class _GatedSession:
+    """Blocks the first download until `release` is set; records what was fetched."""
+
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+        self.fetched: list = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def get(self, url: str, timeout: float) -> _FakeResponse:
+        self.fetched.append(url)
+        self.started.set()
+        assert self.release.wait(5.0)
+        return _FakeResponse(self.content)
+
+
+class _FakeRoot:
+    def __init__(self) -> None:
+        self.calls: list = []
+
+    def after(self, delay: int, callback, *args) -> None:
+        self.calls.append((callback, args))
+
+
+def _drain(pipeline: ImagePipeline, session: _GatedSession) -> None:
+    session.release.set()
+    pipeline._background.shutdown(wait=True)
+
+
+def test_new_prefetch_batch_cancels_queued_downloads_of_the_previous_one() -> None:
+    session = _GatedSession(_png())
+    pipeline = ImagePipeline(root=_FakeRoot(), session=session, timeout=1.0)
+    try:
+        pipeline.prefetch(["a", "b", "c"])
+        assert session.started.wait(5.0)  # "a" is downloading, "b" and "c" are queued
+        queued = [pipeline._prefetches["b"], pipeline._prefetches["c"]]
+
+        pipeline.prefetch(["d"])
+        assert all(future.cancelled() for future in queued)
+        assert "b" not in pipeline._inflight
+        _drain(pipeline, session)
+        assert session.fetched == ["a", "d"]
+    finally:
+        pipeline.shutdown()
+
+
+def test_latest_prefetch_batch_wins_and_shared_urls_load_once() -> None:
+    session = _GatedSession(_png())
+    pipeline = ImagePipeline(root=_FakeRoot(), session=session, timeout=1.0)
+    try:
+        pipeline.prefetch(["x"])
+        assert session.started.wait(5.0)
+        pipeline.prefetch(["a", "b", None, "b"])
+        pipeline.prefetch(["c", "b"])
+        _drain(pipeline, session)
+        assert session.fetched == ["x", "c", "b"]
+    finally:
+        pipeline.shutdown()
+
+
+def test_prefetch_superseded_after_it_was_dequeued_is_skipped() -> None:
+    session = _GatedSession(_png())
+    session.release.set()
+    pipeline = ImagePipeline(root=_FakeRoot(), session=session, timeout=1.0)
+    try:
+        pipeline._prefetch_generation = 2
+        assert pipeline._load_prefetch("https://img.test/a.png", 1) is None
+        assert session.fetched == []
+        assert pipeline._load_prefetch("https://img.test/a.png", 2) is not None
+    finally:
+        pipeline.shutdown()
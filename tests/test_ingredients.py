@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from recipefinder.ingredients import normalize_ingredient, singularize
+
+
+def test_normalize_strips_quantities_units_and_preparation() -> None:
+    assert normalize_ingredient("2 cups chopped Tomatoes") == ("tomato",)
+    assert normalize_ingredient("1/2 tsp salt") == ("salt",)
+    assert normalize_ingredient("200g Courgettes") == ("zucchini",)
+    assert normalize_ingredient("1 lb chicken breast") == ("chicken", "breast")
+
+
+def test_synonyms_fold_to_one_spelling() -> None:
+    assert normalize_ingredient("3 Green Onions") == normalize_ingredient("scallion") == ("spring", "onion")
+    assert normalize_ingredient("Confectioners' sugar") == ("powdered", "sugar")
+
+
+def test_singularize_is_stable_on_singular_words() -> None:
+    for plural, singular in [
+        ("tomatoes", "tomato"),
+        ("cherries", "cherry"),
+        ("peaches", "peach"),
+        ("leaves", "leaf"),
+        ("cheeses", "cheese"),
+        ("olives", "olive"),
+    ]:
+        assert singularize(plural) == singular
+        assert singularize(singular) == singular
+    assert singularize("asparagus") == "asparagus"
+    assert singularize("molasses") == "molasses"
+
+
+def test_words_that_only_look_plural_are_kept() -> None:
+    for word in ("brussels", "tapas", "gras", "madras", "schnapps"):
+        assert singularize(word) == word
+    assert normalize_ingredient("500g Brussels sprouts") == ("brussels", "sprout")
+    assert normalize_ingredient("2 tbsp madras curry powder") == ("madras", "curry", "powder")
+
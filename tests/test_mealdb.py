@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import threading
+from typing import Dict, List
+
+import pytest
+
+from recipefinder.adapters import MealDBAdapter
+from recipefinder.cancellation import CancellationToken, SearchCancelled, cancel_scope
+from recipefinder.mealdb import (
+    CachingMealDBAdapter,
+    MealCache,
+    MealDBIngredientSearch,
+    mealdb_endpoint,
+    rank_meal_ids,
+)
+from recipefinder.query_builder import RecipeQueryBuilder
+from recipefinder.resilience import ProviderDegraded
+
+MEALS = {
+    "1": {"idMeal": "1", "strMeal": "Garlic Chicken", "strIngredient1": "Chicken", "strIngredient2": "Garlic"},
+    "2": {"idMeal": "2", "strMeal": "Roast Chicken", "strIngredient1": "Chicken"},
+    "3": {"idMeal": "3", "strMeal": "Garlic Bread", "strIngredient1": "Garlic"},
+}
+
+
+class FakeMealDB:
+    def __init__(self) -> None:
+        self.calls: List[Dict[str, str]] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, url: str, params: Dict[str, str]) -> Dict:
+        with self._lock:
+            self.calls.append({"endpoint": url, **params})
+        if url == "filter":
+            ids = {"chicken": ["1", "2"], "garlic": ["3", "1"]}.get(params["i"], [])
+            return {"meals": [{"idMeal": meal_id} for meal_id in ids] or None}
+        return {"meals": [MEALS[params["i"]]]}
+
+
+def _search(fetch: FakeMealDB, cache: MealCache) -> MealDBIngredientSearch:
+    return MealDBIngredientSearch(fetch, "filter", "lookup", MealDBAdapter(), cache, concurrency=4)
+
+
+def test_ids_matching_every_ingredient_rank_first() -> None:
+    assert rank_meal_ids([["1", "2"], ["3", "1"]]) == ["1", "2", "3"]
+
+
+def test_filters_per_ingredient_then_lookups_only_uncached_meals() -> None:
+    fetch, cache = FakeMealDB(), MealCache()
+    builder = RecipeQueryBuilder().with_ingredients(["Chicken", "garlic", "chicken "])
+    assert builder.build_for_mealdb_filters() == [{"i": "chicken"}, {"i": "garlic"}]
+
+    search = _search(fetch, cache)
+    recipes = search.search(builder.build_for_mealdb_filters(), limit=2)
+    assert [recipe.title for recipe in recipes] == ["Garlic Chicken", "Roast Chicken"]
+    assert sorted(call["i"] for call in fetch.calls if call["endpoint"] == "lookup") == ["1", "2"]
+
+    fetch.calls.clear()
+    recipes = search.search(builder.build_for_mealdb_filters(), limit=3)
+    assert [recipe.title for recipe in recipes] == ["Garlic Chicken", "Roast Chicken", "Garlic Bread"]
+    assert [call["i"] for call in fetch.calls if call["endpoint"] == "lookup"] == ["3"]
+    search.close()
+
+
+def test_keyword_search_results_fill_the_meal_cache() -> None:
+    cache = MealCache()
+    CachingMealDBAdapter(MealDBAdapter(), cache).adapt({"meals": [MEALS["3"]]})
+    fetch = FakeMealDB()
+    search = _search(fetch, cache)
+    assert [recipe.title for recipe in search.search([{"i": "garlic"}], limit=1)] == ["Garlic Bread"]
+    assert all(call["endpoint"] == "filter" for call in fetch.calls)
+    search.close()
+
+
+def test_endpoints_derive_from_the_search_url() -> None:
+    url = "https://www.themealdb.com/api/json/v1/1/search.php"
+    assert mealdb_endpoint(url, "lookup.php") == "https://www.themealdb.com/api/json/v1/1/lookup.php"
+
+
+def test_failed_lookups_surface_as_a_degraded_partial_result(capsys) -> None:
+    fetch, cache = FakeMealDB(), MealCache()
+
+    def flaky(url: str, params: Dict[str, str]) -> Dict:
+        if url == "lookup" and params["i"] == "2":
+            raise ConnectionError("reset")
+        return fetch(url, params)
+
+    search = MealDBIngredientSearch(flaky, "filter", "lookup", MealDBAdapter(), cache, concurrency=4)
+    with pytest.raises(ProviderDegraded, match="1 of 3") as raised:
+        search.search([{"i": "chicken"}, {"i": "garlic"}], limit=3)
+    assert [recipe.title for recipe in raised.value.recipes] == ["Garlic Chicken", "Garlic Bread"]
+    assert "lookup failed" not in capsys.readouterr().out
+    search.close()
+
+
+def test_cancelled_lookup_is_raised_not_counted_as_a_failure() -> None:
+    token = CancellationToken()
+
+    def cancelling(url: str, params: Dict[str, str]) -> Dict:
+        token.cancel()
+        raise SearchCancelled()
+
+    search = MealDBIngredientSearch(cancelling, "filter", "lookup", MealDBAdapter(), MealCache(), concurrency=4)
+    with cancel_scope(token), pytest.raises(SearchCancelled):
+        search._lookup_safely("1")
+    search.close()
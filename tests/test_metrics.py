@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import json
+
+from recipefinder.metrics import MetricsRegistry
+from recipefinder.models import Recipe
+from recipefinder.query_builder import RecipeQueryBuilder
+from recipefinder.service import RecipeService
+from utils.settings import Settings
+
+
+def test_counters_and_histograms_export_as_prometheus_and_json() -> None:
+    metrics = MetricsRegistry()
+    metrics.inc("provider_errors_total", provider="MealDB", error="Timeout")
+    metrics.inc("provider_errors_total", 2, provider="MealDB", error="Timeout")
+    metrics.observe("stage_seconds", 0.003, stage="http", provider="MealDB")
+    metrics.observe("stage_seconds", 0.2, stage="http", provider="MealDB")
+
+    text = metrics.to_prometheus()
+    assert 'recipefinder_provider_errors_total{error="Timeout",provider="MealDB"} 3' in text
+    assert 'recipefinder_stage_seconds_bucket{provider="MealDB",stage="http",le="0.005"} 1' in text
+    assert 'recipefinder_stage_seconds_bucket{provider="MealDB",stage="http",le="+Inf"} 2' in text
+    assert 'recipefinder_stage_seconds_count{provider="MealDB",stage="http"} 2' in text
+
+    snapshot = json.loads(metrics.to_json())
+    (series,) = snapshot["histograms"]["stage_seconds"]
+    assert series["count"] == 2 and series["p50"] == 0.005
+    assert metrics.counter_total("provider_errors_total") == 3
+
+
+def test_service_records_provider_timings_and_errors() -> None:
+    service = RecipeService(
+        settings=Settings(HTTP_CACHE_PATH="", CORPUS_ENABLED=False, HTTP_MAX_RETRIES=0)
+    )
+
+    def broken(_builder: RecipeQueryBuilder):
+        return service._request_provider("Broken", "http://127.0.0.1:9/none", {}, 0.2, None)
+
+    service._providers = [("Broken", broken), ("Ok", lambda _b: [Recipe(title="A", source="Ok")])]
+    service.fetch_recipes(RecipeQueryBuilder().with_keywords("a"))
+
+    metrics = service.metrics
+    assert metrics.histogram("provider_seconds", provider="Ok").count == 1
+    assert metrics.histogram("stage_seconds", stage="rank", provider="all").count == 1
+    assert metrics.histogram("search_seconds", mode="batch").count == 1
+    assert metrics.counter_total("provider_errors_total") == 1
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import gc
+from dataclasses import replace
+
+from recipefinder.models import Recipe
+
+
+def test_recipe_is_slotted_with_tuple_ingredients_and_interned_source() -> None:
+    first = Recipe(title="A", source="".join(["Meal", "DB"]), ingredients=["x", "y"])
+    second = Recipe(title="B", source="".join(["Meal", "DB"]))
+
+    assert not hasattr(first, "__dict__")
+    assert first.ingredients == ("x", "y")
+    assert first.source is second.source
+
+
+def test_long_instructions_are_compressed_transparently() -> None:
+    text = "Stir the pot slowly. " * 200
+    recipe = Recipe(title="Stew", source="X", instructions=text)
+
+    raw_slots = gc.get_referents(recipe)
+    assert text not in raw_slots
+    assert any(isinstance(value, bytes) and len(value) < len(text) for value in raw_slots)
+    assert recipe.instructions == text
+    assert recipe == Recipe(title="Stew", source="X", instructions=text)
+
+    shorter = replace(recipe, instructions="Done.")
+    assert shorter.instructions == "Done."
+    assert replace(recipe, title="Other").instructions == text
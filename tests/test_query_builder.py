@@ -1,4 +1,4 @@
-from recipefinder.query_builder import RecipeQueryBuilder
+from recipefinder.query_builder import RecipeQueryBuilder, normalize_params
 
 
 def test_with_limit_clamps_between_1_and_configured_max() -> None:
@@ -42,3 +42,13 @@ def test_build_for_spoonacular_includes_limit_and_ingredients() -> None:
     assert params["includeIngredients"] == "beef,onion"
     assert params["number"] == 7
     assert params["addRecipeInformation"] == "true"
+
+
+def test_normalize_params_drops_api_key_and_canonicalizes_values() -> None:
+    builder = RecipeQueryBuilder().with_keywords("Tacos ").with_limit(5)
+    first = normalize_params(builder.build_for_spoonacular(api_key="secret"))
+    second = normalize_params(builder.build_for_spoonacular(api_key="other"))
+
+    assert first == second
+    assert ("query", "tacos") in first
+    assert all(key != "apiKey" for key, _ in first)
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from recipefinder.http_session import create_http_session
+from recipefinder.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    LatencyWindow,
+    hedged,
+    latency_budget,
+)
+from utils.settings import Settings
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_opens_on_failures_and_probes_once_when_half_open() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow() and breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+
+    clock.now = 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # only one probe at a time
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success(0.01)
+    assert breaker.state == CLOSED and breaker.allow()
+
+
+def test_slow_calls_count_as_failures() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, slow_call=0.5, clock=FakeClock())
+    breaker.record_success(0.1)
+    assert breaker.state == CLOSED
+    breaker.record_success(2.0)
+    assert breaker.state == OPEN
+
+
+def test_hedge_fires_after_delay_and_first_success_wins() -> None:
+    calls = []
+    lock = threading.Lock()
+
+    def call() -> str:
+        with lock:
+            calls.append(len(calls))
+            attempt = len(calls)
+        if attempt == 1:
+            time.sleep(0.5)
+            return "primary"
+        return "hedge"
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        assert hedged(call, 0.05, pool) == ("hedge", True)
+        assert hedged(lambda: "fast", 0.05, pool) == ("fast", False)
+
+
+def test_latency_window_needs_samples_before_reporting() -> None:
+    window = LatencyWindow(size=100, min_samples=10)
+    for value in range(9):
+        window.record(value / 100)
+    assert window.percentile(95) is None
+    for value in range(9, 100):
+        window.record(value / 100)
+    assert window.percentile(95) == pytest.approx(0.95)
+
+
+def test_retries_stop_at_the_latency_budget() -> None:
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            hits.append(1)
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/x"
+    session = create_http_session(
+        Settings(HTTP_MAX_RETRIES=10, HTTP_BACKOFF=0.2, HTTP_CACHE_ENABLED=False)
+    )
+    try:
+        started = time.monotonic()
+        with latency_budget(0.5):
+            response = session.get(url, timeout=1)
+        elapsed = time.monotonic() - started
+    finally:
+        session.close()
+        server.shutdown()
+        server.server_close()
+
+    assert response.status_code == 503
+    assert elapsed < 1.0
+    assert 1 < len(hits) < 10
+
+
+def test_service_skips_a_provider_whose_circuit_is_open() -> None:
+    from recipefinder.adapters import MealDBAdapter
+    from recipefinder.resilience import CircuitOpenError
+    from recipefinder.service import RecipeService
+
+    service = RecipeService(
+        settings=Settings(HTTP_CACHE_PATH="", CORPUS_ENABLED=False, CIRCUIT_FAILURE_THRESHOLD=2)
+    )
+    hits = []
+
+    def down(url, params=None, timeout=None):
+        hits.append(url)
+        raise requests.ConnectionError("refused")
+
+    service._session.get = down
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError):
+            service._call_provider("MealDB", "http://mealdb/search", {"s": "x"}, 1.0, MealDBAdapter())
+    with pytest.raises(CircuitOpenError):
+        service._call_provider("MealDB", "http://mealdb/search", {"s": "x"}, 1.0, MealDBAdapter())
+    assert len(hits) == 2
+    assert service.circuit_states()["MealDB"] == OPEN
+    service.close()
+
+
+def test_retry_budget_is_derived_by_default_and_caps_the_attempt_timeout_only_when_set() -> None:
+    from recipefinder.resilience import remaining_budget
+    from recipefinder.service import RecipeService
+
+    seen = []
+
+    def get(url, params=None, timeout=None):
+        seen.append((timeout, round(remaining_budget())))
+        response = requests.Response()
+        response.status_code = 200
+        return response
+
+    for budget, timeout in ((None, 10.0), (None, 30.0), (4.0, 10.0)):
+        service = RecipeService(
+            settings=Settings(
+                HTTP_CACHE_PATH="", CORPUS_ENABLED=False, HTTP_RETRY_BUDGET=budget, SEARCH_DEADLINE=12.0
+            )
+        )
+        service._session.get = get
+        service._send("MealDB", "http://mealdb/search", {"s": "x"}, timeout)
+        service.close()
+    # Default: the search deadline, never less than one full attempt; explicit: caps the attempt too.
+    assert seen == [(10.0, 12), (30.0, 30), (4.0, 4)]
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import itertools
+import tkinter as tk
+
+import pytest
+
+from ui.results_view import RENDER_CHUNK, ResultsView, ResultWindow
+
+
+def test_window_clamps_to_the_list() -> None:
+    window = ResultWindow(visible=10)
+    window.set_total(10_000)
+    assert window.rows() == range(0, 10)
+
+    assert window.scroll(-5) is False
+    assert window.move_to(20_000) is True
+    assert window.rows() == range(9_990, 10_000)
+    assert window.fractions() == (0.999, 1.0)
+
+    window.set_total(4)
+    assert window.rows() == range(0, 4)
+    assert window.fractions() == (0.0, 1.0)
+
+
+def test_ensure_visible_moves_the_least() -> None:
+    window = ResultWindow(visible=10)
+    window.set_total(100)
+    assert window.ensure_visible(5) is False
+    assert window.ensure_visible(15) is True
+    assert window.rows() == range(6, 16)
+    assert window.ensure_visible(3) is True
+    assert window.offset == 3
+    assert window.move_to_fraction(0.5) is True
+    assert window.offset == 50
+
+
+class _FakeTree:
+    def __init__(self) -> None:
+        self.values = {}
+        self.selected = ()
+
+    def insert(self, _parent, _index, values=()) -> str:
+        row_id = f"I{len(self.values)}"
+        self.values[row_id] = values
+        return row_id
+
+    def delete(self, row_id: str) -> None:
+        del self.values[row_id]
+
+    def item(self, row_id: str, values=()) -> None:
+        self.values[row_id] = values
+
+    def selection(self):
+        return self.selected
+
+    def selection_set(self, row_id: str) -> None:
+        self.selected = (row_id,)
+
+    def selection_remove(self, *_row_ids: str) -> None:
+        self.selected = ()
+
+
+class _FakeScrollbar:
+    def set(self, first: float, last: float) -> None:
+        self.fractions = (first, last)
+
+
+def _headless_view(items, visible: int) -> ResultsView:
+    """A ResultsView over fake widgets, with after() jobs queued for the test to run."""
+    view = ResultsView.__new__(ResultsView)
+    view._format_row = lambda item: (f"Recipe {item}",)
+    view._items = items
+    view._window = ResultWindow(visible)
+    view._window.set_total(len(items))
+    view._selected = None
+    view._render_job = None
+    view._row_ids = []
+    view.tree = _FakeTree()
+    view.scrollbar = _FakeScrollbar()
+    view.jobs = {}
+    ids = itertools.count()
+
+    def after(_ms: int, func, *args) -> str:
+        job = f"after#{next(ids)}"
+        view.jobs[job] = (func, args)
+        return job
+
+    view.after = after
+    view.after_cancel = view.jobs.pop
+    return view
+
+
+def _run_jobs(view: ResultsView) -> None:
+    while view._render_job is not None:
+        func, args = view.jobs.pop(view._render_job)
+        func(*args)
+
+
+def _shown(view: ResultsView):
+    return [view.tree.values[row_id][0] if view.tree.values[row_id] else None for row_id in view._row_ids]
+
+
+def test_render_writes_the_first_chunk_now_and_the_rest_later() -> None:
+    view = _headless_view(range(1_000), visible=12)
+    view._render()
+
+    assert _shown(view)[:RENDER_CHUNK] == [f"Recipe {i}" for i in range(RENDER_CHUNK)]
+    assert _shown(view)[RENDER_CHUNK:] == [None] * (12 - RENDER_CHUNK)
+    assert view._render_job is not None
+    _run_jobs(view)
+    assert _shown(view) == [f"Recipe {i}" for i in range(12)]
+
+
+def test_render_cancels_the_unfinished_pass() -> None:
+    view = _headless_view(range(1_000), visible=12)
+    view._render()
+    pending = view._render_job
+    view._window.move_to(500)
+    view._render()
+
+    assert pending not in view.jobs
+    _run_jobs(view)
+    assert _shown(view) == [f"Recipe {i}" for i in range(500, 512)]
+    assert view.scrollbar.fractions == (0.5, 0.512)
+
+
+@pytest.fixture
+def root():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("no display")
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+def test_view_materializes_only_visible_rows(root) -> None:
+    formatted = []
+
+    def format_row(item: int):
+        formatted.append(item)
+        return (f"Recipe {item}", "MealDB")
+
+    view = ResultsView(root, columns=(("title", "Title", 200), ("source", "Source", 80)), format_row=format_row, height=12)
+    view.pack()
+    view.set_items(range(10_000), selected=5_000)
+    root.update()
+
+    assert len(view.tree.get_children()) <= 12
+    assert len(formatted) < 50
+    assert view.selected_index() == 5_000
+    (row,) = view.tree.selection()
+    assert view.tree.item(row, "values")[0] == "Recipe 5000"
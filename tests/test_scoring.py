@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+from recipefinder.models import Recipe
+from recipefinder.query_builder import RecipeQueryBuilder
+from recipefinder.scoring import ScoringKernel, normalized
+
+
+def test_kernel_counts_substring_hits_per_requested_term() -> None:
+    recipe = Recipe(
+        title="Lemon Chicken",
+        source="X",
+        ingredients=["2 Chicken Breasts", "1 lemon"],
+        instructions="Roast until golden.",
+    )
+    builder = (
+        RecipeQueryBuilder().with_ingredients(["chicken", "rice", "LEMON"]).with_keywords("roast crispy")
+    )
+
+    score = ScoringKernel(builder).score(recipe)
+    assert (score.ing_matches, score.kw_hits, score.missing, score.ingredient_count) == (2, 1, 1, 2)
+    assert score.title == "lemon chicken"
+
+
+def test_terms_do_not_match_across_ingredient_lines() -> None:
+    recipe = Recipe(title="T", source="X", ingredients=["red", "pepper"])
+    builder = RecipeQueryBuilder().with_ingredients(["red pepper"])
+    assert ScoringKernel(builder).score(recipe).ing_matches == 0
+
+
+def test_kernel_matches_plurals_units_and_synonyms() -> None:
+    recipe = Recipe(
+        title="Salad",
+        source="MealDB",
+        ingredients=["2 cups chopped Tomatoes", "3 Green Onions", "1 tbsp Coriander"],
+    )
+    builder = RecipeQueryBuilder().with_ingredients(["tomato", "scallions", "cilantro", "tomatoes", "cup"])
+    score = ScoringKernel(builder).score(recipe)
+    # "tomatoes" duplicates "tomato"; "cup" is a unit and requests nothing.
+    assert (score.ing_matches, score.missing) == (3, 0)
+
+
+def test_normalized_view_is_cached_and_reset_by_replace() -> None:
+    recipe = Recipe(title="Soup", source="X", ingredients=["Water"])
+    assert normalized(recipe) is normalized(recipe)
+
+    copy = replace(recipe, ingredients=["Stock"])
+    assert normalized(copy).tokens == {"stock"}
+    assert normalized(recipe).tokens == {"water"}
+
+
+def test_ingredient_only_query_leaves_instructions_unbuilt() -> None:
+    recipe = Recipe(title="Soup", source="X", ingredients=["water"], instructions="Simmer.")
+    ScoringKernel(RecipeQueryBuilder().with_ingredients(["water"])).score(recipe)
+    assert normalized(recipe).text is None
+
+    assert ScoringKernel(RecipeQueryBuilder().with_keywords("simmer")).score(recipe).kw_hits == 1
+    assert normalized(recipe).text == "soup\nsimmer."
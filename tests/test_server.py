@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import http.client
+import json
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+
+from recipefinder.models import Recipe
+from recipefinder.server import RecipeServer
+from recipefinder.service import RecipeService
+from utils.settings import Settings
+
+
+def _server(**overrides) -> RecipeServer:
+    settings = Settings(**{"HTTP_CACHE_PATH": "", "CORPUS_ENABLED": False, "SERVER_WORKERS": 4, **overrides})
+    service = RecipeService(settings=settings)
+    service._providers = [
+        (
+            "Stub",
+            lambda builder: [
+                Recipe(title="Garlic Chicken", source="Stub", ingredients=["chicken", "garlic"]),
+                Recipe(title="Plain Rice", source="Stub", ingredients=["rice"]),
+            ],
+        )
+    ]
+    return RecipeServer(service, settings=settings, host="127.0.0.1", port=0)
+
+
+def _get(conn: http.client.HTTPConnection, path: str):
+    conn.request("GET", path)
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_search_and_strategies_over_one_keep_alive_connection() -> None:
+    with _server() as server:
+        parts = urlsplit(server.url)
+        conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=5)
+        status, strategies = _get(conn, "/strategies")
+        assert status == 200
+        assert strategies[1]["id"] == "fewer-missing-ingredients"
+
+        status, body = _get(conn, "/search?ingredients=chicken&limit=1&strategy=fewer-missing-ingredients")
+        assert status == 200
+        assert body["count"] == 1 and body["recipes"][0]["title"] == "Garlic Chicken"
+
+        status, body = _get(conn, "/health")
+        assert status == 200 and body["providers"] == ["Stub"]
+        conn.close()
+
+
+def test_bad_requests_get_json_errors() -> None:
+    with _server() as server:
+        parts = urlsplit(server.url)
+        conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=5)
+        assert _get(conn, "/search")[0] == 400
+        assert _get(conn, "/search?q=soup&strategy=nope")[0] == 400
+        assert _get(conn, "/search?q=soup&limit=x")[0] == 400
+        assert _get(conn, "/nowhere")[0] == 404
+        conn.close()
+
+
+def _connect(server: RecipeServer) -> http.client.HTTPConnection:
+    parts = urlsplit(server.url)
+    return http.client.HTTPConnection(parts.hostname, parts.port, timeout=3)
+
+
+def test_idle_keep_alive_connection_yields_its_worker_to_a_waiting_client() -> None:
+    with _server(SERVER_WORKERS=1, SERVER_IDLE_TIMEOUT=30) as server:
+        idle = _connect(server)
+        assert _get(idle, "/health")[0] == 200  # now idle, holding the only worker
+
+        started = time.perf_counter()
+        waiting = _connect(server)
+        assert _get(waiting, "/health")[0] == 200
+        assert time.perf_counter() - started < 2
+        idle.close()
+        waiting.close()
+
+
+def test_idle_keep_alive_connection_is_closed_after_the_idle_timeout() -> None:
+    with _server(SERVER_IDLE_TIMEOUT=0.2) as server:
+        parts = urlsplit(server.url)
+        with socket.create_connection((parts.hostname, parts.port), timeout=3) as sock:
+            sock.sendall(b"GET /health HTTP/1.1\r\nHost: test\r\n\r\n")
+            response = http.client.HTTPResponse(sock)
+            response.begin()
+            response.read()
+            assert response.status == 200
+            assert sock.recv(1) == b""  # closed by the server, well before the socket timeout
+
+
+def test_client_disconnect_is_not_answered_with_a_500(capsys) -> None:
+    with _server() as server:
+        def hang_up(self, _query) -> None:
+            raise BrokenPipeError("client went away")
+
+        server.httpd.RequestHandlerClass._strategies = hang_up
+        conn = _connect(server)
+        conn.request("GET", "/strategies")
+        try:
+            conn.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionError):
+            pass
+        else:
+            raise AssertionError("expected the connection to be dropped")
+        conn.close()
+    assert "Server error" not in capsys.readouterr().out
+
+
+def test_server_close_closes_connections_still_waiting_for_a_worker() -> None:
+    release = threading.Event()
+    with _server(SERVER_WORKERS=1) as server:
+        def slow(self, _query) -> None:
+            release.wait(5)
+            self._send_json(200, [])
+
+        server.httpd.RequestHandlerClass._strategies = slow
+        busy = _connect(server)
+        busy.request("GET", "/strategies")  # occupies the only worker
+        parts = urlsplit(server.url)
+        queued = socket.create_connection((parts.hostname, parts.port), timeout=3)
+        deadline = time.monotonic() + 3
+        while not server.httpd.backlogged and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert server.httpd.backlogged
+
+        server.httpd.shutdown()
+        server._thread = None
+        server.httpd.server_close()
+        try:
+            assert queued.recv(1) == b""
+        except ConnectionResetError:
+            pass
+        finally:
+            release.set()
+            queued.close()
+            busy.close()
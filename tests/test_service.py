@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import requests
+
+from recipefinder.models import Recipe
+from recipefinder.query_builder import RecipeQueryBuilder
+from recipefinder.resilience import ProviderDegraded
+from recipefinder.service import RecipeService
+from utils.settings import Settings
+
+
+def _service(**overrides) -> RecipeService:
+    overrides.setdefault("HTTP_CACHE_PATH", "")
+    overrides.setdefault("CORPUS_PATH", "")
+    return RecipeService(settings=Settings(**overrides))
+
+
+def test_concurrent_gather_keeps_provider_order() -> None:
+    service = _service(SEARCH_DEADLINE=2.0)
+
+    def slow(_builder: RecipeQueryBuilder):
+        time.sleep(0.05)
+        return [Recipe(title="Slow", source="A")]
+
+    def fast(_builder: RecipeQueryBuilder):
+        return [Recipe(title="Fast", source="B")]
+
+    service._providers = [("A", slow), ("B", fast)]
+    recipes = service.fetch_recipes(RecipeQueryBuilder())
+    assert [recipe.title for recipe in recipes] == ["Slow", "Fast"]
+
+
+def test_deadline_returns_providers_that_already_answered() -> None:
+    service = _service(SEARCH_DEADLINE=0.1)
+    release = threading.Event()
+
+    def hung(_builder: RecipeQueryBuilder):
+        release.wait(2.0)
+        return [Recipe(title="Late", source="A")]
+
+    def fast(_builder: RecipeQueryBuilder):
+        return [Recipe(title="Fast", source="B")]
+
+    service._providers = [("A", hung), ("B", fast)]
+    started = time.monotonic()
+    recipes = service.fetch_recipes(RecipeQueryBuilder())
+    elapsed = time.monotonic() - started
+    release.set()
+
+    assert [recipe.title for recipe in recipes] == ["Fast"]
+    assert elapsed < 1.0
+
+
+def test_failing_provider_does_not_drop_other_results() -> None:
+    service = _service()
+
+    def broken(_builder: RecipeQueryBuilder):
+        raise RuntimeError("boom")
+
+    service._providers = [("A", broken), ("B", lambda _b: [Recipe(title="Ok", source="B")])]
+    assert [recipe.title for recipe in service.fetch_recipes(RecipeQueryBuilder())] == ["Ok"]
+
+
+def test_local_corpus_serves_recipes_seen_earlier() -> None:
+    service = _service(SEARCH_CONCURRENT=False)
+    live = [Recipe(title="Garlic Soup", source="MealDB", ingredients=["4 cloves garlic"])]
+    service._corpus.add_many(live)
+    service._providers = [("MealDB", lambda _b: []), ("Local", service._fetch_corpus)]
+
+    builder = RecipeQueryBuilder().with_ingredients(["garlic"])
+    assert [recipe.title for recipe in service.fetch_recipes(builder)] == ["Garlic Soup"]
+
+
+def test_merge_prefers_live_copy_over_corpus_duplicate() -> None:
+    live = Recipe(title="Soup", source="MealDB", instructions="fresh")
+    stored = Recipe(title="soup ", source="MealDB", instructions="old")
+    merged = _service()._merge([[live], [stored, Recipe(title="Other", source="MealDB")]])
+    assert [recipe.instructions for recipe in merged] == ["fresh", ""]
+
+
+def test_merge_folds_cross_provider_near_duplicates() -> None:
+    service = _service()
+    mealdb = Recipe(
+        title="Chicken Tikka Masala",
+        source="MealDB",
+        ingredients=["1 lb chicken thighs", "1 cup yogurt", "2 tbsp garam masala", "1 onion"],
+    )
+    spoonacular = Recipe(
+        title="Chicken tikka masala",
+        source="Spoonacular",
+        ingredients=["chicken thigh", "yoghurt", "garam masala", "onions", "cream"],
+    )
+    other = Recipe(title="Chicken Pie", source="Spoonacular", ingredients=["chicken", "pastry"])
+
+    merged = service._merge([[mealdb], [spoonacular, other]])
+    assert [recipe.title for recipe in merged] == ["Chicken Tikka Masala", "Chicken Pie"]
+    assert merged[0].providers == ("MealDB", "Spoonacular")
+    assert mealdb.also_from == ()  # shared inputs are not mutated
+    assert service.metrics.counter_value("duplicates_merged_total") == 1
+
+
+def test_fetch_recipes_iter_streams_fastest_provider_first() -> None:
+    service = _service(SEARCH_DEADLINE=2.0)
+    release = threading.Event()
+
+    def slow(_builder: RecipeQueryBuilder):
+        release.wait(2.0)
+        return [Recipe(title="Chicken Pie", source="A", ingredients=["chicken"])]
+
+    def fast(_builder: RecipeQueryBuilder):
+        return [Recipe(title="Rice", source="B", ingredients=["rice"])]
+
+    service._providers = [("A", slow), ("B", fast)]
+    builder = RecipeQueryBuilder().with_ingredients(["chicken"])
+    stream = service.fetch_recipes_iter(builder)
+
+    first = next(stream)
+    assert (first.provider, first.pending, first.done) == ("B", 1, False)
+    assert [recipe.title for recipe in first.recipes] == ["Rice"]
+
+    release.set()
+    second = next(stream)
+    assert second.provider == "A" and second.done
+    assert [recipe.title for recipe in second.recipes] == ["Chicken Pie", "Rice"]
+    assert list(stream) == []
+
+
+def test_fetch_recipes_iter_finishes_when_a_provider_misses_the_deadline() -> None:
+    service = _service(SEARCH_DEADLINE=0.1)
+    release = threading.Event()
+    service._providers = [
+        ("A", lambda _b: release.wait(2.0) and []),
+        ("B", lambda _b: [Recipe(title="Fast", source="B")]),
+    ]
+
+    updates = list(service.fetch_recipes_iter(RecipeQueryBuilder()))
+    release.set()
+    assert [update.pending for update in updates] == [1, 0]
+    assert [recipe.title for recipe in updates[-1].recipes] == ["Fast"]
+
+
+def test_fetch_recipes_end_to_end_against_stub_providers() -> None:
+    from benchmarks.stub_server import StubProviderServer
+
+    with StubProviderServer(meals=5, results=5) as stub:
+        service = _service(
+            MEALDB_URL=stub.mealdb_url,
+            SPOONACULAR_URL=stub.spoonacular_url,
+            SPOONACULAR_API_KEY="test",
+            HTTP_CACHE_ENABLED=False,
+            CORPUS_ENABLED=False,
+        )
+        builder = RecipeQueryBuilder().with_ingredients(["garlic"]).with_limit(25)
+        recipes = service.fetch_recipes(builder)
+        service.close()
+
+    assert {recipe.source for recipe in recipes} == {"MealDB", "Spoonacular"}
+    # MealDB: filter.php for "garlic" matches 2 of the 5 meals, then 2 lookups.
+    assert sum(recipe.source == "MealDB" for recipe in recipes) == 2
+    assert len(recipes) == 7
+    assert stub.requests_served == 4
+
+
+def test_fetch_recipes_many_dedupes_requests_and_reports_failures() -> None:
+    service = _service(CORPUS_ENABLED=False)
+    calls = []
+    lock = threading.Lock()
+
+    def mealdb(builder: RecipeQueryBuilder):
+        with lock:
+            calls.append(builder.requested_keywords())
+        time.sleep(0.01)
+        return [Recipe(title=f"{builder.requested_keywords()} stew", source="MealDB")]
+
+    def broken(builder: RecipeQueryBuilder):
+        raise RuntimeError("quota exceeded")
+
+    service._providers = [("MealDB", mealdb), ("Broken", broken)]
+    keywords = ["beef", "Beef ", "fish", "beef", "lamb"]
+    builders = [RecipeQueryBuilder().with_keywords(keyword) for keyword in keywords]
+
+    results = list(service.fetch_recipes_many(builders, max_concurrency_per_provider=2))
+
+    assert sorted(calls) == ["beef", "fish", "lamb"]
+    assert [result.completed for result in results] == [1, 2, 3, 4, 5]
+    assert sorted(result.index for result in results) == list(range(5))
+    by_index = {result.index: result for result in results}
+    assert [by_index[i].recipes[0].title.split()[0].lower() for i in range(5)] == [
+        keyword.strip().lower() for keyword in keywords
+    ]
+    assert all(result.errors == {"Broken": "RuntimeError: quota exceeded"} for result in results)
+    assert service.metrics.counter_total("batch_requests_deduplicated_total") == 2
+
+
+def test_batch_concurrency_for_spoonacular_is_capped_by_its_rate_limit() -> None:
+    service = _service(
+        CORPUS_ENABLED=False, SPOONACULAR_RATE_LIMIT=10, SPOONACULAR_RATE_WAIT=0.2, BATCH_CONCURRENCY_PER_PROVIDER=4
+    )
+    active = {"MealDB": 0, "Spoonacular": 0}
+    peak = dict(active)
+    lock = threading.Lock()
+
+    def provider(name: str):
+        def fetch(builder: RecipeQueryBuilder):
+            with lock:
+                active[name] += 1
+                peak[name] = max(peak[name], active[name])
+            time.sleep(0.05)
+            with lock:
+                active[name] -= 1
+            return []
+
+        return fetch
+
+    service._providers = [(name, provider(name)) for name in active]
+    builders = [RecipeQueryBuilder().with_keywords(f"soup {i}") for i in range(8)]
+    assert len(list(service.fetch_recipes_many(builders))) == 8
+    assert peak == {"MealDB": 4, "Spoonacular": 2}
+
+
+def test_degraded_provider_is_reported_but_its_recipes_are_kept() -> None:
+    service = _service(CORPUS_ENABLED=False)
+
+    def degraded(builder: RecipeQueryBuilder):
+        first_page = [Recipe(title="First Page", source="Spoonacular")]
+        raise ProviderDegraded("Spoonacular skipped (rate limited)", first_page)
+
+    service._providers = [
+        ("MealDB", lambda builder: [Recipe(title="Stew", source="MealDB")]),
+        ("Spoonacular", degraded),
+    ]
+    builder = RecipeQueryBuilder().with_keywords("stew")
+    assert {recipe.title for recipe in service.fetch_recipes(builder)} == {"Stew", "First Page"}
+
+    (result,) = service.fetch_recipes_many([builder])
+    assert result.errors == {"Spoonacular": "ProviderDegraded: Spoonacular skipped (rate limited)"}
+    assert not result.ok
+    assert {recipe.title for recipe in result.recipes} == {"Stew", "First Page"}
+
+
+def test_rerank_reuses_the_last_complete_search_without_provider_calls() -> None:
+    service = _service(CORPUS_ENABLED=False)
+    calls = []
+
+    def provider(builder: RecipeQueryBuilder):
+        calls.append(builder.limit())
+        return [
+            Recipe(title="Chicken Stew", source="A", ingredients=["chicken", "garlic", "onion", "carrot", "salt"]),
+            Recipe(title="Garlic Chicken", source="A", ingredients=["chicken", "garlic"]),
+        ]
+
+    service._providers = [("A", provider)]
+    builder = RecipeQueryBuilder().with_keywords("stew").with_ingredients(["garlic", "chicken", "lemon"])
+    best, fewer = service.available_strategies()
+    assert service.rerank(builder, fewer) is None
+    assert [r.title for r in service.fetch_recipes(builder.with_limit(10), best)] == ["Chicken Stew", "Garlic Chicken"]
+
+    assert [r.title for r in service.rerank(builder, fewer)] == ["Garlic Chicken", "Chicken Stew"]
+    assert [r.title for r in service.rerank(builder.with_limit(1), best)] == ["Chicken Stew"]
+    assert service.rerank(builder.with_limit(11)) is None  # needs more candidates than were fetched
+    assert calls == [10]
+
+    # Streamed searches are kept as well; searches with a failed provider are not.
+    stream_builder = RecipeQueryBuilder().with_keywords("rice")
+    list(service.fetch_recipes_iter(stream_builder))
+    assert service.rerank(stream_builder) is not None
+    service._providers = [("A", provider), ("B", lambda _b: 1 / 0)]
+    broken = RecipeQueryBuilder().with_keywords("soup")
+    service.fetch_recipes(broken)
+    assert service.rerank(broken) is None
+    service.close()
+
+
+def test_rerank_ignores_searches_where_spoonacular_degraded() -> None:
+    service = _service(CORPUS_ENABLED=False, SPOONACULAR_API_KEY="key", SPOONACULAR_RATE_LIMIT=0)
+
+    def rate_limited(params) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 429
+        response._content = b"{}"
+        return response
+
+    service._spoonacular._get = rate_limited
+    service._providers = [
+        ("MealDB", lambda builder: [Recipe(title="Beef Stew", source="MealDB")]),
+        ("Spoonacular", service._fetch_spoonacular),
+    ]
+    builder = RecipeQueryBuilder().with_keywords("stew")
+    assert [recipe.title for recipe in service.fetch_recipes(builder)] == ["Beef Stew"]
+    assert service.rerank(builder) is None
+    list(service.fetch_recipes_iter(builder))
+    assert service.rerank(builder) is None
+    service.close()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from recipefinder.adapters import MealDBAdapter
+from recipefinder.service import RecipeService
+from recipefinder.singleflight import SingleFlight
+from utils.settings import Settings
+
+
+def test_concurrent_calls_with_same_key_run_once() -> None:
+    flight: SingleFlight[int] = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def work() -> int:
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return 42
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        leader = pool.submit(flight.do, "k", work)
+        started.wait(1.0)
+        followers = [pool.submit(flight.do, "k", work) for _ in range(4)]
+        results = [leader.result()] + [future.result() for future in followers]
+
+    assert len(calls) == 1
+    assert results[0] == (42, False)
+    assert all(result == (42, True) for result in results[1:])
+    assert flight.stats()["coalescing_ratio"] == pytest.approx(0.8)
+
+
+def test_error_reaches_every_waiter_and_is_not_cached() -> None:
+    flight: SingleFlight[int] = SingleFlight()
+    started = threading.Event()
+
+    def broken() -> int:
+        started.set()
+        time.sleep(0.05)
+        raise ValueError("upstream down")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        leader = pool.submit(flight.do, "k", broken)
+        started.wait(1.0)
+        follower = pool.submit(flight.do, "k", broken)
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result()
+
+    assert flight.do("k", lambda: 7) == (7, False)
+
+
+def test_service_coalesces_identical_provider_requests() -> None:
+    service = RecipeService(settings=Settings(HTTP_CACHE_PATH="", CORPUS_ENABLED=False))
+    hits = []
+
+    class FakeResponse:
+        raw = None
+        status_code = 200
+
+        def raise_for_status(self) -> None:
+            pass
+
+        def json(self) -> dict:
+            return {"meals": [{"strMeal": "Soup", "strInstructions": ""}]}
+
+    def fake_get(url, params=None, timeout=None):
+        hits.append(params)
+        time.sleep(0.1)
+        return FakeResponse()
+
+    service._session.get = fake_get
+    request = lambda params: service._request_provider(  # noqa: E731
+        "MealDB", "http://mealdb/search", params, 1.0, MealDBAdapter()
+    )
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(request, [{"s": "Soup"}, {"s": " soup"}, {"s": "SOUP"}, {"s": "soup"}]))
+
+    assert len(hits) == 1
+    assert all([recipe.title for recipe in recipes] == ["Soup"] for recipes in results)
+    assert service.metrics.counter_value("singleflight_total", provider="MealDB", role="follower") == 3
+    service.close()
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, List
+
+import pytest
+import requests
+
+from recipefinder.adapters import SpoonacularAdapter
+from recipefinder.cancellation import CancellationToken, SearchCancelled, cancel_scope
+from recipefinder.query_builder import RecipeQueryBuilder
+from recipefinder.resilience import ProviderDegraded
+from recipefinder.spoonacular import QuotaTracker, SpoonacularClient, TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def _response(status: int, body: Dict, headers: Dict[str, str] | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = requests.compat.json.dumps(body).encode("utf-8")
+    response.headers.update(headers or {})
+    return response
+
+
+def _page(offset: int, count: int, total: int) -> Dict:
+    results = [{"title": f"Recipe {offset + i}"} for i in range(count)]
+    return {"results": results, "offset": offset, "totalResults": total}
+
+
+def test_token_bucket_allows_bursts_then_paces_at_rate() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=2, clock=clock, sleep=clock.sleep)
+    assert bucket.acquire() and bucket.acquire()
+    assert clock.now == 0.0
+    assert not bucket.try_acquire()
+    assert bucket.acquire(timeout=1.0)
+    assert clock.now == 0.5
+    bucket.pause(3.0)
+    assert not bucket.acquire(timeout=2.0)
+
+
+def test_token_bucket_wait_ends_when_the_search_is_cancelled() -> None:
+    bucket = TokenBucket(rate=2.0, capacity=1)
+    assert bucket.acquire()
+    token = CancellationToken()
+    threading.Timer(0.05, token.cancel).start()
+    started = time.perf_counter()
+    with cancel_scope(token), pytest.raises(SearchCancelled):
+        bucket.acquire(timeout=5.0)
+    assert time.perf_counter() - started < 0.4
+    # The cancelled caller's token was handed back: the next one waits under 0.5s, not 1s.
+    assert bucket.acquire(timeout=0.7)
+
+
+def test_pages_by_offset_and_tracks_quota_headers() -> None:
+    calls: List[Dict] = []
+    quota = QuotaTracker(today=lambda: "2024-01-01")
+
+    def get(params: Dict) -> requests.Response:
+        calls.append(params)
+        offset = params.get("offset", 0)
+        headers = {"X-API-Quota-Request": "1.6", "X-API-Quota-Used": "10", "X-API-Quota-Left": "140"}
+        return _response(200, _page(offset, min(params["number"], 5 - offset), 5), headers)
+
+    client = SpoonacularClient(
+        get, SpoonacularAdapter(), TokenBucket(rate=0, capacity=1), quota, page_size=2
+    )
+    builder = RecipeQueryBuilder().with_keywords("soup").with_limit(25)
+    pages = list(client.iter_pages(builder, "key", max_results=25))
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [call.get("offset", 0) for call in calls] == [0, 2, 4]
+    state = quota.state()
+    assert (state.used, state.left, state.last_request) == (10, 140, 1.6)
+
+
+def test_exhausted_quota_serves_only_cached_pages() -> None:
+    calls: List[Dict] = []
+    quota = QuotaTracker(today=lambda: "2024-01-01")
+    quota.update({"X-API-Quota-Left": "0.5"})
+
+    def get(params: Dict) -> requests.Response:
+        calls.append(params)
+        response = _response(200, _page(0, 1, 1))
+        response.from_cache = True
+        return response
+
+    cached = {"soup"}
+    client = SpoonacularClient(
+        get,
+        SpoonacularAdapter(),
+        TokenBucket(rate=1, capacity=1),
+        quota,
+        is_cached=lambda params: params["query"] in cached,
+    )
+    assert [r.title for r in client.search(RecipeQueryBuilder().with_keywords("soup"), "key")] == ["Recipe 0"]
+    with pytest.raises(ProviderDegraded, match="quota"):
+        client.search(RecipeQueryBuilder().with_keywords("stew"), "key")
+    assert len(calls) == 1
+
+
+def test_payment_required_marks_quota_exhausted_until_the_next_day() -> None:
+    day = ["2024-01-01"]
+    quota = QuotaTracker(today=lambda: day[0])
+    client = SpoonacularClient(
+        lambda params: _response(402, {"message": "limit reached"}),
+        SpoonacularAdapter(),
+        TokenBucket(rate=0, capacity=1),
+        quota,
+    )
+    with pytest.raises(ProviderDegraded) as raised:
+        client.search(RecipeQueryBuilder().with_keywords("soup"), "key")
+    assert raised.value.recipes == []
+    assert not quota.allows(1)
+    day[0] = "2024-01-02"
+    assert quota.allows(1)
+
+
+def test_rate_limited_page_raises_with_the_pages_already_fetched() -> None:
+    clock = FakeClock()
+
+    def get(params: Dict) -> requests.Response:
+        if params.get("offset", 0):
+            return _response(429, {}, {"Retry-After": "3"})
+        return _response(200, _page(0, 2, 5))
+
+    limiter = TokenBucket(rate=1, capacity=5, clock=clock, sleep=clock.sleep)
+    client = SpoonacularClient(get, SpoonacularAdapter(), limiter, QuotaTracker(), page_size=2)
+    builder = RecipeQueryBuilder().with_keywords("soup").with_limit(5)
+    with pytest.raises(ProviderDegraded, match="rate limited") as raised:
+        client.search(builder, "key")
+    assert [recipe.title for recipe in raised.value.recipes] == ["Recipe 0", "Recipe 1"]
+    assert not limiter.try_acquire()  # paused for Retry-After
+    assert [len(page) for page in client.iter_pages(builder, "key", max_results=5)] == []
@@ -64,3 +64,35 @@ def test_fewer_missing_prefers_fewer_missing_then_shorter_lists() -> None:
 
     ordered = FewerMissingStrategy().rank([r2, r3, r1], builder)
     assert [recipe.title for recipe in ordered[:3]] == ["Short", "Long", "MissingOne"]
+
+
+def test_strategies_accept_generators_and_match_full_sort_ties() -> None:
+    recipes = [
+        Recipe(title=f"{name} Soup", source="X", ingredients=["chicken", "water"])
+        for name in ("delta", "Alpha", "charlie", "bravo", "alpha")
+    ] + [Recipe(title="Rice", source="X", ingredients=["rice"])]
+
+    builder = RecipeQueryBuilder().with_ingredients(["chicken"]).with_keywords("").with_limit(4)
+
+    for strategy in (BestMatchStrategy(), FewerMissingStrategy()):
+        ordered = strategy.rank((recipe for recipe in recipes), builder)
+        # Equal scores fall back to title order; equal titles keep input order.
+        assert [recipe.title for recipe in ordered] == [
+            "Alpha Soup",
+            "alpha Soup",
+            "bravo Soup",
+            "charlie Soup",
+        ]
+
+
+def test_no_filter_ranking_consumes_only_what_it_needs() -> None:
+    consumed = []
+
+    def stream():
+        for idx in range(1000):
+            consumed.append(idx)
+            yield Recipe(title=str(idx), source="X")
+
+    ordered = BestMatchStrategy().rank(stream(), RecipeQueryBuilder().with_limit(3))
+    assert [recipe.title for recipe in ordered] == ["0", "1", "2"]
+    assert len(consumed) == 3
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+import requests
+
+from benchmarks.cassette import Cassette
+from benchmarks.loadgen import query_mix, run_load, summarize_load
+from benchmarks.stub_server import LatencyModel, StubProviderServer
+from recipefinder.query_builder import RecipeQueryBuilder
+from recipefinder.service import RecipeService
+from utils.settings import Settings
+
+
+def _service(stub: StubProviderServer, **overrides) -> RecipeService:
+    settings = {
+        "MEALDB_URL": stub.mealdb_url,
+        "SPOONACULAR_URL": stub.spoonacular_url,
+        "SPOONACULAR_API_KEY": "secret-key",
+        "SPOONACULAR_RATE_LIMIT": 0,
+        "HTTP_CACHE_ENABLED": False,
+        "CORPUS_ENABLED": False,
+        **overrides,
+    }
+    return RecipeService(settings=Settings(**settings))
+
+
+def test_latency_model_parses_cli_specs() -> None:
+    assert LatencyModel.parse("0.02").sample() == 0.02
+    uniform = LatencyModel.parse("uniform:0.01,0.03", seed=1)
+    assert all(0.01 <= uniform.sample() <= 0.03 for _ in range(100))
+    lognormal = LatencyModel.parse("lognormal:0.02,0.5", seed=1)
+    samples = sorted(lognormal.sample() for _ in range(1001))
+    assert 0.015 < samples[500] < 0.025 and samples[-1] > 0.04
+    with pytest.raises(ValueError):
+        LatencyModel.parse("uniform:0.01")
+
+
+def test_injected_errors_and_429_bursts() -> None:
+    with StubProviderServer(error_rate=1.0) as stub:
+        assert requests.get(stub.mealdb_url, params={"s": "x"}, timeout=5).status_code == 500
+    with StubProviderServer(burst_every=10, burst_length=10, retry_after=2) as stub:
+        response = requests.get(stub.spoonacular_url, timeout=5)
+        assert response.status_code == 429 and response.headers["Retry-After"] == "2"
+        assert stub.statuses == {429: 1}
+
+
+def test_recorded_cassette_replays_without_the_original_upstream(tmp_path: Path) -> None:
+    builder = RecipeQueryBuilder().with_keywords("chicken").with_limit(25)
+    path = tmp_path / "cassette.json"
+    with StubProviderServer(meals=5, results=5) as upstream:
+        service = _service(upstream)
+        cassette = Cassette()
+        cassette.attach(service.session)
+        recorded = [recipe.title for recipe in service.fetch_recipes(builder)]
+        service.close()
+    cassette.save(path)
+    assert "secret-key" not in path.read_text(encoding="utf-8")
+
+    # Different synthetic data, strict replay: only the recording can answer.
+    with StubProviderServer(meals=1, results=1, cassette=Cassette.load(path), strict=True) as replay:
+        service = _service(replay, SPOONACULAR_API_KEY="other-key")
+        replayed = [recipe.title for recipe in service.fetch_recipes(builder)]
+        service.close()
+    assert replayed == recorded and len(recorded) == 10
+
+
+def test_load_generator_reports_retry_amplification() -> None:
+    with StubProviderServer(meals=5, results=5, error_rate=0.2, seed=3) as stub:
+        service = _service(stub, HTTP_BACKOFF=0, CIRCUIT_FAILURE_THRESHOLD=1000)
+        result = run_load(service, query_mix(6), clients=3, duration=30.0, max_requests=30)
+        report = summarize_load(result, service.metrics, stub.requests_served, stub.statuses)
+        service.close()
+    assert report["searches"] + report["failed_searches"] == 30
+    assert report["upstream_requests"] > report["http_calls"] > 0
+    assert report["retry_amplification"] == pytest.approx(report["upstream_requests"] / report["http_calls"])
+    assert report["p50_ms"] <= report["p99_ms"] <= report["max_ms"]
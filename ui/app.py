@@ -1,39 +1,112 @@
-import io
 import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Any, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-from recipefinder.models import Recipe
-from recipefinder.query_builder import RecipeQueryBuilder
-from recipefinder.http_session import create_http_session
-from recipefinder.service import RecipeService
-from utils.settings import get_settings
+from .results_view import ResultsView
 
-try:
-    from PIL import Image, ImageTk  # type: ignore
+if TYPE_CHECKING:  # imported lazily at runtime to keep startup fast
+    from concurrent.futures import ThreadPoolExecutor
 
-    PIL_AVAILABLE = True
-except ImportError:
-    Image = None  # type: ignore
-    ImageTk = None  # type: ignore
-    PIL_AVAILABLE = False
+    from recipefinder.cancellation import CancellationToken
+    from recipefinder.models import Recipe
+    from recipefinder.query_builder import RecipeQueryBuilder
+    from recipefinder.service import RecipeService, SearchProgress
+    from recipefinder.strategies import RecipeStrategy
+
+    from .images import ImagePipeline
 
 
 class RecipeApp(tk.Tk):
-    """Simple ttk UI that consumes the recipefinder service."""
+    """Simple ttk UI that consumes the recipefinder service.
+
+    Only tkinter is imported up front. Without a `service` argument the window
+    shows immediately and the service (requests, pydantic, PIL, ...) is built
+    on a background thread; Search is enabled once it is ready.
+
+    Searches run on a small bounded pool. Starting a search cancels the
+    previous one (latest query wins), and with UI_SEARCH_DEBOUNCE_MS > 0 a
+    search also starts by itself once typing pauses.
+
+    Changing only the strategy or "Max results" re-ranks the shown search's
+    candidates locally (RecipeService.rerank), with no provider requests.
+    Pressing Search with nothing changed fetches fresh results.
+    """
 
-    def __init__(self, service: RecipeService) -> None:
+    def __init__(self, service: "Optional[RecipeService]" = None) -> None:
         super().__init__()
         self.title("Recipe Finder")
         self.geometry("720x600")
-        self._service = service
-        self._settings = get_settings()
-        self._session = create_http_session(self._settings)
-        self._strategies = {strategy.name: strategy for strategy in service.available_strategies()}
-        self._recipes: List[Recipe] = []
+        self._service: "Optional[RecipeService]" = None
+        self._owns_service = service is None
+        self._settings: Any = None
+        self._strategies: "Dict[str, RecipeStrategy]" = {}
+        self._recipes: "List[Recipe]" = []
+        self._search_id = 0
         self._image_photo: Optional[Any] = None
+        self._images: "Optional[ImagePipeline]" = None
+        self._search_pool: "Optional[ThreadPoolExecutor]" = None
+        self._search_token: "Optional[CancellationToken]" = None
+        self._debounce_job: Optional[str] = None
+        # (candidate key, strategy name, limit) of the results on screen / being fetched.
+        self._shown: Optional[Tuple] = None
+        self._pending: Optional[Tuple] = None
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
         self._build_ui()
+        if service is None:
+            threading.Thread(target=self._load_service, daemon=True).start()
+        else:
+            self._on_service_ready(service)
+
+    def _load_service(self) -> None:
+        try:
+            from recipefinder.service import RecipeService
+
+            from . import images  # noqa: F401  (PIL import off the Tk thread)
+
+            service = RecipeService()
+        except Exception as exc:  # noqa: BLE001
+            self.after(0, self._on_service_failed, exc)
+            return
+        self.after(0, self._on_service_ready, service)
+
+    def _on_service_failed(self, exc: Exception) -> None:
+        self.status_var.set("Search unavailable")
+        messagebox.showerror("Error", f"Could not start the search service: {exc}")
+
+    def _on_service_ready(self, service: "RecipeService") -> None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        from .images import ImagePipeline
+
+        self._service = service
+        self._settings = settings = service.settings
+        self._strategies = {strategy.name: strategy for strategy in service.available_strategies()}
+        # One pooled session for API calls and thumbnails alike.
+        self._images = ImagePipeline(
+            self,
+            service.session,
+            timeout=settings.HTTP_TIMEOUT,
+            cache_dir=settings.IMAGE_CACHE_DIR or None,
+            workers=settings.IMAGE_WORKERS,
+            memory_entries=settings.IMAGE_MEMORY_ENTRIES,
+            file_format=settings.IMAGE_CACHE_FORMAT,
+            disk_entries=settings.IMAGE_CACHE_DISK_ENTRIES,
+        )
+        self.limit_var.set(str(settings.QUERY_DEFAULT_LIMIT))
+        self.limit_spinbox.configure(to=settings.QUERY_MAX_LIMIT)
+        self.strategy_combo.configure(values=list(self._strategies.keys()))
+        self.strategy_var.set(next(iter(self._strategies)))
+        if settings.UI_SHOW_METRICS:
+            self.metrics_label.pack(anchor=tk.W, pady=(6, 0))
+        self._search_pool = ThreadPoolExecutor(
+            max_workers=settings.UI_SEARCH_WORKERS, thread_name_prefix="search"
+        )
+        if settings.UI_SEARCH_DEBOUNCE_MS:
+            for var in (self.keywords_var, self.ingredients_var):
+                var.trace_add("write", lambda *_args: self._schedule_search())
+        self.search_button.configure(state=tk.NORMAL)
+        self.status_var.set("Idle")
 
     def _build_ui(self) -> None:
         root = ttk.Frame(self, padding=12)
@@ -54,43 +127,49 @@ class RecipeApp(tk.Tk):
             side=tk.LEFT, padx=(6, 12)
         )
 
-        ttk.Button(search_frame, text="Search", command=self._on_search).pack(side=tk.LEFT)
+        self.search_button = ttk.Button(
+            search_frame, text="Search", command=self._on_search, state=tk.DISABLED
+        )
+        self.search_button.pack(side=tk.LEFT)
 
         options_frame = ttk.Frame(root)
         options_frame.pack(fill=tk.X, pady=(0, 8))
 
         ttk.Label(options_frame, text="Max results:").pack(side=tk.LEFT)
-        self.limit_var = tk.StringVar(value=str(self._settings.QUERY_DEFAULT_LIMIT))
-        ttk.Spinbox(
+        self.limit_var = tk.StringVar(value="10")
+        self.limit_spinbox = ttk.Spinbox(
             options_frame,
             from_=1,
-            to=self._settings.QUERY_MAX_LIMIT,
+            to=100,
             textvariable=self.limit_var,
             width=4,
             wrap=True,
-        ).pack(side=tk.LEFT, padx=(6, 12))
+            command=self._on_options_changed,
+        )
+        self.limit_spinbox.bind("<Return>", lambda _e: self._on_search())
+        self.limit_spinbox.pack(side=tk.LEFT, padx=(6, 12))
 
         ttk.Label(options_frame, text="Provider strategy:").pack(side=tk.LEFT)
-        self.strategy_var = tk.StringVar(value=next(iter(self._strategies)))
-        ttk.Combobox(
+        self.strategy_var = tk.StringVar()
+        self.strategy_combo = ttk.Combobox(
             options_frame,
             textvariable=self.strategy_var,
-            values=list(self._strategies.keys()),
             width=20,
             state="readonly",
-        ).pack(side=tk.LEFT, padx=(6, 12))
+        )
+        self.strategy_combo.bind("<<ComboboxSelected>>", lambda _e: self._on_options_changed())
+        self.strategy_combo.pack(side=tk.LEFT, padx=(6, 12))
 
-        self.status_var = tk.StringVar(value="Idle")
+        self.status_var = tk.StringVar(value="Starting...")
         ttk.Label(root, textvariable=self.status_var).pack(anchor=tk.W)
 
-        columns = ("title", "source")
-        self.tree = ttk.Treeview(root, columns=columns, show="headings", height=12)
-        self.tree.heading("title", text="Title")
-        self.tree.heading("source", text="Source")
-        self.tree.column("title", width=420)
-        self.tree.column("source", width=120)
-        self.tree.pack(fill=tk.BOTH, expand=True, pady=(8, 8))
-        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.results = ResultsView(
+            root,
+            columns=(("title", "Title", 420), ("source", "Source", 120)),
+            format_row=lambda recipe: (recipe.title, ", ".join(recipe.providers)),
+        )
+        self.results.pack(fill=tk.BOTH, expand=True, pady=(8, 8))
+        self.results.bind("<<ResultSelect>>", self._on_select)
 
         detail_frame = ttk.Frame(root)
         detail_frame.pack(fill=tk.BOTH, expand=False)
@@ -101,8 +180,23 @@ class RecipeApp(tk.Tk):
         self.details = tk.Text(detail_frame, height=8, wrap=tk.WORD, state=tk.DISABLED)
         self.details.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
-    def _on_search(self) -> None:
-        builder = RecipeQueryBuilder()
+        self.metrics_var = tk.StringVar(value="")
+        self.metrics_label = ttk.Label(root, textvariable=self.metrics_var, foreground="gray")
+
+    def _schedule_search(self) -> None:
+        """Search-as-you-type: (re)start the debounce timer."""
+        if self._debounce_job is not None:
+            self.after_cancel(self._debounce_job)
+            self._debounce_job = None
+        if self.keywords_var.get().strip() or self.ingredients_var.get().strip(", "):
+            self._debounce_job = self.after(self._settings.UI_SEARCH_DEBOUNCE_MS, self._on_search)
+
+    def _current_query(self) -> "Tuple[RecipeQueryBuilder, Optional[RecipeStrategy], Tuple]":
+        """Builder, strategy and view key for what the inputs currently ask for."""
+        from recipefinder.candidates import candidate_key
+        from recipefinder.query_builder import RecipeQueryBuilder
+
+        builder = RecipeQueryBuilder(self._settings)
         builder.with_keywords(self.keywords_var.get())
         ingredients = [item.strip() for item in self.ingredients_var.get().split(",")]
         builder.with_ingredients(ingredients)
@@ -111,65 +205,145 @@ class RecipeApp(tk.Tk):
         except ValueError:
             builder.with_limit(self._settings.QUERY_DEFAULT_LIMIT)
 
+        name = self.strategy_var.get()
+        return builder, self._strategies.get(name), (candidate_key(builder), name, builder.limit())
+
+    def _on_search(self) -> None:
+        if self._debounce_job is not None:
+            self.after_cancel(self._debounce_job)
+            self._debounce_job = None
+        if self._service is None or self._search_pool is None:
+            return
+        from recipefinder.cancellation import CancellationToken
+
+        builder, strategy, view = self._current_query()
+        if self._rerank(builder, strategy, view):
+            return
+
+        # Latest query wins: the previous search stops making requests.
+        self._cancel_search()
+        self._search_token = token = CancellationToken()
+        self._shown, self._pending = None, view
         self.status_var.set("Searching...")
-        self.tree.delete(*self.tree.get_children())
         self._recipes = []
+        self.results.clear()
+        self._search_pool.submit(self._run_search, self._search_id, builder, strategy, token)
+
+    def _on_options_changed(self) -> None:
+        """Strategy or limit changed: re-rank what is shown, if that needs no request."""
+        if self._service is not None:
+            self._rerank(*self._current_query())
 
-        thread = threading.Thread(target=self._run_search, args=(builder,), daemon=True)
-        thread.start()
+    def _rerank(
+        self, builder: "RecipeQueryBuilder", strategy: "Optional[RecipeStrategy]", view: Tuple
+    ) -> bool:
+        """Show the current results re-ranked locally when only strategy or limit differ."""
+        shown = self._shown
+        if shown is None or shown[0] != view[0] or shown == view:
+            return False
+        recipes = self._service.rerank(builder, strategy)
+        if recipes is None:
+            return False  # expired, or the new limit needs more candidates
+        self._cancel_search()
+        self._shown = view
+        self.status_var.set(f"Found {len(recipes)} recipes (re-ranked locally)")
+        self._show_recipes(recipes)
+        return True
+
+    def _cancel_search(self) -> None:
+        if self._search_token is not None:
+            self._search_token.cancel()
+        self._search_id += 1
+        self._pending = None
+
+    def _run_search(
+        self,
+        search_id: int,
+        builder: "RecipeQueryBuilder",
+        strategy: "Optional[RecipeStrategy]",
+        token: "CancellationToken",
+    ) -> None:
+        from recipefinder.cancellation import SearchCancelled
 
-    def _run_search(self, builder: RecipeQueryBuilder) -> None:
         try:
-            strategy = self._strategies.get(self.strategy_var.get())
-            recipes = self._service.fetch_recipes(builder, strategy)
-            self.after(0, self._update_results, recipes)
+            for progress in self._service.fetch_recipes_iter(builder, strategy, cancel=token):
+                if token.cancelled:
+                    return
+                self.after(0, self._update_results, search_id, progress)
+        except SearchCancelled:
+            pass
         except Exception as exc:  # noqa: BLE001
-            self.after(0, messagebox.showerror, "Error", str(exc))
+            if not token.cancelled:
+                self.after(0, messagebox.showerror, "Error", str(exc))
 
-    def _update_results(self, recipes: List[Recipe]) -> None:
+    def _update_results(self, search_id: int, progress: "SearchProgress") -> None:
+        if search_id != self._search_id:
+            return  # a newer search has started
+        recipes = progress.recipes
+        if progress.done:
+            self._shown = self._pending
+            self.status_var.set(f"Found {len(recipes)} recipes")
+            if self._settings.UI_SHOW_METRICS:
+                self.metrics_var.set(self._metrics_summary())
+        else:
+            self.status_var.set(
+                f"Found {len(recipes)} recipes so far, waiting for {progress.pending} more provider(s)..."
+            )
+        self._show_recipes(recipes)
+
+    def _show_recipes(self, recipes: "List[Recipe]") -> None:
+        selected = self._selected_recipe()
+        self._images.prefetch(
+            recipe.image_url for recipe in recipes[: self._settings.IMAGE_PREFETCH_COUNT]
+        )
+        # Keep the user's selection across re-ranks; dedup may have
+        # replaced it with a copy listing more providers, so match on title too.
+        position = next(
+            (idx for idx, recipe in enumerate(recipes) if selected is not None and (
+                recipe is selected or (recipe.title, recipe.source) == (selected.title, selected.source)
+            )),
+            None,
+        )
+        if position is None and selected is None and recipes:
+            position = 0
         self._recipes = recipes
-        for idx, recipe in enumerate(recipes):
-            self.tree.insert("", tk.END, iid=str(idx), values=(recipe.title, recipe.source))
-        self.status_var.set(f"Found {len(recipes)} recipes")
-        if recipes:
-            self.tree.selection_set("0")
-
-    def _on_select(self, event: tk.Event) -> None:  
-        selection = self.tree.selection()
-        if not selection:
+        # Only the visible rows are rendered, so this is cheap for any result count.
+        self.results.set_items(recipes, selected=position)
+
+    def _metrics_summary(self) -> str:
+        metrics = self._service.metrics
+        parts = []
+        for name in self._service.provider_names():
+            hist = metrics.histogram("provider_seconds", provider=name)
+            if hist is not None and hist.count:
+                parts.append(f"{name} p50 <= {hist.quantile(0.5) * 1000:.0f} ms")
+        parts.append(f"retries {metrics.counter_total('http_retries_total'):.0f}")
+        parts.append(f"errors {metrics.counter_total('provider_errors_total'):.0f}")
+        return " | ".join(parts)
+
+    def _selected_recipe(self) -> "Optional[Recipe]":
+        index = self.results.selected_index()
+        if index is None or index >= len(self._recipes):
+            return None
+        return self._recipes[index]
+
+    def _on_select(self, event: tk.Event) -> None:
+        recipe = self._selected_recipe()
+        if recipe is None:
             return
-        idx = int(selection[0])
-        recipe = self._recipes[idx]
         self.details.configure(state=tk.NORMAL)
         self.details.delete("1.0", tk.END)
         self.details.insert(
             tk.END,
-            f"Title: {recipe.title}\nSource: {recipe.source}\n\nIngredients:\n- "
+            f"Title: {recipe.title}\nSource: {', '.join(recipe.providers)}\n\nIngredients:\n- "
             + "\n- ".join(recipe.ingredients)
             + "\n\nInstructions:\n"
             + (recipe.instructions or "No instructions available."),
         )
         self.details.configure(state=tk.DISABLED)
 
-        # Load image asynchronously to keep UI responsive
-        threading.Thread(target=self._load_image, args=(recipe.image_url,), daemon=True).start()
-
-    def _load_image(self, url: Optional[str]) -> None:
-        if not PIL_AVAILABLE:
-            self.after(0, self._set_image, None, "Install pillow for images")
-            return
-        if not url:
-            self.after(0, self._set_image, None, "No image")
-            return
-        try:
-            resp = self._session.get(url, timeout=self._settings.HTTP_TIMEOUT)
-            resp.raise_for_status()
-            img = Image.open(io.BytesIO(resp.content))
-            img.thumbnail((240, 240))
-            photo = ImageTk.PhotoImage(img)
-            self.after(0, self._set_image, photo, "")
-        except Exception as exc:  # noqa: BLE001
-            self.after(0, self._set_image, None, "Image load failed")
+        # Latest selection wins; earlier downloads that have not started are dropped
+        self._images.request(recipe.image_url, self._set_image)
 
     def _set_image(self, photo: Optional[Any], fallback_text: str) -> None:
         self._image_photo = photo
@@ -177,3 +351,14 @@ class RecipeApp(tk.Tk):
             self.image_label.configure(image=photo, text="")
         else:
             self.image_label.configure(image="", text=fallback_text)
+
+    def _on_close(self) -> None:
+        if self._search_token is not None:
+            self._search_token.cancel()
+        if self._search_pool is not None:
+            self._search_pool.shutdown(wait=False, cancel_futures=True)
+        if self._images is not None:
+            self._images.shutdown()
+        if self._service is not None and self._owns_service:
+            self._service.close()
+        self.destroy()
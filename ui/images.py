@@ -0,0 +1,230 @@
+import hashlib
+import io
+import os
+import threading
+import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+try:
+    from PIL import Image, ImageTk  # type: ignore
+
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = None  # type: ignore
+    ImageTk = None  # type: ignore
+    PIL_AVAILABLE = False
+
+ImageCallback = Callable[[Optional[Any], str], None]
+
+
+class ImagePipeline:
+    """Loads recipe thumbnails for the Tk UI without blocking the main loop.
+
+    Why: Selecting rows used to spawn one download thread per click, with no
+    caching and results painted in whatever order they finished.
+    Where: RecipeApp requests the selected recipe's image and prefetches the top
+    results as soon as they arrive.
+    Problem solved: Downloads run on two small pools (foreground selections and
+    background prefetch). Thumbnails are kept as an in-memory LRU of PhotoImages
+    plus resized files on disk, at most `disk_entries` of them (least recently
+    used go first, by file mtime; a disk hit refreshes it). Only the latest selection gets painted; older
+    selections that have not started yet are cancelled. Likewise each prefetch
+    batch supersedes the previous one: its queued downloads are cancelled and
+    any that slip through to a worker see a stale generation and are skipped.
+
+    Everything except the worker functions runs on the Tk thread.
+    """
+
+    def __init__(
+        self,
+        root: tk.Misc,
+        session: requests.Session,
+        timeout: float,
+        cache_dir: Optional[str] = None,
+        size: Tuple[int, int] = (240, 240),
+        workers: int = 2,
+        memory_entries: int = 64,
+        file_format: str = "JPEG",
+        disk_entries: int = 2000,
+    ) -> None:
+        self._root = root
+        self._session = session
+        self._timeout = timeout
+        self._size = size
+        self._cache_dir = Path(cache_dir) if cache_dir else None
+        self._format = file_format.upper()
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._memory_entries = max(1, memory_entries)
+        self._disk_entries = max(1, disk_entries)
+        self._disk_lock = threading.Lock()
+        self._disk_files: Optional[int] = None  # counted on the first write
+        self._foreground = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="image")
+        self._background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-prefetch")
+        self._inflight: Dict[str, Future] = {}
+        self._wanted: Optional[str] = None
+        self._callback: Optional[ImageCallback] = None
+        self._selection: Optional[Future] = None
+        self._prefetch_generation = 0
+        self._prefetches: Dict[str, Future] = {}
+
+    def request(self, url: Optional[str], callback: ImageCallback) -> None:
+        """Show `url` via `callback`; supersedes any earlier request."""
+        self._wanted, self._callback = url, callback
+        if self._selection is not None and self._inflight.get(url) is not self._selection:
+            # Stale selection that has not started yet: drop it.
+            self._selection.cancel()
+            self._selection = None
+
+        if not PIL_AVAILABLE:
+            callback(None, "Install pillow for images")
+            return
+        if not url:
+            callback(None, "No image")
+            return
+        photo = self._memory_get(url)
+        if photo is not None:
+            callback(photo, "")
+            return
+        callback(None, "Loading image...")
+        self._selection = self._submit(url, self._foreground)
+
+    def prefetch(self, urls: Iterable[Optional[str]]) -> None:
+        """Load `urls` in the background; drops what earlier batches still had queued."""
+        if not PIL_AVAILABLE:
+            return
+        self._prefetch_generation += 1
+        wanted = [url for url in dict.fromkeys(urls) if url and url not in self._memory]
+        for url, future in self._prefetches.items():
+            if url not in wanted and future is not self._selection and future.cancel():
+                if self._inflight.get(url) is future:
+                    del self._inflight[url]
+        self._prefetches = {url: self._submit(url, self._background, self._prefetch_generation) for url in wanted}
+
+    def shutdown(self) -> None:
+        self._foreground.shutdown(wait=False, cancel_futures=True)
+        self._background.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, url: str, executor: ThreadPoolExecutor, generation: Optional[int] = None) -> Future:
+        future = self._inflight.get(url)
+        if future is not None and not future.cancelled():
+            # A selection should not wait behind queued prefetches: move it forward.
+            # A queued prefetch is resubmitted so it carries the newest generation.
+            if future is self._selection or future.running() or not future.cancel():
+                return future
+        if generation is None:
+            future = executor.submit(self._load, url)
+        else:
+            future = executor.submit(self._load_prefetch, url, generation)
+        self._inflight[url] = future
+        future.add_done_callback(lambda done: self._root.after(0, self._on_loaded, url, done))
+        return future
+
+    def _on_loaded(self, url: str, future: Future) -> None:
+        if self._inflight.get(url) is future:
+            del self._inflight[url]
+        if self._selection is future:
+            self._selection = None
+        if future.cancelled():
+            return
+        if future.exception() is None and future.result() is None:
+            return  # prefetch superseded before it started
+        photo = None
+        try:
+            image = future.result()
+            photo = ImageTk.PhotoImage(image)
+            self._memory_put(url, photo)
+        except Exception:  # noqa: BLE001
+            photo = None
+        if url == self._wanted and self._callback is not None:
+            self._callback(photo, "" if photo else "Image load failed")
+
+    def _load_prefetch(self, url: str, generation: int) -> Optional[Any]:
+        """Worker: `_load`, unless a newer prefetch batch has replaced this one."""
+        if generation != self._prefetch_generation:
+            return None
+        return self._load(url)
+
+    def _load(self, url: str) -> Any:
+        """Worker: return a decoded thumbnail, from disk cache or the network."""
+        path = self._cache_path(url)
+        if path is not None and path.exists():
+            try:
+                with Image.open(path) as cached:
+                    cached.load()
+                    img = cached.copy()
+                os.utime(path)
+                return img
+            except OSError:
+                pass
+
+        resp = self._session.get(url, timeout=self._timeout)
+        resp.raise_for_status()
+        img = Image.open(io.BytesIO(resp.content))
+        img.thumbnail(self._size)
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        if path is not None:
+            self._write_cache(path, img)
+        return img
+
+    def _cache_path(self, url: str) -> Optional[Path]:
+        if self._cache_dir is None:
+            return None
+        suffix = ".webp" if self._format == "WEBP" else ".jpg"
+        digest = hashlib.sha1(f"{self._size}|{url}".encode("utf-8")).hexdigest()
+        return self._cache_dir / (digest + suffix)
+
+    def _write_cache(self, path: Path, img: Any) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            existed = path.exists()
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            img.save(tmp, format=self._format, quality=85)
+            os.replace(tmp, path)
+            if not existed:
+                self._trim_disk()
+        except (OSError, ValueError, KeyError) as exc:
+            print(f"Failed to cache thumbnail {path.name}: {exc}")
+
+    def _trim_disk(self) -> None:
+        """Worker: count one new file; past `disk_entries`, evict the oldest."""
+        with self._disk_lock:
+            if self._disk_files is None:
+                self._disk_files = len(self._cached_files())
+            else:
+                self._disk_files += 1
+            if self._disk_files <= self._disk_entries:
+                return
+            files = []
+            for path in self._cached_files():
+                try:
+                    files.append((path.stat().st_mtime_ns, path))
+                except OSError:
+                    pass  # removed meanwhile
+            files.sort()
+            # Evict a tenth more than needed, so the directory isn't rescanned on every write.
+            keep = self._disk_entries - self._disk_entries // 10
+            for _mtime, path in files[: max(0, len(files) - keep)]:
+                path.unlink(missing_ok=True)
+            self._disk_files = min(len(files), keep)
+
+    def _cached_files(self) -> List[Path]:
+        assert self._cache_dir is not None
+        return [path for pattern in ("*.jpg", "*.webp") for path in self._cache_dir.glob(pattern)]
+
+    def _memory_get(self, url: str) -> Optional[Any]:
+        photo = self._memory.get(url)
+        if photo is not None:
+            self._memory.move_to_end(url)
+        return photo
+
+    def _memory_put(self, url: str, photo: Any) -> None:
+        self._memory[url] = photo
+        self._memory.move_to_end(url)
+        while len(self._memory) > self._memory_entries:
+            self._memory.popitem(last=False)
@@ -0,0 +1,238 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+RowFormatter = Callable[[Any], Tuple[str, ...]]
+
+# Rows re-rendered per Tk event-loop turn; the rest follow through after().
+# Smaller than the default 12-row view, so the first rows show right away and
+# an expensive row formatter never holds the event loop for a whole screen.
+RENDER_CHUNK = 8
+
+
+class ResultWindow:
+    """Scroll state of a virtual list: which slice of `total` items is visible.
+
+    Pure arithmetic, kept apart from Tk so it can be tested headless.
+    """
+
+    def __init__(self, visible: int = 12) -> None:
+        self.total = 0
+        self.offset = 0
+        self.visible = max(1, visible)
+
+    def set_total(self, total: int) -> None:
+        self.total = max(0, total)
+        self.offset = self._clamp(self.offset)
+
+    def resize(self, visible: int) -> None:
+        self.visible = max(1, visible)
+        self.offset = self._clamp(self.offset)
+
+    def scroll(self, rows: int) -> bool:
+        """Move by `rows` (negative: up); returns True if the window moved."""
+        return self.move_to(self.offset + rows)
+
+    def move_to(self, offset: int) -> bool:
+        offset = self._clamp(offset)
+        moved = offset != self.offset
+        self.offset = offset
+        return moved
+
+    def move_to_fraction(self, fraction: float) -> bool:
+        return self.move_to(round(fraction * self.total))
+
+    def ensure_visible(self, index: int) -> bool:
+        if index < self.offset:
+            return self.move_to(index)
+        if index >= self.offset + self.visible:
+            return self.move_to(index - self.visible + 1)
+        return False
+
+    def rows(self) -> range:
+        """Item indexes currently on screen."""
+        return range(self.offset, min(self.total, self.offset + self.visible))
+
+    def fractions(self) -> Tuple[float, float]:
+        """(first, last) for ttk.Scrollbar.set."""
+        if not self.total:
+            return 0.0, 1.0
+        return self.offset / self.total, min(1.0, (self.offset + self.visible) / self.total)
+
+    def _clamp(self, offset: int) -> int:
+        return max(0, min(offset, self.total - self.visible))
+
+
+class ResultsView(ttk.Frame):
+    """Virtualized result list: a Treeview that only ever holds the visible rows.
+
+    Why: Inserting every recipe into the Treeview on the Tk thread froze the
+    window once a search (or the local corpus) returned thousands of hits.
+    Where: RecipeApp's result list.
+    Problem solved: The tree keeps one reusable row per visible line. Scrolling
+    and new results only rewrite those rows (in chunks of RENDER_CHUNK through
+    `after()`), and rows are formatted on demand, so the cost of an update
+    doesn't depend on the number of results. The scrollbar, mouse wheel and
+    arrow/page keys move a window over the full list.
+
+    Emits `<<ResultSelect>>` when the selected item changes; read it with
+    `selected_index()`.
+    """
+
+    def __init__(
+        self,
+        master: tk.Misc,
+        columns: Sequence[Tuple[str, str, int]],
+        format_row: RowFormatter,
+        height: int = 12,
+    ) -> None:
+        super().__init__(master)
+        self._format_row = format_row
+        self._items: Sequence[Any] = ()
+        self._window = ResultWindow(height)
+        self._selected: Optional[int] = None
+        self._render_job: Optional[str] = None
+        self._row_ids: List[str] = []
+
+        self.tree = ttk.Treeview(
+            self, columns=[name for name, _, _ in columns], show="headings", height=height,
+            selectmode="browse",
+        )
+        for name, heading, width in columns:
+            self.tree.heading(name, text=heading)
+            self.tree.column(name, width=width)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda _e: self._scroll(-3))
+        self.tree.bind("<Button-5>", lambda _e: self._scroll(3))
+        for key, step in (("<Up>", -1), ("<Down>", 1)):
+            self.tree.bind(key, lambda _e, step=step: self._move_selection(step))
+        self.tree.bind("<Prior>", lambda _e: self._move_selection(-self._window.visible))
+        self.tree.bind("<Next>", lambda _e: self._move_selection(self._window.visible))
+        self.tree.bind("<Home>", lambda _e: self._select_and_show(0))
+        self.tree.bind("<End>", lambda _e: self._select_and_show(len(self._items) - 1))
+        self._ensure_rows(height)
+
+    def set_items(self, items: Sequence[Any], selected: Optional[int] = None) -> None:
+        """Show `items` (kept by reference, formatted lazily); optionally select one."""
+        self._items = items
+        self._window.set_total(len(items))
+        self._selected = selected if selected is not None and 0 <= selected < len(items) else None
+        if self._selected is not None:
+            self._window.ensure_visible(self._selected)
+        self._render()
+        self.after_idle(self._fit)
+        self.event_generate("<<ResultSelect>>")
+
+    def clear(self) -> None:
+        self.set_items(())
+
+    def selected_index(self) -> Optional[int]:
+        return self._selected
+
+    def select(self, index: int) -> None:
+        self._select_and_show(index)
+
+    def _ensure_rows(self, count: int) -> None:
+        while len(self._row_ids) < count:
+            self._row_ids.append(self.tree.insert("", tk.END, values=()))
+        while len(self._row_ids) > count:
+            self.tree.delete(self._row_ids.pop())
+
+    def _render(self) -> None:
+        """Rewrite the visible rows, RENDER_CHUNK per event-loop turn."""
+        if self._render_job is not None:
+            self.after_cancel(self._render_job)
+            self._render_job = None
+        rows = self._window.rows()
+        self._ensure_rows(len(rows))
+        self.scrollbar.set(*self._window.fractions())
+        self._sync_selection()
+        self._render_chunk(rows, 0)
+
+    def _render_chunk(self, rows: range, start: int) -> None:
+        self._render_job = None
+        end = min(len(rows), start + RENDER_CHUNK)
+        for position in range(start, end):
+            self.tree.item(self._row_ids[position], values=self._format_row(self._items[rows[position]]))
+        if end < len(rows):
+            self._render_job = self.after(1, self._render_chunk, rows, end)
+
+    def _sync_selection(self) -> None:
+        rows = self._window.rows()
+        if self._selected is not None and self._selected in rows:
+            row_id = self._row_ids[self._selected - rows.start]
+            if self.tree.selection() != (row_id,):
+                self.tree.selection_set(row_id)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+    def _scroll(self, rows: int) -> str:
+        if self._window.scroll(rows):
+            self._render()
+        return "break"
+
+    def _on_scrollbar(self, action: str, amount: str, unit: str = "") -> None:
+        if action == tk.MOVETO:
+            moved = self._window.move_to_fraction(float(amount))
+        elif unit == tk.PAGES:
+            moved = self._window.scroll(int(amount) * self._window.visible)
+        else:
+            moved = self._window.scroll(int(amount))
+        if moved:
+            self._render()
+
+    def _on_wheel(self, event: tk.Event) -> str:
+        # Windows reports multiples of 120 per notch, macOS small deltas.
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._scroll(-3 * delta if delta else 0)
+
+    def _on_configure(self, _event: tk.Event) -> None:
+        self._fit()
+
+    def _fit(self) -> None:
+        """Match the number of materialized rows to the tree's current height."""
+        if not self._row_ids:
+            return
+        bbox = self.tree.bbox(self._row_ids[0])
+        if not bbox:
+            return
+        _x, header, _w, row_height = bbox
+        visible = max(1, (self.tree.winfo_height() - header) // max(1, row_height))
+        if visible != self._window.visible:
+            self._window.resize(visible)
+            self._render()
+
+    def _on_tree_select(self, _event: tk.Event) -> None:
+        selection = self.tree.selection()
+        if not selection or selection[0] not in self._row_ids:
+            return
+        index = self._window.offset + self._row_ids.index(selection[0])
+        if index < len(self._items) and index != self._selected:
+            self._selected = index
+            self.event_generate("<<ResultSelect>>")
+
+    def _move_selection(self, step: int) -> str:
+        if not self._items:
+            return "break"
+        current = self._selected if self._selected is not None else self._window.offset - step
+        self._select_and_show(max(0, min(len(self._items) - 1, current + step)))
+        return "break"
+
+    def _select_and_show(self, index: int) -> str:
+        if not 0 <= index < len(self._items):
+            return "break"
+        changed = index != self._selected
+        self._selected = index
+        if self._window.ensure_visible(index):
+            self._render()
+        else:
+            self._sync_selection()
+        if changed:
+            self.event_generate("<<ResultSelect>>")
+        return "break"
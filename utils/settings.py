@@ -1,16 +1,29 @@
 from __future__ import annotations
 
 from functools import lru_cache
+from pathlib import Path
 
-from pydantic import Field
+from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+# Later files win. The project .env is found whatever the working directory;
+# a .env in the working directory can still override it. Resolved and deduped
+# so the usual case (running from the project root) reads the file once.
+_ENV_FILES = tuple(
+    dict.fromkeys(
+        str(path.resolve())
+        for path in (_PROJECT_ROOT / ".env", _PROJECT_ROOT / "recipefinder" / ".env", Path(".env"))
+    )
+)
+
 
 class Settings(BaseSettings):
     """Strongly typed environment-backed settings for the Recipe Finder app.
 
-    Values are read from environment variables and (by default) from a local
-    `.env` file in the project root.
+    Values are read from environment variables and from `.env` files: the
+    project root, then `recipefinder/.env`, then the working directory. Build
+    it through `get_settings()` so the files are parsed once per process.
 
     Optional:
         - SPOONACULAR_API_KEY (if empty, Spoonacular calls are skipped)
@@ -19,17 +32,84 @@ class Settings(BaseSettings):
         - MEALDB_URL
         - SPOONACULAR_URL
         - HTTP_TIMEOUT
-        - HTTP_MAX_RETRIES
+        - HTTP_MAX_RETRIES (429s from Spoonacular are not retried; its client paces itself)
         - HTTP_BACKOFF
         - APP_ENV
 
+    Connections:
+        - HTTP_POOL_CONNECTIONS (hosts whose connection pools are kept)
+        - HTTP_POOL_MAXSIZE (keep-alive connections kept per host)
+        - HTTP_POOL_BLOCK (wait for a free connection instead of opening a throwaway one)
+        - HTTP_PREWARM / HTTP_PREWARM_CONNECTIONS (connect to provider hosts in the background at startup)
+        - HTTP_DNS_CACHE_TTL (seconds to reuse getaddrinfo results process-wide; 0 disables)
+
+    Resilience:
+        - HTTP_RETRY_BUDGET (seconds one provider call may take, retries included;
+          by default SEARCH_DEADLINE, or the provider timeout if that is longer,
+          so one full attempt always fits. When set it also caps each attempt's
+          timeout, so it overrides HTTP_TIMEOUT / MEALDB_TIMEOUT /
+          SPOONACULAR_TIMEOUT where lower)
+        - CIRCUIT_FAILURE_THRESHOLD / CIRCUIT_SLOW_CALL / CIRCUIT_RESET_TIMEOUT
+        - HEDGE_ENABLED / HEDGE_PROVIDERS / HEDGE_PERCENTILE / HEDGE_MIN_DELAY
+
+    Search fan-out:
+        - SEARCH_CONCURRENT (query providers in parallel)
+        - SEARCH_DEADLINE (overall seconds to wait for providers)
+        - MEALDB_TIMEOUT / SPOONACULAR_TIMEOUT (per-provider; default HTTP_TIMEOUT)
+        - BATCH_CONCURRENCY_PER_PROVIDER (in-flight requests per provider in fetch_recipes_many;
+          Spoonacular gets at most SPOONACULAR_RATE_LIMIT * SPOONACULAR_RATE_WAIT)
+        - DEDUP_ENABLED / DEDUP_THRESHOLD (merge near-duplicate recipes across providers)
+        - CANDIDATE_CACHE_ENTRIES / CANDIDATE_CACHE_TTL (recent searches kept for re-ranking; 0 entries disables)
+
+    MealDB ingredient search:
+        - MEALDB_INGREDIENT_SEARCH (ingredient-only queries use filter.php + lookup.php)
+        - MEALDB_FILTER_URL / MEALDB_LOOKUP_URL (default: next to MEALDB_URL)
+        - MEALDB_LOOKUP_CONCURRENCY (parallel filter/lookup requests)
+        - MEALDB_MEAL_CACHE_ENTRIES (adapted meals kept by id)
+
+    Spoonacular budget:
+        - SPOONACULAR_RATE_LIMIT / SPOONACULAR_BURST (token bucket; requests per second, 0 disables)
+        - SPOONACULAR_RATE_WAIT (max seconds to wait for a token before skipping the call)
+        - SPOONACULAR_QUOTA_RESERVE (daily points to leave untouched)
+        - SPOONACULAR_PAGE_SIZE (results per complexSearch call; 100 max)
+
+    Response cache:
+        - HTTP_CACHE_ENABLED
+        - HTTP_CACHE_PATH (SQLite file; empty keeps the cache in memory only;
+          relative cache paths are resolved against the project root)
+        - HTTP_CACHE_MEMORY_ENTRIES / HTTP_CACHE_DISK_ENTRIES (LRU size caps)
+        - HTTP_CACHE_TTL_MEALDB / HTTP_CACHE_TTL_SPOONACULAR (seconds; 0 disables)
+
+    Local corpus:
+        - CORPUS_ENABLED (search previously seen recipes as an extra provider)
+        - CORPUS_PATH (JSON-lines file; empty keeps the corpus in memory only)
+        - CORPUS_MAX_CANDIDATES
+        - CORPUS_MAX_RECIPES (newest kept; the file is compacted 25% past this)
+
+    UI images:
+        - IMAGE_WORKERS / IMAGE_PREFETCH_COUNT
+        - IMAGE_MEMORY_ENTRIES (decoded thumbnails kept in memory)
+        - IMAGE_CACHE_DIR / IMAGE_CACHE_FORMAT (resized thumbnails on disk; JPEG or WEBP)
+        - IMAGE_CACHE_DISK_ENTRIES (thumbnail files kept; least recently used go first)
+        - UI_SHOW_METRICS (per-provider latency/error summary under the details pane)
+        - UI_SEARCH_WORKERS (searches running at once; newer ones cancel older ones)
+        - UI_SEARCH_DEBOUNCE_MS (search-as-you-type delay after the last keystroke; 0 disables)
+
+    Headless server (python main.py --server):
+        - SERVER_HOST / SERVER_PORT
+        - SERVER_WORKERS (connections handled concurrently)
+        - SERVER_REQUEST_TIMEOUT (seconds a request may stall mid-read or mid-write)
+        - SERVER_IDLE_TIMEOUT (seconds a keep-alive connection may wait for its next
+          request; it holds a worker meanwhile, so it is closed at once when other
+          connections are waiting for one)
+
     Query behavior:
         - QUERY_DEFAULT_LIMIT
         - QUERY_MAX_LIMIT
     """
 
     model_config = SettingsConfigDict(
-        env_file=".env",
+        env_file=_ENV_FILES,
         env_file_encoding="utf-8",
         extra="ignore",
     )
@@ -45,12 +125,94 @@ class Settings(BaseSettings):
     HTTP_MAX_RETRIES: int = Field(default=5, ge=0, le=10)
     HTTP_BACKOFF: float = Field(default=0.5, ge=0)
 
+    # Sized for the parallel MealDB lookups and SERVER_WORKERS searches sharing one session.
+    HTTP_POOL_CONNECTIONS: int = Field(default=10, ge=1)
+    HTTP_POOL_MAXSIZE: int = Field(default=32, ge=1)
+    HTTP_POOL_BLOCK: bool = False
+    HTTP_PREWARM: bool = True
+    HTTP_PREWARM_CONNECTIONS: int = Field(default=2, ge=0, le=32)
+    HTTP_DNS_CACHE_TTL: float = Field(default=0.0, ge=0)
+
     APP_ENV: str = "local"
 
+    # A provider call gives up once its budget is spent, whatever HTTP_MAX_RETRIES
+    # says. Unset, the budget is derived from SEARCH_DEADLINE and the provider timeout.
+    HTTP_RETRY_BUDGET: float | None = Field(default=None, gt=0)
+    CIRCUIT_FAILURE_THRESHOLD: int = Field(default=5, ge=1)
+    CIRCUIT_SLOW_CALL: float = Field(default=5.0, ge=0)  # 0: slowness never trips the breaker
+    CIRCUIT_RESET_TIMEOUT: float = Field(default=30.0, gt=0)
+    # Hedging duplicates requests: keep it to free providers (Spoonacular calls cost points).
+    HEDGE_ENABLED: bool = False
+    HEDGE_PROVIDERS: str = "MealDB"
+    HEDGE_PERCENTILE: float = Field(default=95.0, gt=0, le=100)
+    HEDGE_MIN_DELAY: float = Field(default=0.05, ge=0)
+
+    # Providers are queried in parallel; whatever answered by the deadline is ranked.
+    SEARCH_CONCURRENT: bool = True
+    SEARCH_DEADLINE: float = Field(default=12.0, gt=0)
+    MEALDB_TIMEOUT: float | None = Field(default=None, gt=0)
+    SPOONACULAR_TIMEOUT: float | None = Field(default=None, gt=0)
+    BATCH_CONCURRENCY_PER_PROVIDER: int = Field(default=4, ge=1, le=64)
+    DEDUP_ENABLED: bool = True
+    DEDUP_THRESHOLD: float = Field(default=0.7, gt=0, le=1)
+    CANDIDATE_CACHE_ENTRIES: int = Field(default=16, ge=0)
+    CANDIDATE_CACHE_TTL: float = Field(default=600.0, gt=0)
+
+    MEALDB_INGREDIENT_SEARCH: bool = True
+    MEALDB_FILTER_URL: str = ""
+    MEALDB_LOOKUP_URL: str = ""
+    MEALDB_LOOKUP_CONCURRENCY: int = Field(default=10, ge=1, le=32)
+    MEALDB_MEAL_CACHE_ENTRIES: int = Field(default=2000, ge=1)
+
+    # Spoonacular calls are paced and checked against the daily point quota.
+    SPOONACULAR_RATE_LIMIT: float = Field(default=1.0, ge=0)
+    SPOONACULAR_BURST: int = Field(default=2, ge=1)
+    SPOONACULAR_RATE_WAIT: float = Field(default=2.0, ge=0)
+    SPOONACULAR_QUOTA_RESERVE: float = Field(default=0.0, ge=0)
+    SPOONACULAR_PAGE_SIZE: int = Field(default=100, ge=1, le=100)
+
+    # Provider responses are cached by normalized params (API key excluded).
+    HTTP_CACHE_ENABLED: bool = True
+    HTTP_CACHE_PATH: str = ".cache/http_cache.sqlite3"
+    HTTP_CACHE_MEMORY_ENTRIES: int = Field(default=256, ge=1)
+    HTTP_CACHE_DISK_ENTRIES: int = Field(default=5000, ge=1)
+    HTTP_CACHE_TTL_MEALDB: float = Field(default=6 * 3600, ge=0)
+    HTTP_CACHE_TTL_SPOONACULAR: float = Field(default=3600, ge=0)
+
+    # Every adapted recipe is kept and indexed locally (on a background thread).
+    CORPUS_ENABLED: bool = True
+    CORPUS_PATH: str = ".cache/corpus.jsonl"
+    CORPUS_MAX_CANDIDATES: int = Field(default=200, ge=1)
+    CORPUS_MAX_RECIPES: int = Field(default=20000, ge=1)
+
+    IMAGE_WORKERS: int = Field(default=2, ge=1, le=16)
+    IMAGE_PREFETCH_COUNT: int = Field(default=10, ge=0)
+    IMAGE_MEMORY_ENTRIES: int = Field(default=64, ge=1)
+    IMAGE_CACHE_DIR: str = ".cache/images"
+    IMAGE_CACHE_FORMAT: str = "JPEG"
+    IMAGE_CACHE_DISK_ENTRIES: int = Field(default=2000, ge=1)
+    UI_SHOW_METRICS: bool = False
+    UI_SEARCH_WORKERS: int = Field(default=2, ge=1, le=8)
+    UI_SEARCH_DEBOUNCE_MS: int = Field(default=0, ge=0)
+
+    SERVER_HOST: str = "127.0.0.1"
+    SERVER_PORT: int = Field(default=8080, ge=0, le=65535)
+    SERVER_WORKERS: int = Field(default=32, ge=1, le=1024)
+    SERVER_REQUEST_TIMEOUT: float = Field(default=30.0, gt=0)
+    SERVER_IDLE_TIMEOUT: float = Field(default=5.0, gt=0)
+
     # NOTE: Spoonacular's `number` parameter max depends on plan; keep this modest.
     QUERY_DEFAULT_LIMIT: int = Field(default=10, ge=1, le=100)
     QUERY_MAX_LIMIT: int = Field(default=25, ge=1, le=100)
 
+    @field_validator("HTTP_CACHE_PATH", "CORPUS_PATH", "IMAGE_CACHE_DIR")
+    @classmethod
+    def _anchor_cache_path(cls, value: str) -> str:
+        # Like the .env files: relative paths belong to the project, not the working directory.
+        if not value or Path(value).is_absolute():
+            return value
+        return str(_PROJECT_ROOT / value)
+
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings: